@@ -0,0 +1,222 @@
+"""
+Prefix/context caching for document text sent to Gemini
+Registers each document once and refers to it on later turns
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+import google.generativeai as genai
+
+from agents.assessment.single_flight import SingleFlight
+from core.metrics import metrics
+from core.tokens import estimate_tokens
+from services.redis_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPrefix:
+    """A document registered with a context cache backend"""
+    key: str
+    name: str
+    token_count: int
+    created_at: float = field(default_factory=time.time)
+
+
+class ContextCacheBackend(ABC):
+    """Storage for registered prefixes and the models that reference them"""
+
+    # Prefixes shorter than this are cheaper to resend than to cache
+    min_tokens: int = 0
+    # Whether the provider holds registered prefixes, so turns can leave them out
+    server_side: bool = False
+
+    @abstractmethod
+    async def create(self, key: str, text: str, ttl: int) -> CachedPrefix:
+        """Register text and return a handle for it."""
+
+    @abstractmethod
+    def model_for(self, prefix: CachedPrefix, base_model: Any) -> Any:
+        """Get a model whose requests implicitly start with the prefix."""
+
+    async def delete(self, prefix: CachedPrefix):
+        """Release a registered prefix."""
+
+
+class LocalContextCache(ContextCacheBackend):
+    """
+    In-process backend that records registrations, hits and token savings
+    offline. Nothing is held by a provider, so turns go out unchanged.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, str] = {}
+
+    async def create(self, key: str, text: str, ttl: int) -> CachedPrefix:
+        name = f"local/{key}"
+        self.documents[name] = text
+        return CachedPrefix(key=key, name=name, token_count=estimate_tokens(text))
+
+    def model_for(self, prefix: CachedPrefix, base_model: Any) -> Any:
+        return base_model
+
+    async def delete(self, prefix: CachedPrefix):
+        self.documents.pop(prefix.name, None)
+
+
+class GeminiContextCache(ContextCacheBackend):
+    """Gemini explicit context caching via google.generativeai.caching"""
+
+    min_tokens = 4096  # Gemini rejects smaller cached contents
+    server_side = True
+
+    def __init__(
+        self,
+        model_name: str,
+        system_instruction: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        safety_settings: Optional[Dict[Any, Any]] = None
+    ):
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.generation_config = generation_config
+        self.safety_settings = safety_settings
+        self._handles: Dict[str, Any] = {}
+
+    async def create(self, key: str, text: str, ttl: int) -> CachedPrefix:
+        cached = await asyncio.to_thread(
+            genai.caching.CachedContent.create,
+            model=f"models/{self.model_name}",
+            display_name=f"document-{key}"[:128],
+            system_instruction=self.system_instruction,
+            contents=[text],
+            ttl=datetime.timedelta(seconds=ttl)
+        )
+        self._handles[cached.name] = cached
+        token_count = getattr(getattr(cached, "usage_metadata", None), "total_token_count", None)
+        return CachedPrefix(key=key, name=cached.name, token_count=token_count or estimate_tokens(text))
+
+    def model_for(self, prefix: CachedPrefix, base_model: Any) -> Any:
+        return genai.GenerativeModel.from_cached_content(
+            self._handles.get(prefix.name, prefix.name),
+            generation_config=self.generation_config,
+            safety_settings=self.safety_settings
+        )
+
+    async def delete(self, prefix: CachedPrefix):
+        handle = self._handles.pop(prefix.name, None)
+        if handle is not None:
+            await asyncio.to_thread(handle.delete)
+
+
+class ContextCache:
+    """
+    Registry of per-document prefixes over a backend
+
+    Prefixes evicted or expired from the registry are deleted from the
+    backend too, so its handles and any remote cached content stay within
+    max_entries.
+    """
+
+    def __init__(self, backend: ContextCacheBackend, ttl: int = 7200, max_entries: int = 256):
+        self.backend = backend
+        self.ttl = ttl
+        # Expire locally a little before the backend does so we never hand out a dead handle
+        self._prefixes = LRUCache(
+            max_entries=max_entries,
+            ttl=max(ttl - 60, 1),
+            name="context_cache",
+            on_evict=self._evicted
+        )
+        self._releases: Set[asyncio.Task] = set()
+        self._registrations = SingleFlight("context_cache.single_flight")
+
+    def _evicted(self, key: str, prefix: CachedPrefix):
+        try:
+            task = asyncio.get_running_loop().create_task(self._release(prefix))
+        except RuntimeError:
+            # No event loop to delete it from; the backend's own TTL reclaims it
+            return
+        self._releases.add(task)
+        task.add_done_callback(self._releases.discard)
+
+    async def _release(self, prefix: CachedPrefix):
+        try:
+            await self.backend.delete(prefix)
+            metrics.incr("context_cache.evictions")
+        except Exception as e:
+            logger.warning(f"Context cache could not delete evicted prefix {prefix.name}: {e}")
+            metrics.incr("context_cache.errors")
+
+    async def register(self, key: str, text: str) -> Optional[CachedPrefix]:
+        """
+        Register document text once. Returns None when it should be sent inline.
+
+        Concurrent first turns on the same document share one registration,
+        so the backend never holds two copies of a document.
+        """
+        prefix = self._prefixes.get(key)
+        if prefix is not None:
+            return prefix
+        if estimate_tokens(text) < self.backend.min_tokens:
+            return None
+        return await self._registrations.do(key, lambda: self._create(key, text))
+
+    async def _create(self, key: str, text: str) -> Optional[CachedPrefix]:
+        prefix = self._prefixes.get(key)
+        if prefix is not None:
+            # Registered by a call that finished while this one was starting
+            return prefix
+        try:
+            prefix = await self.backend.create(key, text, self.ttl)
+        except Exception as e:
+            logger.warning(f"Context cache registration failed for {key}, sending inline: {e}")
+            metrics.incr("context_cache.errors")
+            return None
+        self._prefixes.set(key, prefix)
+        metrics.incr("context_cache.registrations")
+        return prefix
+
+    async def prefix_for(self, key: str, text: str) -> Optional[CachedPrefix]:
+        """Prefix for key, registering text on first use. None when text is too short to cache."""
+        if estimate_tokens(text) < self.backend.min_tokens:
+            return None
+        prefix = self.lookup(key)
+        return prefix if prefix is not None else await self.register(key, text)
+
+    def lookup(self, key: str) -> Optional[CachedPrefix]:
+        """Get the registered prefix for key, recording hit and token savings."""
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            metrics.incr("context_cache.misses")
+            return None
+        metrics.incr("context_cache.hits")
+        metrics.incr("context_cache.tokens_saved", prefix.token_count)
+        return prefix
+
+    @property
+    def server_side(self) -> bool:
+        """Whether registered prefixes are held by the provider."""
+        return self.backend.server_side
+
+    def model_for(self, prefix: CachedPrefix, base_model: Any) -> Any:
+        """Get a model that already holds the prefix."""
+        return self.backend.model_for(prefix, base_model)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit and token savings counters."""
+        return {
+            "backend": type(self.backend).__name__,
+            "documents": len(self._prefixes),
+            "hits": metrics.counter("context_cache.hits"),
+            "misses": metrics.counter("context_cache.misses"),
+            "tokens_saved": metrics.counter("context_cache.tokens_saved"),
+            "evictions": metrics.counter("context_cache.evictions"),
+        }
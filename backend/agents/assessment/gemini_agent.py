@@ -4,10 +4,19 @@ Handles tutoring workflow for high school students with file uploads
 """
 
 import google.generativeai as genai
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
+import asyncio
+import hashlib
 import json
 import logging
+import time
+from pathlib import Path
 from core.config import settings
+from core.metrics import metrics
+from services.redis_cache import TutorResponseCache
+from agents.assessment.single_flight import SingleFlight
+from agents.assessment.context_cache import ContextCache, GeminiContextCache, LocalContextCache
+from services.llm import GeminiProvider, LLMRequest, build_llm_service
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +26,14 @@ class GeminiTutorAgent:
     def __init__(self):
         """Initialize the Gemini assessment agent"""
         self.model_name = "gemini-2.5-pro"
-        self._setup_client()
+        self.response_cache = TutorResponseCache() if settings.RESPONSE_CACHE_ENABLED else None
+        # Identical prompts in flight at the same time share one upstream call
+        self._in_flight = SingleFlight("llm.single_flight")
         self._setup_prompts()
+        self._setup_client()
+        self._setup_context_cache()
+        # Gemini is primary; other providers with keys are hedge/failover targets
+        self.llm = build_llm_service(GeminiProvider(self.model))
     
     def _setup_client(self):
         """Setup Gemini API client"""
@@ -42,21 +57,44 @@ class GeminiTutorAgent:
                 genai_types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai_types.HarmBlockThreshold.BLOCK_ONLY_HIGH,
             }
             
+            self.generation_config = {
+                "temperature": 0.7,
+                "top_p": 0.8,
+                "top_k": 40,
+                "max_output_tokens": 2048,
+            }
+            self.safety_settings = safety_settings
+            
+            # The static tutoring guidelines go in the system instruction so
+            # they are not resent as user content on every turn
             self.model = genai.GenerativeModel(
                 self.model_name,
-                generation_config={
-                    "temperature": 0.7,
-                    "top_p": 0.8,
-                    "top_k": 40,
-                    "max_output_tokens": 2048,
-                },
-                safety_settings=safety_settings
+                generation_config=self.generation_config,
+                safety_settings=safety_settings,
+                system_instruction=self.tutoring_prompt
             )
             logger.info(f"✅ Gemini {self.model_name} client initialized with API key")
         except Exception as e:
             logger.error(f"❌ Failed to init Gemini client: {e}")
             raise
     
+    def _setup_context_cache(self):
+        """Setup per-document prefix caching"""
+        backend_name = settings.LLM_CONTEXT_CACHE_BACKEND
+        if backend_name == "gemini":
+            backend = GeminiContextCache(
+                self.model_name,
+                system_instruction=self.tutoring_prompt,
+                generation_config=self.generation_config,
+                safety_settings=self.safety_settings
+            )
+        elif backend_name == "local":
+            backend = LocalContextCache()
+        else:
+            self.context_cache = None
+            return
+        self.context_cache = ContextCache(backend, ttl=settings.LLM_CONTEXT_CACHE_TTL)
+    
     def _setup_prompts(self):
         """Setup system prompt for tutoring tasks"""
         self.tutoring_prompt = """{
@@ -104,6 +142,107 @@ class GeminiTutorAgent:
 """
 
 
+    async def respond(
+        self,
+        content: str,
+        context: Optional[Dict] = None,
+        cacheable: bool = True,
+        document_id: Optional[str] = None,
+        document_text: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply the tutoring workflow to in-memory content.
+        
+        Args:
+            content: Problem and/or student response to tutor on
+            context: Structured session context (document, question, flags).
+                `student_level` is part of the cache key and `personalized`
+                opts the turn out of caching.
+            cacheable: Set False to bypass the response cache for this turn
+            document_id: Document the turn refers to
+            document_text: With document_id, a stable prefix for the document
+                (its question list) that Gemini reads from the context cache.
+                It is never sent inline, since the turn already carries the
+                passages it needs. Without document_id, sent inline.
+            
+        Returns:
+            Tutoring response based solely on the content
+        """
+        context = context or {}
+        cache_key = None
+        if self.response_cache and cacheable and not context.get("personalized"):
+            cache_key = self.response_cache.make_key(content, context.get("student_level"), document_id)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Tutoring response served from cache.")
+                return dict(cached)
+        
+        try:
+            request = await self._build_request(
+                self._build_tutoring_prompt(content), document_id, document_text
+            )
+
+            # Generate and process response using the tutoring prompt
+            prompt_key = hashlib.sha256(f"{document_id}\x1f{request.prompt}".encode("utf-8")).hexdigest()
+            response = await self._in_flight.do(prompt_key, lambda: self._generate_response(request))
+            tutoring_response = json.loads(response)
+            
+            logger.info(f"Tutoring response generated from content.")
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse tutoring JSON: {e}")
+            return self._get_fallback_tutoring_response()
+        except Exception as e:
+            logger.error(f"Tutoring response generation failed: {e}")
+            return self._get_fallback_tutoring_response()
+        
+        if cache_key:
+            await self.response_cache.set(cache_key, dict(tutoring_response))
+        return tutoring_response
+
+    async def respond_stream(
+        self,
+        content: str,
+        context: Optional[Dict] = None,
+        document_id: Optional[str] = None,
+        document_text: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a plain-text tutoring message for in-memory content.
+        
+        Args:
+            content: Problem and/or student response to tutor on
+            context: Structured session context (document, question, flags)
+            document_id: Document the turn refers to (see respond)
+            document_text: Document text (see respond)
+            
+        Yields:
+            Message text fragments as Gemini produces them. Never raises;
+            if nothing was produced the fallback message is yielded instead.
+        """
+        started = time.perf_counter()
+        produced = False
+        
+        try:
+            request = await self._build_request(
+                self._build_streaming_prompt(content), document_id, document_text
+            )
+            async for text in self.llm.stream(request):
+                if not produced:
+                    produced = True
+                    metrics.observe("llm.time_to_first_token_ms", (time.perf_counter() - started) * 1000)
+                yield text
+            
+            metrics.observe("llm.stream_duration_ms", (time.perf_counter() - started) * 1000)
+            
+        except asyncio.TimeoutError:
+            logger.error(f"LLM streaming call timed out after {self.llm.timeout}s")
+        except Exception as e:
+            logger.error(f"Streaming tutoring response failed: {e}")
+        
+        if not produced:
+            yield self._get_fallback_tutoring_response()["message"]
+
     async def process_file_upload(
         self,
         file_path: str,
@@ -120,16 +259,39 @@ class GeminiTutorAgent:
             Tutoring response based solely on the file content
         """
         try:
-            # Extract content from the uploaded file
-            with open(file_path, 'r') as file:
-                content = file.read()
+            # Read off the event loop; routes should prefer respond()
+            content = await asyncio.to_thread(Path(file_path).read_text)
+        except Exception as e:
+            logger.error(f"File processing for tutoring failed: {e}")
+            return self._get_fallback_tutoring_response()
 
-            # Using the content to create a tutoring scenario
-            prompt = f"""Based on the following tutoring guidelines, generate a response:
+        return await self.respond(content, context)
 
-{self.tutoring_prompt}
+    async def _build_request(
+        self,
+        prompt: str,
+        document_id: Optional[str],
+        document_text: Optional[str]
+    ) -> LLMRequest:
+        """Build the LLM request for a turn that may refer to a document"""
+        request = LLMRequest(
+            prompt=prompt,
+            system_instruction=self.tutoring_prompt,
+            prefix=None if document_id else document_text
+        )
+        if document_id and document_text and self.context_cache:
+            prefix = await self.context_cache.prefix_for(document_id, document_text)
+            if prefix is not None and self.context_cache.server_side:
+                # Gemini reads the question list from its cache; other providers,
+                # on failover or hedges, get only the passages the turn carries
+                request.provider_hints["gemini"] = {
+                    "model": self.context_cache.model_for(prefix, self.model)
+                }
+        return request
 
-CONTENT:
+    def _build_tutoring_prompt(self, content: str) -> str:
+        """Wrap content in the response format (guidelines are the system instruction)"""
+        return f"""CONTENT:
 {content}
 
 Use this content to guide your tutoring response. Respond with ONLY a JSON object in this format:
@@ -137,66 +299,35 @@ Use this content to guide your tutoring response. Respond with ONLY a JSON objec
     "message": "Your encouraging tutoring message with a guiding question"
 }}"""
 
-            # Generate and process response using the tutoring prompt
-            response = await self._generate_response(prompt)
-            tutoring_response = json.loads(response)
-            
-            logger.info(f"Tutoring response generated from file content.")
-            return tutoring_response
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse tutoring JSON from file: {e}")
-            return self._get_fallback_tutoring_response()
-        except Exception as e:
-            logger.error(f"File processing for tutoring failed: {e}")
-            return self._get_fallback_tutoring_response()
+    def _build_streaming_prompt(self, content: str) -> str:
+        """Wrap content in a plain-text reply format (guidelines are the system instruction)"""
+        return f"""CONTENT:
+{content}
+
+Use this content to guide your tutoring response. Respond with ONLY your encouraging tutoring message with a guiding question, as plain text. Do not wrap it in JSON or markdown code blocks."""
 
-    async def _generate_response(self, prompt: str) -> str:
-        """Generate response using Gemini model"""
+    async def _generate_response(self, request: LLMRequest) -> str:
+        """Generate response through the LLM service without blocking the event loop"""
         try:
-            response = self.model.generate_content(prompt)
-            
-            # Log the full response for debugging
-            logger.info(f"Full Gemini API response: {response}")
-            
-            # Check if response has valid candidates
-            if not hasattr(response, 'candidates') or not response.candidates:
-                logger.error("No valid candidates in Gemini response")
-                # Try to get finish_reason from prompt_feedback if available
-                if hasattr(response, 'prompt_feedback'):
-                    logger.error(f"Prompt feedback: {response.prompt_feedback}")
-                raise ValueError("No valid response candidates from Gemini API")
-            
-            # Check if any candidate was blocked or filtered
-            for i, candidate in enumerate(response.candidates):
-                logger.info(f"Candidate {i} finish_reason: {getattr(candidate, 'finish_reason', 'unknown')}")
-                if hasattr(candidate, 'safety_ratings'):
-                    logger.info(f"Candidate {i} safety_ratings: {candidate.safety_ratings}")
-            
-            # Try to get text from response
-            try:
-                raw_text = response.text.strip()
-                if not raw_text:
-                    logger.error("Empty text in Gemini response")
-                    raise ValueError("Empty response text from Gemini API")
-                
-                # Strip markdown JSON formatting if present
-                cleaned_text = self._clean_json_response(raw_text)
-                logger.info(f"Successfully processed Gemini response: {cleaned_text[:100]}...")
-                return cleaned_text
-                
-            except ValueError as text_error:
-                logger.error(f"Failed to extract text from Gemini response: {text_error}")
-                # Log individual candidate parts for debugging
-                for i, candidate in enumerate(response.candidates):
-                    if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
-                        logger.error(f"Candidate {i} parts: {candidate.content.parts}")
-                        for j, part in enumerate(candidate.content.parts):
-                            logger.error(f"Part {j}: {part}")
-                raise ValueError(f"Unable to extract text from Gemini response: {text_error}")
+            started = time.perf_counter()
+            result = await self.llm.generate(request)
+            metrics.observe("llm.generation_ms", (time.perf_counter() - started) * 1000)
+            
+            raw_text = result.text.strip()
+            if not raw_text:
+                logger.error(f"Empty text in {result.provider} response")
+                raise ValueError(f"Empty response text from {result.provider}")
+            
+            # Strip markdown JSON formatting if present
+            cleaned_text = self._clean_json_response(raw_text)
+            logger.info(f"Successfully processed {result.provider} response: {cleaned_text[:100]}...")
+            return cleaned_text
                 
+        except asyncio.TimeoutError:
+            logger.error(f"LLM call timed out after {self.llm.timeout}s")
+            raise
         except Exception as e:
-            logger.error(f"Gemini API call failed: {e}")
+            logger.error(f"LLM API call failed: {e}")
             logger.error(f"Exception type: {type(e).__name__}")
             
             # Provide more specific error handling
@@ -221,6 +352,10 @@ Use this content to guide your tutoring response. Respond with ONLY a JSON objec
 
 
 
+    def is_fallback(self, response: Dict[str, Any]) -> bool:
+        """Check whether a response is the canned fallback rather than a generated reply"""
+        return response == self._get_fallback_tutoring_response()
+
     def _get_fallback_tutoring_response(self) -> Dict[str, Any]:
         """Fallback tutoring response when AI fails"""
         return {
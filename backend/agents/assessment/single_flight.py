@@ -0,0 +1,67 @@
+"""
+Single-flight coalescing for identical concurrent agent requests
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """An upstream call shared by every caller waiting on the same key"""
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one upstream call per key at a time.
+    
+    Callers that arrive while a call for their key is in flight wait on
+    that call and receive its result (or exception) instead of starting
+    another. A caller being cancelled only detaches that caller; the
+    upstream call is cancelled once no callers are left waiting on it.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct keys with an upstream call running."""
+        return len(self._calls)
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await the shared call for key, starting it with factory if needed."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, call))
+            metrics.incr(f"{self.name}.leaders")
+        else:
+            metrics.incr(f"{self.name}.coalesced")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up; nobody is left to use the result
+                self._forget(key, call)
+                call.task.cancel()
+                metrics.incr(f"{self.name}.cancelled")
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if call.task.done() and not call.task.cancelled():
+            # Mark the exception retrieved even if every waiter left early
+            call.task.exception()
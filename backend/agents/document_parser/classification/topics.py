@@ -0,0 +1,206 @@
+"""
+TutorAgent MVP Question Topic Classification
+Tags questions with Year 7 topics from keyword and TF-IDF features, locally and without an LLM call
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+from agents.document_parser.parsing.retrieval import tokenize
+
+TOPICS = ("integers", "fractions", "algebra", "geometry", "word_problems")
+GENERAL = "general"  # Nothing matched well enough to say
+
+TOPIC_LABELS = {
+    "integers": "Integers & Directed Numbers",
+    "fractions": "Fractions & Decimals",
+    "algebra": "Basic Algebra",
+    "geometry": "Geometry Basics",
+    "word_problems": "Word Problems",
+    GENERAL: "General",
+}
+
+# (topic, weight, pattern); all are compiled into one alternation below so
+# each question is scanned once however many features there are
+FEATURES = [
+    ("integers", 2.0, r"(?<![\w)])[-−]\s?\d"),
+    ("integers", 1.5, r"\b(?:negative|positive|integers?|directed|below zero|temperatures?|opposite|number line)\b"),
+    ("integers", 1.0, r"\b(?:sum|difference|product|quotient)\b"),
+    ("integers", 1.5, r"\d\s*[-+×÷*]\s*\(?[-−]?\d"),
+    ("fractions", 2.5, r"\b\d+\s*/\s*\d+\b"),
+    ("fractions", 1.5, r"\b\d*\.\d+\b"),
+    ("fractions", 2.0, r"%|\bper ?cent"),
+    ("fractions", 1.5, r"\b(?:fractions?|decimals?|numerator|denominator|simplest form|mixed numbers?|improper|"
+                       r"percentages?|recurring|decimal places?|halves|thirds|quarters)\b"),
+    ("algebra", 2.5, r"\b\d*[a-z]\s*(?:[-+=/×÷*]\s*\d|[²³])|\b\d+[a-z]\b|=\s*\d*[a-z]\b"),
+    ("algebra", 1.5, r"\b(?:solve for|expand|factori[sz]e|simplify|substitut\w*|equations?|expressions?|"
+                     r"variables?|like terms|unknown|evaluate)\b"),
+    ("geometry", 1.5, r"\b(?:area|perimeter|angles?|triangles?|rectangles?|squares?|circles?|radius|diameter|"
+                      r"circumference|parallel|perpendicular|polygons?|coordinates?|vert(?:ex|ices)|volume|cuboids?|"
+                      r"prisms?|hexagons?|pentagons?|quadrilaterals?|axis|right[- ]angled?|isosceles|equilateral)\b"),
+    ("geometry", 1.0, r"\b\d+(?:\.\d+)?\s*(?:mm|cm|m|km)(?:²|\^2)?\b|°|\bdegrees\b"),
+    ("word_problems", 1.0, r"\b(?:buys?|bought|sells?|sold|costs?|spent|spends|saves?|saved|pays?|paid|shares?|shop|"
+                           r"altogether|how many|how much|how far|how long|left over|travels?|per (?:week|day|hour)|tickets?|students|friends|"
+                           r"class|each)\b"),
+    ("word_problems", 1.5, r"[$£€]\s*\d"),
+]
+FEATURE_PATTERN = re.compile(
+    "|".join(f"(?P<f{index}>{pattern})" for index, (_, _, pattern) in enumerate(FEATURES)),
+    re.IGNORECASE
+)
+FEATURE_WEIGHTS = {f"f{index}": (topic, weight) for index, (topic, weight, _) in enumerate(FEATURES)}
+FEATURE_CAP = 3  # Matches of one feature beyond this add nothing
+
+# Multi-sentence questions about people and things are word problems
+# whatever arithmetic they use
+SENTENCE_END = re.compile(r"[.?!](?:\s|$)")
+STORY_BONUS = 2.0
+STORY_MIN_TERMS = 6  # Content words, after stopwords are dropped
+
+# Typical questions per topic; their TF-IDF centroids catch vocabulary the
+# keyword features miss
+SEED_QUESTIONS = {
+    "integers": [
+        "Calculate -7 + 12",
+        "Work out -4 × -6",
+        "What is -15 ÷ 3?",
+        "Order these integers from smallest to largest: 4, -2, 0, -9, 7",
+        "The temperature was -3 degrees and fell by 5 degrees. What is the new temperature?",
+        "Find the difference between 8 and -5",
+        "Evaluate (-2) × 3 - (-4)",
+        "Which is greater, -8 or -11?",
+    ],
+    "fractions": [
+        "Write 3/4 as a decimal",
+        "Simplify 12/18 to its simplest form",
+        "Calculate 2/3 + 1/6",
+        "Convert 0.35 to a percentage",
+        "Find 15% of 80",
+        "Write 2 1/2 as an improper fraction",
+        "Round 3.476 to two decimal places",
+        "Which is larger, 5/8 or 0.6?",
+    ],
+    "algebra": [
+        "Solve 3x + 5 = 20",
+        "Simplify 4a + 3b - 2a + b",
+        "Expand 3(x - 4)",
+        "Find the value of 2y + 7 when y = 3",
+        "Factorise 6x + 9",
+        "Solve for n: n/4 = 7",
+        "Write an expression for 5 more than a number m",
+        "Collect like terms in 7p - 2q + 3p",
+    ],
+    "geometry": [
+        "Find the area of a rectangle 8 cm long and 5 cm wide",
+        "Calculate the perimeter of a square with sides of 7 m",
+        "Two angles of a triangle are 50° and 60°. Find the third angle",
+        "Find the area of a triangle with base 10 cm and height 6 cm",
+        "Plot the points (2, 3) and (-1, 4) on the coordinate grid",
+        "How many degrees are in a right angle?",
+        "Find the circumference of a circle with radius 4 cm",
+        "What is the sum of the interior angles of a quadrilateral?",
+    ],
+    "word_problems": [
+        "Sam buys 3 pens at $2 each and a ruler for $1.50. How much does he spend altogether?",
+        "A class of 28 students shares 84 pencils equally. How many pencils does each student get?",
+        "Mia saves $15 every week. How many weeks will it take her to save $120?",
+        "A train travels 240 km in 3 hours. How far does it travel in one hour?",
+        "Tickets cost $12 for adults and $7 for children. What do 2 adults and 3 children pay?",
+        "Jack had 45 stickers. He gave 12 to his friend and bought 20 more. How many does he have now?",
+        "A shop sells apples in bags of 6. How many bags are needed for 50 apples?",
+        "Lucy is 4 years older than her brother. Together their ages add to 26. How old is Lucy?",
+    ],
+}
+# Instruction words common to every topic; left out of the TF-IDF terms
+INSTRUCTION_WORDS = frozenset(
+    "answer calculate find give show value work out write".split()
+)
+TFIDF_WEIGHT = 4.0
+MIN_SCORE = 1.5  # Below this the question is tagged GENERAL
+
+
+@dataclass
+class TopicTag:
+    """Topic of one question, with per-topic scores."""
+    topic: str
+    confidence: float
+    scores: Dict[str, float]
+
+    @property
+    def label(self) -> str:
+        return TOPIC_LABELS[self.topic]
+
+
+def _terms(text: str) -> Counter:
+    return Counter(
+        token for token in tokenize(text)
+        if not token.isdigit() and token not in INSTRUCTION_WORDS
+    )
+
+
+def _build_centroids():
+    documents = {topic: [_terms(text) for text in texts] for topic, texts in SEED_QUESTIONS.items()}
+    all_documents = [terms for topic_documents in documents.values() for terms in topic_documents]
+    doc_freqs: Counter = Counter()
+    for terms in all_documents:
+        doc_freqs.update(terms.keys())
+    n = len(all_documents)
+    idf = {term: math.log((1 + n) / (1 + df)) + 1 for term, df in doc_freqs.items()}
+
+    centroids = {}
+    for topic, topic_documents in documents.items():
+        centroid: Counter = Counter()
+        for terms in topic_documents:
+            centroid.update({term: count * idf[term] for term, count in terms.items()})
+        norm = math.sqrt(sum(value * value for value in centroid.values())) or 1.0
+        centroids[topic] = {term: value / norm for term, value in centroid.items()}
+    return idf, centroids
+
+
+# Precompute IDF weights and topic centroids at import
+IDF, CENTROIDS = _build_centroids()
+
+
+def _classify(text: str) -> TopicTag:
+    scores = {topic: 0.0 for topic in TOPICS}
+
+    matches: Counter = Counter(match.lastgroup for match in FEATURE_PATTERN.finditer(text))
+    for feature, count in matches.items():
+        topic, weight = FEATURE_WEIGHTS[feature]
+        scores[topic] += weight * min(count, FEATURE_CAP)
+
+    terms = _terms(text)
+    vector = {term: count * IDF[term] for term, count in terms.items() if term in IDF}
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if norm:
+        for topic, centroid in CENTROIDS.items():
+            scores[topic] += TFIDF_WEIGHT * sum(value * centroid.get(term, 0.0) for term, value in vector.items()) / norm
+
+    if len(SENTENCE_END.findall(text.strip() + " ")) >= 2 and sum(terms.values()) >= STORY_MIN_TERMS:
+        scores["word_problems"] += STORY_BONUS
+
+    topic = max(TOPICS, key=lambda name: scores[name])
+    total = sum(scores.values())
+    if scores[topic] < MIN_SCORE:
+        return TopicTag(GENERAL, 0.0, scores)
+    return TopicTag(topic, round(scores[topic] / total, 3), scores)
+
+
+def classify_questions(texts: Sequence[str]) -> List[TopicTag]:
+    """Tag a batch of question texts, in order."""
+    return [_classify(text) for text in texts]
+
+
+def classify_question(text: str) -> TopicTag:
+    """Tag a single question."""
+    return _classify(text)
+
+
+def tag_questions(questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add a "topic" to each question dict (as stored with a document) in one batch."""
+    for question, tag in zip(questions, classify_questions([question["text"] for question in questions])):
+        question["topic"] = tag.topic
+    return questions
@@ -0,0 +1,280 @@
+"""
+TutorAgent MVP OCR Engine
+Recognizes text in scanned pages and photos across a process pool, cached by image hash
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from agents.document_parser.preprocessing.image import PreprocessOptions, preprocess_bytes
+from core.config import settings
+from core.metrics import metrics
+from services.redis_cache.lru import LRUCache
+from services.redis_cache.two_tier import TwoTierCache
+
+logger = logging.getLogger(__name__)
+
+# OCR_LANGUAGE uses short codes; tesseract wants its traineddata names
+TESSERACT_LANGUAGES = {"en": "eng"}
+
+# (page number, encoded images on the page, error)
+PageImages = Tuple[int, List[bytes], Optional[str]]
+
+# (image bytes, engine, language, tesseract binary) -> recognized text
+Recognizer = Callable[[bytes, str, str, str], str]
+
+PDFSource = Union[bytes, str, Path]
+
+_paddle_engines: Dict[str, object] = {}
+
+
+@dataclass
+class OCRResult:
+    """Text recognized on each requested page."""
+    texts: Dict[int, str] = field(default_factory=dict)
+    failed_pages: List[int] = field(default_factory=list)
+    images: int = 0
+    cached_images: int = 0
+
+
+def _page_images(source: PDFSource, page_numbers: List[int]) -> List[PageImages]:
+    """Pull the embedded images of the given 1-based pages; runs inside a pool worker."""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(source) if isinstance(source, bytes) else str(source))
+    results: List[PageImages] = []
+    for number in page_numbers:
+        try:
+            results.append((number, [image.data for image in reader.pages[number - 1].images], None))
+        except Exception as e:
+            results.append((number, [], f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _paddle_recognize(image, language: str) -> str:
+    from paddleocr import PaddleOCR
+    import numpy as np
+
+    # Model loading is slow, so each worker keeps one engine per language
+    engine = _paddle_engines.get(language)
+    if engine is None:
+        engine = _paddle_engines[language] = PaddleOCR(lang=language, show_log=False)
+    lines = engine.ocr(np.array(image.convert("RGB")))[0] or []
+    return "\n".join(line[1][0] for line in lines)
+
+
+def recognize(data: bytes, engine: str, language: str, tesseract_cmd: str) -> str:
+    """OCR one encoded image; runs inside a pool worker."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    image = image.convert("L")
+    if engine == "paddleocr":
+        try:
+            return _paddle_recognize(image, language)
+        except ImportError:
+            pass  # Not installed; tesseract below
+
+    import pytesseract
+
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    return pytesseract.image_to_string(image, lang=TESSERACT_LANGUAGES.get(language, language))
+
+
+def _prepare_and_recognize(
+    recognizer: Recognizer,
+    options: Optional[PreprocessOptions],
+    data: bytes,
+    engine: str,
+    language: str,
+    tesseract_cmd: str
+) -> str:
+    """Clean an image up for OCR, then recognize it; runs inside a pool worker."""
+    if options is not None:
+        data = preprocess_bytes(data, options)
+    return recognizer(data, engine, language, tesseract_cmd)
+
+
+def _warm_worker() -> bool:
+    import PyPDF2  # noqa: F401 - pay import costs before the first scan
+    import cv2  # noqa: F401
+    import pytesseract  # noqa: F401
+    from PIL import Image  # noqa: F401
+
+    return True
+
+
+class OCREngine:
+    """
+    Runs OCR for image-only PDF pages and image uploads in a process pool.
+
+    Recognized text is cached by the SHA-256 of each image's bytes, so the
+    same scanned worksheet photographed or scanned again by another student
+    is only OCR'd once. Images are downscaled, deskewed, binarized and
+    cropped first unless preprocess is None. With workers=0 OCR runs in a
+    thread instead.
+    """
+
+    def __init__(
+        self,
+        engine: str = "tesseract",
+        language: str = "en",
+        tesseract_cmd: str = "tesseract",
+        workers: int = 2,
+        cache: Optional[TwoTierCache] = None,
+        recognizer: Recognizer = recognize,
+        preprocess: Optional[PreprocessOptions] = None
+    ):
+        self.engine = engine
+        self.language = language
+        self.tesseract_cmd = tesseract_cmd
+        self.workers = workers
+        self.cache = cache or TwoTierCache(
+            LRUCache(max_entries=settings.OCR_CACHE_MAX_ENTRIES, ttl=settings.OCR_CACHE_TTL, name="ocr_cache"),
+            ttl=settings.OCR_CACHE_TTL,
+            prefix="ocr:",
+            name="ocr_cache"
+        )
+        self.recognizer = recognizer
+        self.preprocess = preprocess
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._available: Optional[bool] = None if recognizer is recognize else True
+
+    @property
+    def available(self) -> bool:
+        """Whether an OCR backend is installed; without one OCR is skipped."""
+        if self._available is None:
+            has_tesseract = bool(shutil.which(self.tesseract_cmd)) or Path(self.tesseract_cmd).is_file()
+            has_paddle = False
+            if self.engine == "paddleocr":
+                try:
+                    import paddleocr  # noqa: F401
+                    has_paddle = True
+                except ImportError:
+                    pass
+            self._available = has_tesseract or has_paddle
+            if not self._available:
+                logger.warning(f"No OCR backend found (tesseract at '{self.tesseract_cmd}'); scanned pages will have no text")
+        return self._available
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def warm(self):
+        """Start every pool worker and import the OCR libraries in it."""
+        pool = self._get_pool()
+        if pool is None or not self.available:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _warm_worker) for _ in range(self.workers)))
+        logger.info(f"OCR pool warmed with {self.workers} workers")
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool; later OCR starts a fresh one."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, func, *args):
+        pool = self._get_pool()
+        if pool is None:
+            return await asyncio.to_thread(func, *args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); replace the pool for later calls
+            self.shutdown(wait=False)
+            raise
+
+    def _cache_key(self, data: bytes) -> str:
+        # The same image preprocessed differently can read differently
+        options = self.preprocess.key() if self.preprocess else "raw"
+        return f"{self.engine}:{self.language}:{options}:{hashlib.sha256(data).hexdigest()}"
+
+    async def _recognize_all(self, images: List[bytes]) -> Tuple[List[Optional[str]], int]:
+        """OCR a batch of images in parallel, skipping those already cached."""
+        keys = [self._cache_key(data) for data in images]
+        cached = [await self.cache.get(key) for key in keys]
+        texts: List[Optional[str]] = [entry["text"] if entry else None for entry in cached]
+        misses = [index for index, text in enumerate(texts) if text is None]
+
+        results = await asyncio.gather(
+            *(
+                self._run(
+                    _prepare_and_recognize, self.recognizer, self.preprocess,
+                    images[index], self.engine, self.language, self.tesseract_cmd
+                )
+                for index in misses
+            ),
+            return_exceptions=True
+        )
+        for index, result in zip(misses, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"OCR failed for image {keys[index][-12:]}: {result}")
+                metrics.incr("ocr.failed_images")
+                continue
+            texts[index] = result
+            await self.cache.set(keys[index], {"text": result})
+        metrics.incr("ocr.images", len(misses))
+        return texts, len(images) - len(misses)
+
+    async def ocr_image(self, data: bytes) -> Optional[str]:
+        """OCR a single image upload. Returns None if no backend is installed or OCR failed."""
+        if not self.available:
+            return None
+        texts, _ = await self._recognize_all([data])
+        return texts[0]
+
+    async def ocr_pages(self, source: PDFSource, page_numbers: List[int], pages_per_shard: int = 8) -> OCRResult:
+        """OCR the embedded images of the given 1-based PDF pages."""
+        result = OCRResult()
+        if not page_numbers or not self.available:
+            return result
+
+        shards = [page_numbers[i:i + pages_per_shard] for i in range(0, len(page_numbers), pages_per_shard)]
+        extracted = await asyncio.gather(*(self._run(_page_images, source, shard) for shard in shards), return_exceptions=True)
+        pages: List[PageImages] = []
+        for shard, shard_result in zip(shards, extracted):
+            if isinstance(shard_result, BaseException):
+                pages.extend((number, [], str(shard_result)) for number in shard)
+            else:
+                pages.extend(shard_result)
+
+        images = [data for _, page_images, _ in pages for data in page_images]
+        texts, result.cached_images = await self._recognize_all(images)
+        result.images = len(images)
+
+        position = 0
+        for number, page_images, error in pages:
+            page_texts = texts[position:position + len(page_images)]
+            position += len(page_images)
+            if error or any(text is None for text in page_texts):
+                result.failed_pages.append(number)
+            found = "\n".join(text.strip() for text in page_texts if text and text.strip())
+            if found:
+                result.texts[number] = found
+        metrics.incr("ocr.pages", len(page_numbers))
+        return result
+
+
+# Create global OCR engine instance
+ocr_engine = OCREngine(
+    engine=settings.OCR_ENGINE,
+    language=settings.OCR_LANGUAGE,
+    tesseract_cmd=settings.TESSERACT_CMD,
+    workers=settings.OCR_WORKERS,
+    preprocess=PreprocessOptions(target_dpi=settings.OCR_TARGET_DPI) if settings.OCR_PREPROCESS else None
+)
@@ -0,0 +1,230 @@
+"""
+TutorAgent MVP PDF Text Extraction
+Page-parallel PyPDF2 extraction in a warm process pool, off the event loop, delivered in page order as it completes
+"""
+
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from agents.document_parser.ocr.engine import OCREngine, ocr_engine
+from core.config import settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# (page number, text, error) for one page; text is "" when error is set
+PageResult = Tuple[int, str, Optional[str]]
+
+# PDF bytes, or a path each worker opens itself so the bytes are never pickled
+PDFSource = Union[bytes, str, Path]
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted text of a PDF, reassembled in page order."""
+    text: str
+    page_count: int
+    failed_pages: List[int] = field(default_factory=list)
+    success: bool = True
+    ocr_pages: List[int] = field(default_factory=list)
+    pages_processed: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.pages_processed >= self.page_count
+
+
+def _open(source: PDFSource):
+    import PyPDF2
+
+    if isinstance(source, bytes):
+        return PyPDF2.PdfReader(io.BytesIO(source))
+    return PyPDF2.PdfReader(str(source))
+
+
+def _count_pages(source: PDFSource) -> int:
+    return len(_open(source).pages)
+
+
+def _extract_pages(source: PDFSource, start: int, end: int) -> List[PageResult]:
+    """Extract pages [start, end) of a PDF; runs inside a pool worker."""
+    reader = _open(source)
+    results: List[PageResult] = []
+    for index in range(start, min(end, len(reader.pages))):
+        try:
+            results.append((index + 1, reader.pages[index].extract_text() or "", None))
+        except Exception as e:
+            # One bad page must not lose the rest of the document
+            results.append((index + 1, "", f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _warm_worker() -> int:
+    import PyPDF2  # noqa: F401 - pay the import cost before the first upload
+
+    return os.getpid()
+
+
+def assemble_text(pages: List[PageResult]) -> str:
+    """Join page texts in page order with the page markers used downstream."""
+    return "".join(
+        f"\n--- Page {number} ---\n{text}\n"
+        for number, text, _ in sorted(pages)
+        if text.strip()
+    )
+
+
+class PDFExtractor:
+    """
+    Extracts PDF text with pages sharded across a process pool.
+
+    The pool is created once and warmed at startup so uploads do not pay
+    process start-up and import costs. With workers=0 extraction runs in a
+    thread instead, which still keeps it off the event loop. Pages with no
+    text layer (scans) are passed to the OCR engine, if one is given.
+    The first first_shard_pages pages form a shard of their own so the
+    start of a document is ready quickly however long it is.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        pages_per_shard: int = 8,
+        ocr: Optional[OCREngine] = None,
+        first_shard_pages: int = 2
+    ):
+        self.workers = workers
+        self.pages_per_shard = max(1, pages_per_shard)
+        self.first_shard_pages = max(1, first_shard_pages)
+        self.ocr = ocr
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def warm(self):
+        """Start every pool worker and import PyPDF2 in it."""
+        pool = self._get_pool()
+        if pool is None:
+            return
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(pool, _warm_worker) for _ in range(self.workers)))
+        logger.info(f"PDF extraction pool warmed with {len(set(pids))} workers")
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool; a later extraction starts a fresh one."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def shards(self, page_count: int) -> List[Tuple[int, int]]:
+        """Split pages into contiguous [start, end) ranges, at least one per worker when possible."""
+        if page_count <= 0:
+            return []
+        size = min(self.pages_per_shard, max(1, -(-page_count // max(1, self.workers))))
+        return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    async def _run(self, func, *args):
+        pool = self._get_pool()
+        if pool is None:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+    async def _extract_shard(self, source: PDFSource, start: int, end: int) -> Tuple[List[PageResult], List[int]]:
+        """Extract one shard, then OCR its pages that have no text layer; also returns the pages OCR read."""
+        try:
+            pages = await self._run(_extract_pages, source, start, end)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died (e.g. out of memory); replace the pool for later uploads
+                self.shutdown(wait=False)
+            # A crashed shard only costs its own pages
+            logger.warning(f"PDF pages {start + 1}-{end} failed: {e}")
+            return [(number, "", str(e)) for number in range(start + 1, end + 1)], []
+
+        blank = [number for number, text, error in pages if not error and not text.strip()]
+        if self.ocr is not None and blank:
+            ocr_result = await self.ocr.ocr_pages(source, blank, self.pages_per_shard)
+            pages = [(number, ocr_result.texts.get(number, text), error) for number, text, error in pages]
+            return pages, sorted(ocr_result.texts)
+        return pages, []
+
+    async def extract_progressive(self, source: PDFSource) -> AsyncIterator[ExtractionResult]:
+        """
+        Extract every page, yielding the text of the pages done so far each
+        time the next shard in page order finishes.
+
+        Every shard is queued on the pool up front, so later pages keep
+        being extracted while the caller works with the earlier ones. The
+        last result yielded covers the whole document.
+
+        Raises:
+            Exception: If the PDF cannot be opened at all; per-page errors
+                are reported in `failed_pages` instead
+        """
+        page_count = await self._run(_count_pages, source)
+        head = min(self.first_shard_pages, page_count)
+        shards = [(0, head)] if head else []
+        shards += [(start + head, end + head) for start, end in self.shards(page_count - head)]
+        tasks = [asyncio.ensure_future(self._extract_shard(source, start, end)) for start, end in shards]
+
+        pages: List[PageResult] = []
+        ocr_pages: List[int] = []
+        try:
+            if not tasks:
+                yield ExtractionResult(text="", page_count=0, success=False)
+            for task in tasks:
+                shard_pages, shard_ocr_pages = await task
+                pages.extend(shard_pages)
+                ocr_pages.extend(shard_ocr_pages)
+                for number, _, error in shard_pages:
+                    if error:
+                        logger.warning(f"Failed to extract text from page {number}: {error}")
+                failed = sorted(number for number, _, error in pages if error)
+                metrics.incr("pdf_extract.pages", len(shard_pages))
+                metrics.incr("pdf_extract.failed_pages", sum(1 for _, _, error in shard_pages if error))
+                yield ExtractionResult(
+                    text=assemble_text(pages),
+                    page_count=page_count,
+                    failed_pages=failed,
+                    success=len(failed) < len(pages),
+                    ocr_pages=list(ocr_pages),
+                    pages_processed=len(pages)
+                )
+        finally:
+            # The caller stopped early; do not leave shards running for nobody
+            for task in tasks:
+                task.cancel()
+
+    async def extract(self, source: PDFSource) -> ExtractionResult:
+        """
+        Extract the text of every page, in order.
+
+        Raises:
+            Exception: If the PDF cannot be opened at all; per-page errors
+                are reported in `failed_pages` instead
+        """
+        result = None
+        async for result in self.extract_progressive(source):
+            pass
+        return result
+
+
+# Create global PDF extractor instance
+pdf_extractor = PDFExtractor(
+    workers=settings.PDF_EXTRACT_WORKERS,
+    pages_per_shard=settings.PDF_EXTRACT_PAGES_PER_SHARD,
+    first_shard_pages=settings.PDF_FIRST_SHARD_PAGES,
+    ocr=ocr_engine
+)
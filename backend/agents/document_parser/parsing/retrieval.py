@@ -0,0 +1,137 @@
+"""
+TutorAgent MVP Question Retrieval
+BM25 index over question segments so each turn sends only the relevant parts of a document
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+from services.redis_cache import LRUCache
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how i if in is it me my of on or so "
+    "that the this to was what when which why with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word and number tokens with common stopwords removed."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of passages."""
+
+    def __init__(self, passages: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tokenize(p)) for p in passages]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        doc_freqs: Counter = Counter()
+        for tf in self._term_freqs:
+            doc_freqs.update(tf.keys())
+        n = len(self._term_freqs)
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._term_freqs)
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[int, float]]:
+        """Get (passage index, score) pairs for the best matches, highest first."""
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        if not terms:
+            return []
+
+        scores = []
+        for index, tf in enumerate(self._term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[index] / (self._avg_length or 1))
+            score = sum(
+                self._idf[t] * tf[t] * (self.k1 + 1) / (tf[t] + norm)
+                for t in terms if t in tf
+            )
+            if score > 0:
+                scores.append((index, score))
+        scores.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scores[:top_k]
+
+
+class QuestionIndex:
+    """Question segments of one document plus their BM25 index."""
+
+    def __init__(self, segments: Sequence[str]):
+        self.segments = list(segments)
+        self.bm25 = BM25Index(self.segments)
+
+    def select(
+        self,
+        current_question: int,
+        message: str,
+        neighbours: int = 1,
+        top_k: int = 2
+    ) -> List[int]:
+        """
+        Pick segment indexes for a turn: the current question, its
+        neighbours, then the best BM25 matches for the student's message.
+
+        Args:
+            current_question: 1-based question number the student is on
+            message: The student's latest message
+        """
+        if not self.segments:
+            return []
+        current = min(max(current_question, 1), len(self.segments)) - 1
+        chosen = [
+            i for i in range(current - neighbours, current + neighbours + 1)
+            if 0 <= i < len(self.segments)
+        ]
+        extra = 0
+        for index, _ in self.bm25.search(message, top_k=top_k + len(chosen)):
+            if extra >= top_k:
+                break
+            if index not in chosen:
+                chosen.append(index)
+                extra += 1
+        return chosen
+
+    def passages_for(self, current_question: int, message: str, neighbours: int = 1, top_k: int = 2) -> str:
+        """Render the selected segments in document order for the prompt."""
+        selected = sorted(self.select(current_question, message, neighbours, top_k))
+        return "\n\n".join(f"[Question {i + 1}]\n{self.segments[i]}" for i in selected)
+
+
+# Indexes are cheap to rebuild from the stored segments, so each worker
+# keeps only the documents it has served recently
+_indexes = LRUCache(max_entries=256, name="question_index")
+
+
+def segments_digest(segments: Sequence[str]) -> str:
+    """Digest of a document's segments; changes when any segment's text does."""
+    digest = hashlib.blake2b(digest_size=16)
+    for segment in segments:
+        digest.update(segment.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def get_question_index(document_id: str, segments: Sequence[str]) -> QuestionIndex:
+    """
+    Get the question index for a document, building it on first use in this worker.
+
+    The index is rebuilt whenever the segments change, not only their count:
+    while a document is still being read or OCR fills in a page, questions
+    grow in place.
+    """
+    digest = segments_digest(segments)
+    cached = _indexes.get(document_id)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    index = QuestionIndex(segments)
+    _indexes.set(document_id, (digest, index))
+    return index
@@ -0,0 +1,229 @@
+"""
+TutorAgent MVP Question Segmentation
+Splits extracted worksheet text into structured question spans in a single regex pass
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# One alternation scanned once over the whole text, at line starts:
+#   "--- Page 3 ---"                            page marker from extraction
+#   "1.", "2)", "Q3", "Q3.", "Question 4:"     question start
+#   "(a)", "b)", "(iii)"                        sub-part start
+TOKEN = re.compile(
+    r"^(?:--- Page (?P<page>\d+) ---$"
+    r"|[ \t]*(?:Q(?:uestion)?[ \t]*(?P<qnum>\d{1,3})[.):]?|(?P<num>\d{1,3})[.)])[ \t]+(?=\S)"
+    r"|[ \t]*\(?(?P<part>[a-h]|i{1,3}|iv|vi{0,3})\)[ \t]+(?=\S))",
+    re.IGNORECASE | re.MULTILINE
+)
+PAGE_MARKER = re.compile(r"^--- Page \d+ ---$", re.MULTILINE)
+# Student messages that move between questions. Answers are full of numbers
+# ("the number 3 is prime", "go back and check step 1"), so only explicit
+# requests count: a movement verb naming the question, or a message that is
+# nothing but the request ("Q4", "next please", "let's go back").
+_ONLY = r"^\W*(?:(?:ok(?:ay)?|so|now|let'?s|can we|could we|please)\W+)*{}(?:\W+please)?\W*$"
+_QUESTION = r"(?:(?:question|problem|q)\s*#?|#)\s*(\d{1,3})\b"
+GOTO_QUESTION = re.compile(
+    r"\b(?:go|move|skip|jump|switch)\s+(?:on\s+|back\s+)?to\s+" + _QUESTION
+    + r"|\b(?:do|start|try)\s+" + _QUESTION
+    + "|" + _ONLY.format(_QUESTION),
+    re.IGNORECASE
+)
+NEXT_QUESTION = re.compile(
+    r"\b(?:go|move|skip|jump)\s+(?:on\s+)?to\s+the\s+next\s+(?:question|problem|one)\b"
+    r"|\bskip\s+(?:this|that)\s+(?:question|problem|one)\b"
+    + "|" + _ONLY.format(r"(?:(?:the\s+)?next(?:\s+(?:question|problem|one))?|skip(?:\s+(?:this|it))?|move\s+on)"),
+    re.IGNORECASE
+)
+PREVIOUS_QUESTION = re.compile(
+    r"\b(?:go|move|jump|switch)\s+back\s+(?:to\s+)?(?:the\s+)?(?:previous|last|a|one)\s+(?:question|problem|one)\b"
+    + "|" + _ONLY.format(r"(?:(?:go\s+)?back|(?:the\s+)?(?:previous|last)(?:\s+(?:question|problem|one))?)"),
+    re.IGNORECASE
+)
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+FALLBACK_CHUNK_CHARS = 800
+
+
+@dataclass
+class QuestionSpan:
+    """
+    One question, or one sub-part of a question, located in the source text.
+
+    start and end are character offsets into the text that was segmented
+    (page markers included); text has the markers removed.
+    """
+    number: int
+    part: Optional[str]
+    text: str
+    page: int
+    start: int
+    end: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.number}({self.part})" if self.part else str(self.number)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _clean(text: str) -> str:
+    return PAGE_MARKER.sub("", text).strip()
+
+
+def segment_questions(text: str, offset: int = 0, page: Optional[int] = None) -> List[QuestionSpan]:
+    """
+    Find every numbered question and lettered sub-part in document text.
+
+    Text before the first question is kept with the first question so
+    instructions are not lost. Sub-parts only count inside a question.
+    Documents without numbered questions fall back to paragraph chunks of
+    roughly FALLBACK_CHUNK_CHARS, numbered in order.
+
+    offset and page resume segmentation part way through the text: only
+    text from offset on is scanned, and it starts on the given page.
+    """
+    text = text or ""
+    page_offsets: List[int] = [offset] if page is not None else []
+    page_numbers: List[int] = [page] if page is not None else []
+    # (offset, question number, sub-part) for each boundary found
+    boundaries = []
+    number: Optional[int] = None
+    for match in TOKEN.finditer(text, offset):
+        if match.group("page"):
+            page_offsets.append(match.start())
+            page_numbers.append(int(match.group("page")))
+        elif match.group("part"):
+            if number is not None:
+                boundaries.append((match.start(), number, match.group("part").lower()))
+        else:
+            number = int(match.group("qnum") or match.group("num"))
+            boundaries.append((match.start(), number, None))
+
+    def page_at(offset: int) -> int:
+        index = bisect_right(page_offsets, offset)
+        return page_numbers[index - 1] if index else (page_numbers[0] if page_numbers else 1)
+
+    if not boundaries:
+        return _chunk_paragraphs(text, page_at, offset)
+
+    spans: List[QuestionSpan] = []
+    ends = [start for start, _, _ in boundaries[1:]] + [len(text)]
+    for (start, number, part), end in zip(boundaries, ends):
+        body = _clean(text[offset if not spans else start:end])
+        if body:
+            spans.append(QuestionSpan(number, part, body, page_at(start), start, end))
+    return spans
+
+
+def _chunk_paragraphs(text: str, page_at, offset: int = 0) -> List[QuestionSpan]:
+    spans: List[QuestionSpan] = []
+    chunk_start = offset
+    chunk_length = 0
+    paragraph_start = offset
+    breaks = [(m.start(), m.end()) for m in PARAGRAPH_BREAK.finditer(text, offset)] + [(len(text), len(text))]
+    for break_start, break_end in breaks:
+        paragraph = _clean(text[paragraph_start:break_start])
+        if paragraph:
+            if chunk_length and chunk_length + len(paragraph) > FALLBACK_CHUNK_CHARS:
+                body = _clean(text[chunk_start:paragraph_start])
+                spans.append(QuestionSpan(len(spans) + 1, None, body, page_at(chunk_start), chunk_start, paragraph_start))
+                chunk_start, chunk_length = paragraph_start, 0
+            chunk_length += len(paragraph)
+        elif not chunk_length:
+            chunk_start = break_end
+        paragraph_start = break_end
+    body = _clean(text[chunk_start:])
+    if body:
+        spans.append(QuestionSpan(len(spans) + 1, None, body, page_at(chunk_start), chunk_start, len(text)))
+    return spans
+
+
+def group_questions(spans: List[QuestionSpan]) -> List[QuestionSpan]:
+    """Merge each question's sub-parts into one span per question, in order."""
+    grouped: List[QuestionSpan] = []
+    for span in spans:
+        last = grouped[-1] if grouped else None
+        if last is not None and span.part and last.number == span.number:
+            last.text = f"{last.text}\n{span.text}"
+            last.end = span.end
+        else:
+            grouped.append(QuestionSpan(span.number, None, span.text, span.page, span.start, span.end))
+    return grouped
+
+
+class ProgressiveSegmenter:
+    """
+    Questions of text that grows at the end, such as a PDF read one batch
+    of pages at a time.
+
+    New pages can only extend the question still open at the end, so each
+    batch scans the new text plus that one question, and every question
+    before it is kept as found. While no numbered question has appeared the
+    paragraph chunks are provisional: the first numbered question sends the
+    whole text through segment_questions again, so the pages before it
+    become its preamble as they would in one pass.
+    """
+
+    def __init__(self):
+        self.questions: List[QuestionSpan] = []
+        self.numbered = False
+
+    def feed(self, text: str) -> Tuple[int, List[QuestionSpan]]:
+        """
+        Segment text, which extends the text of the previous call.
+
+        Returns how many earlier questions are unchanged and the questions
+        that follow them, the last of which is still open.
+        """
+        kept = len(self.questions) - 1
+        # The first question keeps the text before it, so until a second
+        # one is found the whole text is scanned again
+        if kept > 0 and (self.numbered or not any(_question_starts(text, self.questions[-1].start))):
+            open_question = self.questions[-1]
+            found = group_questions(segment_questions(text, open_question.start, open_question.page))
+            if not self.numbered:
+                for number, span in enumerate(found, start=open_question.number):
+                    span.number = number
+        else:
+            kept = 0
+            found = group_questions(segment_questions(text))
+            self.numbered = any(_question_starts(text, 0))
+        self.questions = self.questions[:kept] + found
+        return kept, found
+
+
+def _question_starts(text: str, offset: int):
+    return (
+        match for match in TOKEN.finditer(text, offset)
+        if match.group("qnum") or match.group("num")
+    )
+
+
+def navigate(message: str, current: int, numbers: Sequence[int]) -> int:
+    """
+    Work out which question a student's message moves to.
+
+    Args:
+        message: The student's message
+        current: 1-based position of the question the student is on
+        numbers: Printed number of each question, in document order
+
+    Returns the new 1-based position, or current if the message does not
+    ask to move. "question 7" resolves the printed number 7 to its position.
+    """
+    total = len(numbers)
+    if not total:
+        return current
+    target = current
+    match = GOTO_QUESTION.search(message)
+    if match:
+        printed = int(next(group for group in match.groups() if group))
+        target = numbers.index(printed) + 1 if printed in numbers else target
+    elif NEXT_QUESTION.search(message):
+        target = current + 1
+    elif PREVIOUS_QUESTION.search(message):
+        target = current - 1
+    return min(max(target, 1), total)
@@ -0,0 +1,163 @@
+"""
+TutorAgent MVP Image Preprocessing
+Downscale, deskew, binarize and crop photos of homework before OCR, with OpenCV array operations
+"""
+
+import logging
+from dataclasses import astuple, dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Width of an A4 page; photos carry no trustworthy DPI, so scale is inferred from it
+PAGE_WIDTH_INCHES = 8.27
+
+# Working width for skew estimation; angles survive downscaling
+SKEW_SAMPLE_WIDTH = 500
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    """Settings for the preprocessing pipeline; part of the OCR cache key."""
+    target_dpi: int = 200
+    page_width_inches: float = PAGE_WIDTH_INCHES
+    deskew: bool = True
+    max_skew: float = 10.0  # degrees
+    skew_step: float = 0.25  # degrees
+    binarize: bool = True
+    crop: bool = True
+    margin: int = 16  # pixels kept around the text after cropping
+
+    def key(self) -> str:
+        # Every field changes the image the OCR engine sees
+        return ":".join(str(value) for value in astuple(self))
+
+
+@dataclass
+class PreprocessedImage:
+    """A cleaned grayscale or binary image and what was done to it."""
+    image: np.ndarray
+    scale: float
+    skew: float
+    crop: Optional[Tuple[int, int, int, int]]  # x, y, width, height in the scaled image
+
+
+def decode(data: bytes) -> np.ndarray:
+    """Decode image bytes to a grayscale array."""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError("Unreadable image")
+    return image
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    ok, buffer = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError("Failed to encode image")
+    return buffer.tobytes()
+
+
+def downscale(image: np.ndarray, target_dpi: int, page_width_inches: float = PAGE_WIDTH_INCHES) -> Tuple[np.ndarray, float]:
+    """Shrink an image so a page-wide photo lands at target_dpi; never upscales."""
+    target_width = int(target_dpi * page_width_inches)
+    height, width = image.shape[:2]
+    if width <= target_width:
+        return image, 1.0
+    scale = target_width / width
+    return cv2.resize(image, (target_width, max(1, round(height * scale))), interpolation=cv2.INTER_AREA), scale
+
+
+def flatten_illumination(image: np.ndarray) -> np.ndarray:
+    """Divide out the background estimated by a large closing, evening out shadows and gradients."""
+    size = max(15, (min(image.shape[:2]) // 30) | 1)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (size, size))
+    background = cv2.morphologyEx(image, cv2.MORPH_CLOSE, kernel)
+    return cv2.divide(image, background, scale=255)
+
+
+def binarize(image: np.ndarray) -> np.ndarray:
+    """Otsu threshold to black ink on white."""
+    _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def _rotate(image: np.ndarray, angle: float, border: int = 255) -> np.ndarray:
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (width, height), flags=cv2.INTER_LINEAR, borderValue=border)
+
+
+def estimate_skew(binary: np.ndarray, max_skew: float = 10.0, step: float = 0.25) -> float:
+    """
+    Angle in degrees that levels the text lines, by projection profile:
+    rotated so the lines are horizontal, row ink sums are at their most peaked.
+    """
+    sample, _ = downscale(binary, SKEW_SAMPLE_WIDTH, 1.0)
+    ink = (sample < 128).astype(np.uint8) * 255
+    if not ink.any():
+        return 0.0
+
+    def score(angle: float) -> float:
+        rows = _rotate(ink, angle, border=0).sum(axis=1, dtype=np.float64)
+        return float(np.square(np.diff(rows)).sum())
+
+    coarse = np.arange(-max_skew, max_skew + 1e-9, 1.0)
+    best = max(coarse, key=score)
+    fine = np.arange(best - 1.0, best + 1.0 + 1e-9, step)
+    return float(max(fine, key=score))
+
+
+def crop_margins(binary: np.ndarray, margin: int = 16) -> Tuple[np.ndarray, Optional[Tuple[int, int, int, int]]]:
+    """Crop to the bounding box of the ink, keeping a margin; specks are ignored."""
+    ink = cv2.morphologyEx((binary < 128).astype(np.uint8), cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))
+    points = cv2.findNonZero(ink)
+    if points is None:
+        return binary, None
+    x, y, width, height = cv2.boundingRect(points)
+    top, left = max(0, y - margin), max(0, x - margin)
+    bottom = min(binary.shape[0], y + height + margin)
+    right = min(binary.shape[1], x + width + margin)
+    return binary[top:bottom, left:right], (left, top, right - left, bottom - top)
+
+
+def preprocess(image: np.ndarray, options: PreprocessOptions = PreprocessOptions()) -> PreprocessedImage:
+    """Run the full pipeline on a grayscale array."""
+    image, scale = downscale(image, options.target_dpi, options.page_width_inches)
+    image = flatten_illumination(image)
+
+    # Rotate the grayscale image so thresholding afterwards leaves no grey edges
+    skew = 0.0
+    if options.deskew:
+        skew = estimate_skew(binarize(image), options.max_skew, options.skew_step)
+        if abs(skew) >= options.skew_step:
+            image = _rotate(image, skew)
+
+    binary = binarize(image)
+    if options.binarize:
+        image = binary
+
+    crop = None
+    if options.crop:
+        _, crop = crop_margins(binary, options.margin)
+        if crop is not None:
+            x, y, width, height = crop
+            image = image[y:y + height, x:x + width]
+    return PreprocessedImage(image=image, scale=scale, skew=skew, crop=crop)
+
+
+def preprocess_bytes(data: bytes, options: PreprocessOptions = PreprocessOptions()) -> bytes:
+    """
+    Decode, preprocess and re-encode an image as PNG, ready for an OCR engine.
+
+    Images OpenCV cannot decode are returned unchanged, so the OCR engine
+    still gets to try them rather than the page failing outright.
+    """
+    try:
+        image = decode(data)
+    except ValueError:
+        logger.warning("Could not decode image for preprocessing; recognizing it as is")
+        return data
+    return encode_png(preprocess(image, options).image)
@@ -0,0 +1,196 @@
+"""
+TutorAgent MVP Conversation Context Builder
+Assembles each turn's prompt under an explicit token budget
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+from core.config import settings
+from core.metrics import metrics
+from core.tokens import estimate_tokens, truncate_to_tokens
+
+ROLE_LABELS = {"user": "Student", "assistant": "Tutor"}
+FRAMING_TOKENS = 24  # Section labels and separators added around the parts
+
+
+class Turn(Protocol):
+    """Anything with a role and content, e.g. ChatMessage or PDFChatMessage."""
+    role: str
+    content: str
+
+
+@dataclass
+class BuiltContext:
+    """A turn's prompt content plus the token accounting behind it."""
+    content: str
+    document: Optional[str] = None
+    token_count: int = 0
+    sections: Dict[str, int] = field(default_factory=dict)
+    turns_included: int = 0
+
+
+class ContextBuilder:
+    """
+    Token-budgeted context for a tutoring turn.
+
+    The system prompt and the student's latest message are always sent.
+    The document excerpt and the rolling summary of older turns are capped
+    at their own budgets, and whatever remains goes to the most recent
+    turns, newest first. Turns that drop out of the recent window are
+    folded into the rolling summary so a session of any length produces a
+    bounded prompt.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 6000,
+        document_tokens: int = 3000,
+        summary_tokens: int = 400,
+        recent_turns: int = 6,
+        turn_tokens: int = 300,
+        summary_line_tokens: int = 40
+    ):
+        self.max_tokens = max_tokens
+        self.document_tokens = document_tokens
+        self.summary_tokens = summary_tokens
+        self.recent_turns = recent_turns
+        self.turn_tokens = turn_tokens
+        self.summary_line_tokens = summary_line_tokens
+
+    def build(
+        self,
+        message: str,
+        turns: Sequence[Turn] = (),
+        header: str = "",
+        system_prompt: str = "",
+        document: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> BuiltContext:
+        """
+        Assemble the content for one turn.
+
+        Args:
+            message: The student's latest message
+            turns: Earlier turns not yet folded into the summary, oldest first
+            header: Fixed framing such as the current problem or question
+            system_prompt: Sent separately as the system instruction; counted
+                against the budget but not included in the content
+            document: Document text or retrieved passages, capped at the
+                document budget and sent ahead of the conversation
+            summary: Rolling summary of turns older than `turns`
+        """
+        sections = {
+            "system": estimate_tokens(system_prompt),
+            "header": estimate_tokens(header),
+            "message": estimate_tokens(message),
+        }
+        remaining = self.max_tokens - sum(sections.values()) - FRAMING_TOKENS
+
+        excerpt = None
+        if document:
+            excerpt = self.document_excerpt(document)
+            if estimate_tokens(excerpt) > remaining:
+                excerpt = truncate_to_tokens(document, max(0, remaining))
+            excerpt = excerpt or None
+            sections["document"] = estimate_tokens(excerpt or "")
+            remaining -= sections["document"]
+
+        summary_text = ""
+        if summary:
+            summary_text = self._tail(summary, min(self.summary_tokens, max(0, remaining)))
+            sections["summary"] = estimate_tokens(summary_text)
+            remaining -= sections["summary"]
+
+        recent: List[str] = []
+        for turn in reversed(list(turns)[-self.recent_turns:]):
+            line = self._format_turn(turn, self.turn_tokens)
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                break
+            recent.append(line)
+            remaining -= cost
+        recent.reverse()
+        sections["turns"] = sum(estimate_tokens(line) for line in recent)
+
+        parts = [header] if header else []
+        if excerpt:
+            parts.append(f"Document excerpt:\n{excerpt}")
+        if summary_text:
+            parts.append(f"Earlier in this session:\n{summary_text}")
+        if recent:
+            parts.append("Recent conversation:\n" + "\n".join(recent))
+        parts.append(f"Student Response: {message}")
+
+        content = "\n\n".join(parts)
+        # Measured on what is actually sent, so section labels are included
+        token_count = sections["system"] + estimate_tokens(content)
+        metrics.incr("context.builds")
+        metrics.incr("context.tokens", token_count)
+        return BuiltContext(
+            content=content,
+            document=excerpt,
+            token_count=token_count,
+            sections=sections,
+            turns_included=len(recent)
+        )
+
+    def document_excerpt(self, document: str) -> str:
+        """The excerpt of a document sent with each turn."""
+        return truncate_to_tokens(document, self.document_tokens)
+
+    def fold_summary(
+        self,
+        summary: Optional[str],
+        summary_upto: int,
+        turns: Sequence[Turn]
+    ) -> Tuple[Optional[str], int]:
+        """
+        Fold turns that have left the recent window into the rolling summary.
+
+        Args:
+            summary: Current rolling summary
+            summary_upto: Number of leading turns already folded in
+            turns: Every turn in the session, oldest first
+
+        Returns:
+            The new summary and summary_upto
+        """
+        keep_from = max(summary_upto, len(turns) - self.recent_turns)
+        if keep_from <= summary_upto:
+            return summary, summary_upto
+
+        lines = [summary] if summary else []
+        lines.extend(
+            self._format_turn(turn, self.summary_line_tokens)
+            for turn in turns[summary_upto:keep_from]
+        )
+        return self._tail("\n".join(lines), self.summary_tokens), keep_from
+
+    @staticmethod
+    def _format_turn(turn: Turn, max_tokens: int) -> str:
+        label = ROLE_LABELS.get(turn.role, turn.role.title())
+        text = " ".join(turn.content.split())
+        return f"{label}: {truncate_to_tokens(text, max_tokens)}"
+
+    @staticmethod
+    def _tail(text: str, max_tokens: int) -> str:
+        """Keep the newest whole lines of text that fit in max_tokens."""
+        kept: List[str] = []
+        used = 0
+        for line in reversed(text.splitlines()):
+            cost = estimate_tokens(line) + 1
+            if used + cost > max_tokens:
+                break
+            kept.append(line)
+            used += cost
+        return "\n".join(reversed(kept))
+
+
+# Create global context builder instance
+context_builder = ContextBuilder(
+    max_tokens=settings.CONTEXT_MAX_TOKENS,
+    document_tokens=settings.CONTEXT_DOCUMENT_TOKENS,
+    summary_tokens=settings.CONTEXT_SUMMARY_TOKENS,
+    recent_turns=settings.CONTEXT_RECENT_TURNS
+)
@@ -9,7 +9,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 
-from services.redis import get_session, set_session, extend_session
+from services.sessions import get_session, load_session, set_session
 from core.config import settings
 from core.logging import get_logger
 
@@ -59,8 +59,8 @@ async def tutor_respond(student_response: StudentResponse):
         })
         session_data["updated_at"] = datetime.utcnow().isoformat()
         
+        # Saving with the session TTL also extends it
         await set_session(student_response.session_id, session_data)
-        await extend_session(student_response.session_id)
         
         logger.info(f"Tutor response generated for session: {student_response.session_id}")
         
@@ -127,7 +127,7 @@ async def get_hint(session_id: str):
     Generate a helpful hint for the current question.
     """
     try:
-        session_data = await get_session(session_id)
+        session_data = await load_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
@@ -3,15 +3,18 @@ Chat API endpoints for the tutoring interface
 Handles real-time conversation between student and AI tutor
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any
 import uuid
 import logging
+import time
 from datetime import datetime
 
 from agents.assessment.gemini_agent import tutor_agent
-from services.redis import redis_client
+from agents.tutor.response_generation.context_builder import BuiltContext, context_builder
+from api.sse import sse_response, stream_tutor_reply
+from services.sessions import SessionLog, session_near_cache
 
 logger = logging.getLogger(__name__)
 
@@ -45,11 +48,19 @@ class ChatSession(BaseModel):
     messages: List[ChatMessage] = []
     current_problem: Optional[str] = None
     student_level: str = "intermediate"
+    summary: Optional[str] = None  # Rolling summary of turns before summary_upto
+    summary_upto: int = 0
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    # Only messages from summary_upto on are loaded; these place them in the log
+    message_offset: int = Field(default=0, exclude=True)
+    saved_messages: int = Field(default=0, exclude=True)
     
     model_config = {"arbitrary_types_allowed": True}
 
+# Messages are appended to a Redis list; the session key holds only the fields above
+session_log = SessionLog(prefix="chat_session:", ttl=3600, near_cache=session_near_cache)  # 1 hour
+
 # Session Management
 async def get_or_create_session(session_id: Optional[str] = None) -> ChatSession:
     """Get existing session or create a new one"""
@@ -60,9 +71,16 @@ async def get_or_create_session(session_id: Optional[str] = None) -> ChatSession
         return session
     
     try:
-        session_data = await redis_client.get_json(f"chat_session:{session_id}")
-        if session_data:
-            return ChatSession(**session_data)
+        loaded = await session_log.load(session_id)
+        if loaded:
+            fields, messages = loaded
+            offset = fields.get("summary_upto", 0)
+            return ChatSession(
+                **fields,
+                messages=messages,
+                message_offset=offset,
+                saved_messages=offset + len(messages)
+            )
     except Exception as e:
         logger.warning(f"Failed to load session {session_id}: {e}")
     
@@ -72,30 +90,99 @@ async def get_or_create_session(session_id: Optional[str] = None) -> ChatSession
     return session
 
 async def save_session(session: ChatSession):
-    """Save session to Redis"""
+    """Save session fields to Redis and append its new messages"""
     try:
         session.updated_at = datetime.now()
-        # Convert to dict and handle datetime serialization
-        session_dict = session.model_dump()
-        
-        # Convert datetime objects to ISO strings
-        for key, value in session_dict.items():
-            if isinstance(value, datetime):
-                session_dict[key] = value.isoformat()
-        
-        # Handle nested datetime in messages
-        for message in session_dict.get('messages', []):
-            if 'timestamp' in message and isinstance(message['timestamp'], datetime):
-                message['timestamp'] = message['timestamp'].isoformat()
-        
-        await redis_client.set_json(
-            f"chat_session:{session.session_id}",
-            session_dict,
-            expire=3600  # 1 hour
+        new_messages = session.messages[session.saved_messages - session.message_offset:]
+        await session_log.save(
+            session.session_id,
+            session.model_dump(mode="json", exclude={"messages"}),
+            [message.model_dump(mode="json") for message in new_messages]
         )
+        session.saved_messages = session.message_offset + len(session.messages)
     except Exception as e:
         logger.error(f"Failed to save session {session.session_id}: {e}")
 
+def start_turn(session: ChatSession, request: ChatRequest) -> bool:
+    """Record the student's message and return whether it starts a new problem"""
+    # Create user message
+    user_message = ChatMessage(
+        role="user",
+        content=request.message,
+        metadata=request.context
+    )
+    
+    # Add to session
+    session.messages.append(user_message)
+    
+    # Determine if this is the start of a new problem or continuation
+    is_new_problem = (
+        session.message_offset + len(session.messages) == 1 or 
+        "new problem" in request.message.lower() or
+        session.current_problem is None
+    )
+    
+    if is_new_problem:
+        # This looks like a new problem - set it as current
+        session.current_problem = request.message
+    
+    return is_new_problem
+
+def build_initial_content(problem: str) -> str:
+    """Build tutor agent content for the first turn on a new problem"""
+    return f"""New Problem: {problem}
+
+Student needs help with this problem."""
+
+def build_continuation_content(session: ChatSession, request: ChatRequest) -> BuiltContext:
+    """Build token-budgeted tutor agent content for a follow-up turn on the current problem"""
+    header = f"Current Problem: {session.current_problem or 'General math help'}"
+    if request.context:
+        header += f"\nContext: {request.context}"
+    
+    return context_builder.build(
+        request.message,
+        turns=session.messages[session.summary_upto - session.message_offset:-1],
+        header=header,
+        system_prompt=tutor_agent.tutoring_prompt,
+        summary=session.summary
+    )
+
+async def finish_turn(
+    session: ChatSession,
+    assistant_content: str,
+    assessment: Optional[Dict[str, Any]] = None,
+    context_tokens: Optional[int] = None
+) -> ChatMessage:
+    """Record the tutor's reply and persist the session"""
+    # Create assistant message
+    assistant_message = ChatMessage(
+        role="assistant",
+        content=assistant_content,
+        metadata={
+            "assessment": assessment,  # Will be None in the new flow
+            "problem": session.current_problem,
+            "context_tokens": context_tokens
+        }
+    )
+    
+    # Add to session
+    session.messages.append(assistant_message)
+    
+    # Fold turns that left the recent window into the rolling summary
+    session.summary, folded = context_builder.fold_summary(
+        session.summary, session.summary_upto - session.message_offset, session.messages
+    )
+    session.summary_upto = session.message_offset + folded
+    
+    # Update session level based on assessment
+    if assessment and "skill_level" in assessment:
+        session.student_level = assessment["skill_level"]
+    
+    # Save session
+    await save_session(session)
+    return assistant_message
+
 @router.post("/send", response_model=ChatResponse)
 async def send_message(request: ChatRequest):
     """
@@ -105,49 +192,21 @@ async def send_message(request: ChatRequest):
         # Get or create session
         session = await get_or_create_session(request.session_id)
         
-        # Create user message
-        user_message = ChatMessage(
-            role="user",
-            content=request.message,
-            metadata=request.context
-        )
-        
-        # Add to session
-        session.messages.append(user_message)
-        
-        # Determine if this is the start of a new problem or continuation
-        is_new_problem = (
-            len(session.messages) == 1 or 
-            "new problem" in request.message.lower() or
-            session.current_problem is None
-        )
-        
-        if is_new_problem:
-            # This looks like a new problem - set it as current
-            session.current_problem = request.message
-            
+        context_tokens = None
+        if start_turn(session, request):
             # Generate welcoming response for new problem
             assistant_content = await generate_initial_response(request.message)
             assessment = None
         else:
             # This is a continuation - use tutoring approach directly
-            # Create temporary file with conversation context
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-                # Write problem and student response
-                file_content = f"""Current Problem: {session.current_problem or "General math help"}
-
-Student Response: {request.message}
-
-Context: {request.context or {}}"""
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
+            built = build_continuation_content(session, request)
+            context_tokens = built.token_count
             
             try:
                 # Process with tutor agent
-                tutoring_response = await tutor_agent.process_file_upload(
-                    file_path=temp_file_path,
-                    context=request.context
+                tutoring_response = await tutor_agent.respond(
+                    built.content,
+                    context={**(request.context or {}), "student_level": session.student_level}
                 )
                 assistant_content = tutoring_response.get("message", "Let me help you with that!")
                 assessment = None  # No longer using assessment
@@ -161,31 +220,8 @@ Context: {request.context or {}}"""
                 logger.error(f"Error processing with tutor agent: {e}")
                 assistant_content = "I'm having a technical issue right now, but I still want to help! What specific part of this problem would you like to work on together?"
                 assessment = None
-            finally:
-                # Clean up temporary file
-                import os
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-        
-        # Create assistant message
-        assistant_message = ChatMessage(
-            role="assistant",
-            content=assistant_content,
-            metadata={
-                "assessment": assessment,  # Will be None in the new flow
-                "problem": session.current_problem
-            }
-        )
-        
-        # Add to session
-        session.messages.append(assistant_message)
-        
-        # Update session level based on assessment
-        if assessment and "skill_level" in assessment:
-            session.student_level = assessment["skill_level"]
         
-        # Save session
-        await save_session(session)
+        assistant_message = await finish_turn(session, assistant_content, assessment, context_tokens)
         
         # Generate helpful suggestions
         suggestions = generate_suggestions(assessment, session.current_problem)
@@ -201,14 +237,56 @@ Context: {request.context or {}}"""
         logger.error(f"Chat endpoint error: {e}")
         raise HTTPException(status_code=500, detail="Failed to process message")
 
+@router.post("/send/stream")
+async def send_message_stream(request: ChatRequest):
+    """
+    Send a message to the AI tutor and stream the response as server-sent events.
+    Emits `token` events as text arrives, then a `done` event with the saved message.
+    """
+    started = time.perf_counter()
+    try:
+        # Get or create session
+        session = await get_or_create_session(request.session_id)
+        
+        context_tokens = None
+        if start_turn(session, request):
+            content = build_initial_content(request.message)
+            context = {"is_initial": True}
+        else:
+            built = build_continuation_content(session, request)
+            content, context_tokens = built.content, built.token_count
+            context = {**(request.context or {}), "student_level": session.student_level}
+    except Exception as e:
+        logger.error(f"Chat stream endpoint error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to process message")
+    
+    async def on_complete(assistant_content: str) -> Dict[str, Any]:
+        assistant_message = await finish_turn(session, assistant_content, context_tokens=context_tokens)
+        return {
+            "message": assistant_message,
+            "session_id": session.session_id,
+            "suggestions": generate_suggestions(None, session.current_problem)
+        }
+    
+    return sse_response(
+        stream_tutor_reply(tutor_agent.respond_stream(content, context), on_complete, started)
+    )
+
 @router.get("/session/{session_id}/history")
-async def get_chat_history(session_id: str):
-    """Get chat history for a session"""
+async def get_chat_history(
+    session_id: str,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """Get chat history for a session, optionally one page of messages at a time"""
     try:
         session = await get_or_create_session(session_id)
+        end = offset + limit - 1 if limit else -1
+        messages = await session_log.messages(session_id, offset, end) if session.saved_messages else []
         return {
             "session_id": session.session_id,
-            "messages": session.messages,
+            "messages": messages,
+            "total_messages": session.saved_messages,
             "current_problem": session.current_problem,
             "student_level": session.student_level
         }
@@ -233,7 +311,7 @@ async def create_new_session():
 async def delete_session(session_id: str):
     """Delete a chat session"""
     try:
-        await redis_client.delete(f"chat_session:{session_id}")
+        await session_log.delete(session_id)
         return {"message": "Session deleted successfully"}
     except Exception as e:
         logger.error(f"Failed to delete session: {e}")
@@ -244,27 +322,13 @@ async def generate_initial_response(problem: str) -> str:
     """Generate initial welcoming response for a new problem"""
     try:
         # Use tutor agent to generate initial response
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-            # Write problem context
-            file_content = f"""New Problem: {problem}
-
-Student needs help with this problem."""
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
+        content = build_initial_content(problem)
         
-        try:
-            # Process with tutor agent
-            dummy_response = await tutor_agent.process_file_upload(
-                file_path=temp_file_path,
-                context={"is_initial": True}
-            )
-            return dummy_response.get("message", "Great! I'm here to help you work through this problem step by step. What do you think might be a good first step?")
-        finally:
-            # Clean up temporary file
-            import os
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        dummy_response = await tutor_agent.respond(
+            content,
+            context={"is_initial": True}
+        )
+        return dummy_response.get("message", "Great! I'm here to help you work through this problem step by step. What do you think might be a good first step?")
     except Exception as e:
         logger.warning(f"Failed to generate initial response: {e}")
         return "Hi! I'm excited to help you with this math problem. Let's work through it together - what do you think we should look at first?"
@@ -11,6 +11,11 @@ from datetime import datetime
 from services.database import database
 from services.redis import redis_client
 from core.config import settings
+from core.metrics import metrics
+from agents.assessment.gemini_agent import tutor_agent
+from services.redis_cache import artifact_cache, document_store
+from services.sessions import session_near_cache, session_store
+from services.jobs import upload_queue
 from core.logging import get_logger
 
 logger = get_logger("health")
@@ -67,11 +72,20 @@ async def health_check():
         }
         overall_status = "unhealthy"
     
-    # Check LLM API availability (basic check)
-    services["llm"] = {
-        "status": "configured" if settings.OPENAI_API_KEY else "not_configured",
-        "provider": "openai" if settings.OPENAI_API_KEY else "none"
-    }
+    # Check LLM availability: degraded while any provider circuit is not closed
+    llm_status = tutor_agent.llm.status()
+    circuits = {p["name"]: p["circuit"]["state"] for p in llm_status["providers"]}
+    if all(state == "open" for state in circuits.values()):
+        services["llm"] = {"status": "unavailable"}
+    elif all(state == "closed" for state in circuits.values()):
+        services["llm"] = {"status": "healthy"}
+    else:
+        services["llm"] = {"status": "degraded"}
+    services["llm"]["circuits"] = circuits
+    services["llm"]["concurrency_limit"] = llm_status["concurrency"]["limit"]
+    if services["llm"]["status"] != "healthy" and overall_status == "healthy":
+        # Tutoring turns fail or fall back while no provider is fully available
+        overall_status = "degraded"
     
     return HealthResponse(
         status=overall_status,
@@ -113,3 +127,37 @@ async def liveness_check():
         "timestamp": datetime.utcnow(),
         "version": settings.APP_VERSION
     }
+
+
+@router.get("/llm")
+async def llm_status():
+    """
+    Circuit breaker state per LLM provider and the current
+    adaptive concurrency limit for this worker.
+    """
+    return {
+        "timestamp": datetime.utcnow(),
+        **tutor_agent.llm.status()
+    }
+
+
+@router.get("/metrics")
+async def metrics_snapshot():
+    """
+    In-process counters and latency summaries for this worker,
+    including chat time-to-first-token, cache hit rates and job queue depth.
+    """
+    caches = {
+        "artifact_cache": artifact_cache.stats(),
+        "document_store": document_store.stats(),
+        "session_near_cache": session_near_cache.stats(),
+    }
+    if tutor_agent.response_cache:
+        caches["response_cache"] = tutor_agent.response_cache.stats()
+    return {
+        "timestamp": datetime.utcnow(),
+        **metrics.snapshot(),
+        "caches": caches,
+        "sessions": session_store.stats(),
+        "jobs": {"uploads": await upload_queue.stats()}
+    }
@@ -3,23 +3,38 @@ PDF Chat API endpoints for document-based tutoring
 Handles PDF upload, text extraction, and chat sessions with document context
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Depends, Query
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+import asyncio
 import uuid
 import logging
+import time
 from datetime import datetime
 import json
-import tempfile
-import os
 from pathlib import Path
 
 from agents.assessment.gemini_agent import tutor_agent
-from services.redis import redis_client
+from agents.document_parser.classification.topics import GENERAL, TOPIC_LABELS, tag_questions
+from agents.document_parser.parsing.extraction import PDFSource, pdf_extractor
+from agents.document_parser.parsing.retrieval import get_question_index
+from agents.document_parser.parsing.segmentation import ProgressiveSegmenter, group_questions, navigate, segment_questions
+from agents.tutor.response_generation.context_builder import BuiltContext, context_builder
+from api.sse import sse_response, stream_tutor_reply
+from services.redis_cache import artifact_cache, document_store
+from services.sessions import SessionLog, session_near_cache
+from services.file_storage.ingest import UploadTooLargeError, ingest_upload
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Seconds between progress saves while the rest of a PDF is read in the background
+PROGRESS_SAVE_INTERVAL = 1.0
+# Seconds between checks while another upload of the same PDF reads its first pages
+READER_POLL_INTERVAL = 0.2
+# Longest wait for another upload's first pages before reading the PDF here too
+READER_WAIT_TIMEOUT = 10.0
+
 router = APIRouter()
 
 # Request/Response Models
@@ -47,6 +62,8 @@ class PDFUploadResponse(BaseModel):
     questions_extracted: int
     processing_status: str
     message: str
+    pages_processed: Optional[int] = None
+    page_count: Optional[int] = None
 
 class PDFChatResponse(BaseModel):
     """Response from PDF chat endpoint"""
@@ -59,93 +76,164 @@ class PDFChatResponse(BaseModel):
 class PDFChatSession(BaseModel):
     """PDF Chat session data"""
     session_id: str
-    document_id: Optional[str] = None
+    document_id: Optional[str] = None  # SHA-256 of the uploaded bytes; text lives in the document store
     document_name: Optional[str] = None
-    extracted_text: Optional[str] = None
-    questions_extracted: int = 0
     current_question: int = 1
     messages: List[PDFChatMessage] = []
     student_level: str = "intermediate"
+    summary: Optional[str] = None  # Rolling summary of turns before summary_upto
+    summary_upto: int = 0
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    # Only messages from summary_upto on are loaded; these place them in the log
+    message_offset: int = Field(default=0, exclude=True)
+    saved_messages: int = Field(default=0, exclude=True)
     
     model_config = {"arbitrary_types_allowed": True}
 
+# Messages are appended to a Redis list; the session key holds only the fields above
+pdf_session_log = SessionLog(prefix="pdf_chat_session:", ttl=settings.PDF_SESSION_TTL, near_cache=session_near_cache)
+
 # Helper Functions
-async def extract_text_from_pdf(file_content: bytes, filename: str) -> Dict[str, Any]:
-    """Extract text from PDF using PyPDF2 or similar"""
+async def read_pdf_progressively(source: PDFSource, filename: str) -> AsyncIterator[Dict[str, Any]]:
+    """Extract text from PDF bytes or a stored file, yielding the document read so far as each batch of pages completes"""
+    segmenter = ProgressiveSegmenter()
+    questions: List[Dict[str, Any]] = []
+    document = None
     try:
-        import PyPDF2
-        import io
-        
-        # Create a PDF reader object
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        
-        extracted_text = ""
-        page_count = len(pdf_reader.pages)
-        
-        # Extract text from each page
-        for page_num, page in enumerate(pdf_reader.pages):
-            try:
-                page_text = page.extract_text()
-                if page_text.strip():
-                    extracted_text += f"\n--- Page {page_num + 1} ---\n{page_text}\n"
-            except Exception as e:
-                logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
-        
-        # Count potential questions (basic heuristic)
-        questions_found = count_math_questions(extracted_text)
-        
-        return {
-            "text": extracted_text,
-            "page_count": page_count,
-            "questions_found": questions_found,
-            "success": True
-        }
+        async for result in pdf_extractor.extract_progressive(source):
+            # One span per numbered question, sub-parts included, each tagged with its
+            # topic; only the new pages and the question left open at the last batch
+            # are segmented and tagged again
+            kept, found = segmenter.feed(result.text)
+            questions = questions[:kept] + tag_questions([span.to_dict() for span in found])
+            
+            document = {
+                "text": result.text,
+                "page_count": result.page_count,
+                "pages_processed": result.pages_processed,
+                "failed_pages": result.failed_pages,
+                "ocr_pages": result.ocr_pages,
+                "questions": questions,
+                "questions_found": max(1, len(questions)),
+                "success": result.success,
+                "complete": result.complete
+            }
+            yield document
         
     except ImportError:
         logger.error("PyPDF2 not installed. Installing...")
         # Fallback to basic text extraction
-        return {
+        yield {
             "text": "PDF text extraction requires PyPDF2. Please install it to process documents.",
             "page_count": 1,
             "questions_found": 5,  # Default estimate
-            "success": False
+            "success": False,
+            "complete": True
         }
     except Exception as e:
         logger.error(f"PDF text extraction failed: {e}")
-        return {
+        if document is not None:
+            yield failed_document(document, e)
+            return
+        yield {
             "text": f"Could not extract text from {filename}. The PDF might be image-based or corrupted.",
             "page_count": 1,
             "questions_found": 3,
-            "success": False
+            "success": False,
+            "complete": True
         }
 
-def count_math_questions(text: str) -> int:
-    """Count potential math questions in text using heuristics"""
-    question_indicators = [
-        "?", "find", "calculate", "solve", "what is", "determine",
-        "evaluate", "simplify", "factorize", "expand", "graph",
-        "plot", "draw", "construct", "prove", "show that"
-    ]
-    
-    lines = text.lower().split('\n')
-    question_count = 0
-    
-    for line in lines:
-        line = line.strip()
-        if len(line) > 10:  # Ignore very short lines
-            # Check for question indicators
-            if any(indicator in line for indicator in question_indicators):
-                question_count += 1
-            # Check for numbered questions (1., 2., a), b), etc.)
-            elif any(line.startswith(f"{i}.") or line.startswith(f"{i})") for i in range(1, 51)):
-                question_count += 1
-            elif any(line.startswith(f"{letter})") for letter in "abcdefghijklm"):
-                question_count += 1
+def failed_document(document: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Terminal state of a document whose reading stopped part way: the pages read so far stay usable"""
+    unread = range(document.get("pages_processed", 0) + 1, document["page_count"] + 1)
+    return {
+        **document,
+        "failed_pages": sorted(set(document.get("failed_pages", [])) | set(unread)),
+        "success": False,
+        "complete": True,
+        "error": str(error)
+    }
+
+def first_question_ready(extraction: Dict[str, Any]) -> bool:
+    """Whether question 1 is fully read: the document is done or question 2 has started"""
+    return extraction["complete"] or len(extraction.get("questions") or []) > 1
+
+def document_questions(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Question spans of a stored document, in order"""
+    questions = document.get("questions")
+    if questions is None:
+        questions = tag_questions([span.to_dict() for span in group_questions(segment_questions(document["text"]))])
+    return questions
+
+def document_prefix(document: Dict[str, Any]) -> Optional[str]:
+    """Question list of a fully read document: the stable part turns can share through the context cache"""
+    if not document.get("complete", True):
+        return None
+    return "\n\n".join(question["text"] for question in document_questions(document)) or None
+
+def processing_status(document: Dict[str, Any]) -> str:
+    if not document.get("complete", True):
+        return "processing"
+    return "failed" if "error" in document else "completed"
+
+async def load_document(session: PDFChatSession) -> Dict[str, Any]:
+    """Get the session's document from the shared store"""
+    if not session.document_id:
+        raise HTTPException(
+            status_code=400,
+            detail="No document uploaded. Please upload a PDF first."
+        )
+    document = await document_store.get(session.document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=400,
+            detail="This document is no longer available. Please upload it again."
+        )
+    document_store.retain(session.document_id, document)
+    return document
+
+async def finish_pdf_processing(
+    pages: AsyncIterator[Dict[str, Any]],
+    document_id: str,
+    artifacts: Dict[str, Any],
+    welcome_content: Optional[str],
+    lease: bool = True
+):
+    """
+    Read the rest of an uploaded PDF after the session was handed out,
+    releasing the reader lease when done if this upload holds it.
+
+    Progress goes to the document store rather than the session, so the
+    student's turns and this task never overwrite each other, and every
+    session on the document sees the new pages. If reading stops, the
+    pages read so far are saved as a failed document, so status checks and
+    turns stop waiting for the rest.
+    """
+    document = None
+    last_saved = 0.0
+    try:
+        async for document in pages:
+            now = time.monotonic()
+            if document["complete"] or now - last_saved >= PROGRESS_SAVE_INTERVAL:
+                await document_store.set(document_id, document)
+                await document_store.renew_reader(document_id)
+                last_saved = now
+    except Exception as e:
+        logger.error(f"Background PDF processing failed for document {document_id}: {e}")
+        if document is not None and not document["complete"]:
+            try:
+                await document_store.set(document_id, failed_document(document, e))
+            except Exception as save_error:
+                logger.error(f"Could not save failed state of document {document_id}: {save_error}")
+        return
+    finally:
+        if lease:
+            await document_store.release_reader(document_id)
     
-    # Ensure at least 1 question found
-    return max(1, min(question_count, 20))  # Cap at 20 for sanity
+    if document is not None and document["success"] and artifacts.get("welcome") is None:
+        await artifact_cache.set(document_id, {**artifacts, "welcome": welcome_content})
+    logger.info(f"Finished reading document {document_id}: {document and document['page_count']} pages")
 
 async def get_or_create_pdf_session(session_id: Optional[str] = None) -> PDFChatSession:
     """Get existing PDF session or create a new one"""
@@ -156,9 +244,16 @@ async def get_or_create_pdf_session(session_id: Optional[str] = None) -> PDFChat
         return session
     
     try:
-        session_data = await redis_client.get_json(f"pdf_chat_session:{session_id}")
-        if session_data:
-            return PDFChatSession(**session_data)
+        loaded = await pdf_session_log.load(session_id)
+        if loaded:
+            fields, messages = loaded
+            offset = fields.get("summary_upto", 0)
+            return PDFChatSession(
+                **fields,
+                messages=messages,
+                message_offset=offset,
+                saved_messages=offset + len(messages)
+            )
     except Exception as e:
         logger.warning(f"Failed to load PDF session {session_id}: {e}")
     
@@ -168,35 +263,32 @@ async def get_or_create_pdf_session(session_id: Optional[str] = None) -> PDFChat
     return session
 
 async def save_pdf_session(session: PDFChatSession):
-    """Save PDF session to Redis"""
+    """Save PDF session fields to Redis and append its new messages"""
     try:
         session.updated_at = datetime.now()
-        session_dict = session.model_dump()
-        
-        # Convert datetime objects to ISO strings
-        for key, value in session_dict.items():
-            if isinstance(value, datetime):
-                session_dict[key] = value.isoformat()
-        
-        # Handle nested datetime in messages
-        for message in session_dict.get('messages', []):
-            if 'timestamp' in message and isinstance(message['timestamp'], datetime):
-                message['timestamp'] = message['timestamp'].isoformat()
-        
-        await redis_client.set_json(
-            f"pdf_chat_session:{session.session_id}",
-            session_dict,
-            expire=7200  # 2 hours
+        new_messages = session.messages[session.saved_messages - session.message_offset:]
+        await pdf_session_log.save(
+            session.session_id,
+            session.model_dump(mode="json", exclude={"messages"}),
+            [message.model_dump(mode="json") for message in new_messages]
         )
+        session.saved_messages = session.message_offset + len(session.messages)
     except Exception as e:
         logger.error(f"Failed to save PDF session {session.session_id}: {e}")
 
 # API Routes
 @router.post("/upload", response_model=PDFUploadResponse)
-async def upload_pdf_document(file: UploadFile = File(...)):
+async def upload_pdf_document(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Upload PDF document and create new chat session
+
+    The session is returned once the pages holding the first question are
+    read; the rest of the document is read in the background.
     """
+    document_id = None
+    pages = None
+    lease = False
+    handed_off = False
     try:
         # Validate file type
         if not file.filename.lower().endswith('.pdf'):
@@ -205,54 +297,70 @@ async def upload_pdf_document(file: UploadFile = File(...)):
                 detail="Only PDF files are supported for document chat"
             )
         
-        # Check file size
-        content = await file.read()
-        if len(content) > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE // 1024 // 1024}MB"
-            )
+        # Stream to storage, hashing as we go and stopping at the size limit
+        try:
+            stored = await ingest_upload(file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Generate IDs
+        # Generate IDs; the document is identified by its content, so
+        # every session on the same worksheet shares one stored copy
         session_id = str(uuid.uuid4())
-        document_id = str(uuid.uuid4())
-        
-        # Extract text from PDF
-        extraction_result = await extract_text_from_pdf(content, file.filename)
-        
-        # Create new session with document
+        document_id = stored.sha256
+        
+        # Reuse the document and welcome from an identical earlier upload
+        document = await document_store.get(document_id)
+        artifacts = await artifact_cache.get(document_id) or {}
+        
+        wait_deadline = time.monotonic() + READER_WAIT_TIMEOUT
+        while document is None or not document.get("complete", True):
+            if await document_store.claim_reader(document_id):
+                lease = True
+                break
+            if document is not None:
+                # Another upload is reading it; this session follows its progress
+                break
+            if time.monotonic() >= wait_deadline:
+                logger.warning(f"Reader of document {document_id} stalled; reading it without the lease")
+                break
+            # Another upload has just started reading it; wait for its first questions
+            await asyncio.sleep(READER_POLL_INTERVAL)
+            document = await document_store.get(document_id)
+        
+        if lease or document is None:
+            # Extract text from PDF; workers read the stored file themselves
+            # and keep going on later pages while the session is set up
+            pages = read_pdf_progressively(stored.path, file.filename)
+            async for document in pages:
+                if first_question_ready(document):
+                    break
+            await document_store.set(document_id, document)
+        
+        document_store.retain(document_id, document)
+        
+        # Index the questions so turns send only relevant passages
+        get_question_index(document_id, [question["text"] for question in document_questions(document)])
+        
+        # Create new session referencing the document
         session = PDFChatSession(
             session_id=session_id,
             document_id=document_id,
-            document_name=file.filename,
-            extracted_text=extraction_result["text"],
-            questions_extracted=extraction_result["questions_found"]
+            document_name=file.filename
         )
+        status = processing_status(document)
         
-        # Save document content to temporary file for Gemini agent processing
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-            file_content = f"""Document: {file.filename}
-Questions found: {extraction_result["questions_found"]}
-
-Extracted Text:
-{extraction_result["text"]}"""
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
+        welcome_content = artifacts.get("welcome")
+        if welcome_content is None:
+            welcome_content = await generate_welcome_message(file.filename, document)
         
-        try:
-            # Get welcome message from Gemini agent
-            tutoring_response = await tutor_agent.process_file_upload(
-                file_path=temp_file_path,
-                context={"document_name": file.filename, "questions_found": extraction_result["questions_found"]}
-            )
-            welcome_content = tutoring_response.get("message", "Welcome! I'm ready to help you with your homework.")
-        except Exception as e:
-            logger.warning(f"Failed to get welcome message from Gemini agent: {e}")
-            welcome_content = f"""Hi! I've successfully processed "{file.filename}" and found {extraction_result["questions_found"]} questions. I'm here to guide you through each question step by step. Let's start!"""
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        if pages is not None and status == "processing":
+            background_tasks.add_task(finish_pdf_processing, pages, document_id, artifacts, welcome_content, lease)
+            handed_off = True
+        elif document["success"] and artifacts.get("welcome") is None:
+            await artifact_cache.set(document_id, {**artifacts, "welcome": welcome_content})
+        
+        if welcome_content is None:
+            welcome_content = f"""Hi! I've successfully processed "{file.filename}" and found {document["questions_found"]} questions. I'm here to guide you through each question step by step. Let's start!"""
         
         # Add welcome message from Gemini agent
         welcome_message = PDFChatMessage(
@@ -272,10 +380,16 @@ Extracted Text:
             session_id=session_id,
             document_id=document_id,
             filename=file.filename,
-            file_size=len(content),
-            questions_extracted=extraction_result["questions_found"],
-            processing_status="completed",
-            message="Document processed successfully! Ready to start tutoring."
+            file_size=stored.size,
+            questions_extracted=document["questions_found"],
+            processing_status=status,
+            message={
+                "completed": "Document processed successfully! Ready to start tutoring.",
+                "processing": "The first questions are ready! The rest of the document is still being read.",
+                "failed": "Part of the document could not be read. You can work on the questions found so far.",
+            }[status],
+            pages_processed=document.get("pages_processed", document["page_count"]),
+            page_count=document["page_count"]
         )
         
     except HTTPException:
@@ -283,6 +397,138 @@ Extracted Text:
     except Exception as e:
         logger.error(f"PDF upload error: {e}")
         raise HTTPException(status_code=500, detail="Failed to process PDF document")
+    finally:
+        # Unless the background task took them over, stop reading and let
+        # other uploads of the same file read it
+        if not handed_off:
+            if pages is not None:
+                await pages.aclose()
+            if lease:
+                await document_store.release_reader(document_id)
+
+async def generate_welcome_message(filename: str, extraction_result: Dict[str, Any]) -> Optional[str]:
+    """Generate the session welcome message; None when the tutor agent could not"""
+    # Build document content for Gemini agent processing
+    content = f"""Document: {filename}
+Questions found: {extraction_result["questions_found"]}"""
+    if not extraction_result.get("complete", True):
+        content += f"""
+Pages read so far: {extraction_result["pages_processed"]} of {extraction_result["page_count"]}"""
+    
+    try:
+        # Get welcome message from Gemini agent; the only turn that sees the
+        # document as a whole, so it is neither cached nor registered
+        tutoring_response = await tutor_agent.respond(
+            content,
+            context={"document_name": filename, "questions_found": extraction_result["questions_found"]},
+            cacheable=False,
+            document_text=context_builder.document_excerpt(extraction_result["text"])
+        )
+        if not tutor_agent.is_fallback(tutoring_response):
+            return tutoring_response.get("message", "Welcome! I'm ready to help you with your homework.")
+    except Exception as e:
+        logger.warning(f"Failed to get welcome message from Gemini agent: {e}")
+    return None
+
+def start_pdf_turn(
+    session: PDFChatSession,
+    document: Dict[str, Any],
+    request: PDFChatRequest
+) -> Tuple[BuiltContext, Dict[str, Any]]:
+    """Record the student's message and build token-budgeted agent content and document context"""
+    questions = document_questions(document)
+    
+    # "next question", "question 7" and the like move the student along
+    session.current_question = navigate(
+        request.message, session.current_question, [question["number"] for question in questions]
+    )
+    
+    # Create user message
+    user_message = PDFChatMessage(
+        role="user",
+        content=request.message,
+        question_context=f"Question {session.current_question}"
+    )
+    
+    # Add to session
+    session.messages.append(user_message)
+    
+    # Prepare context for assessment
+    topic = question_topic(session, document)
+    document_context = {
+        "document_name": session.document_name,
+        "extracted_text": document["text"][:2000],  # Limit for context
+        "current_question": session.current_question,
+        "total_questions": document["questions_found"],
+        "question_topic": topic,
+        "timestamp": datetime.now().isoformat()
+    }
+    
+    # Send only the current question, its neighbours and the passages that
+    # best match the student's message rather than the whole document
+    segments = [question["text"] for question in questions]
+    passages = get_question_index(session.document_id, segments).passages_for(
+        session.current_question, request.message
+    )
+    
+    # Build current student response with recent turns; the topic steers the tutor's approach
+    header = f"Document: {session.document_name}\nQuestion {session.current_question} of {document['questions_found']}"
+    if topic != GENERAL:
+        header += f"\nTopic: {TOPIC_LABELS[topic]}"
+    built = context_builder.build(
+        request.message,
+        turns=session.messages[session.summary_upto - session.message_offset:-1],
+        header=header,
+        system_prompt=tutor_agent.tutoring_prompt,
+        document=passages,
+        summary=session.summary
+    )
+    document_context["context_tokens"] = built.token_count
+    
+    return built, document_context
+
+def session_question(session: PDFChatSession, document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The question the student is on, as stored with the document"""
+    questions = document_questions(document)
+    if 0 < session.current_question <= len(questions):
+        return questions[session.current_question - 1]
+    return None
+
+def question_page(session: PDFChatSession, document: Dict[str, Any]) -> Optional[int]:
+    """Page the current question starts on"""
+    question = session_question(session, document)
+    return question["page"] if question else None
+
+def question_topic(session: PDFChatSession, document: Dict[str, Any]) -> str:
+    """Topic the classifier tagged the current question with"""
+    question = session_question(session, document)
+    return (question or {}).get("topic", GENERAL)
+
+async def finish_pdf_turn(session: PDFChatSession, document: Dict[str, Any], assistant_content: str) -> PDFChatMessage:
+    """Record the tutor's reply and persist the session"""
+    # Create assistant message
+    assistant_message = PDFChatMessage(
+        role="assistant",
+        content=assistant_content,
+        question_context=f"Question {session.current_question}",
+        page_reference=question_page(session, document)
+    )
+    
+    # Add to session
+    session.messages.append(assistant_message)
+    
+    # Fold turns that left the recent window into the rolling summary
+    session.summary, folded = context_builder.fold_summary(
+        session.summary, session.summary_upto - session.message_offset, session.messages
+    )
+    session.summary_upto = session.message_offset + folded
+    
+    # Note: Assessment was removed in favor of direct tutoring approach
+    # Keeping student_level as intermediate for now
+    
+    # Save session
+    await save_pdf_session(session)
+    return assistant_message
 
 @router.post("/send", response_model=PDFChatResponse)
 async def send_pdf_chat_message(request: PDFChatRequest):
@@ -293,74 +539,27 @@ async def send_pdf_chat_message(request: PDFChatRequest):
         # Get session
         session = await get_or_create_pdf_session(request.session_id)
         
-        if not session.document_id:
-            raise HTTPException(
-                status_code=400,
-                detail="No document uploaded. Please upload a PDF first."
-            )
+        document = await load_document(session)
+        built, document_context = start_pdf_turn(session, document, request)
         
-        # Create user message
-        user_message = PDFChatMessage(
-            role="user",
-            content=request.message,
-            question_context=f"Question {session.current_question}"
+        # Process with tutor agent
+        tutoring_response = await tutor_agent.respond(
+            built.content,
+            context={**document_context, **(request.context or {}), "student_level": session.student_level},
+            document_id=session.document_id,
+            document_text=document_prefix(document)
         )
         
-        # Add to session
-        session.messages.append(user_message)
-        
-        # Prepare context for assessment
-        document_context = {
-            "document_name": session.document_name,
-            "extracted_text": session.extracted_text[:2000],  # Limit for context
-            "current_question": session.current_question,
-            "total_questions": session.questions_extracted,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Save document content to temporary file for processing
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-            # Write document context and current student response
-            file_content = f"""Document: {session.document_name}
-Question {session.current_question} of {session.questions_extracted}
-
-Extracted Text:
-{session.extracted_text}
-
-Student Response: {request.message}"""
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
-        
-        try:
-            # Process with tutor agent
-            tutoring_response = await tutor_agent.process_file_upload(
-                file_path=temp_file_path,
-                context={**document_context, **(request.context or {})}
-            )
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-        
-        # Create assistant message
-        assistant_message = PDFChatMessage(
-            role="assistant",
-            content=tutoring_response.get("message", "Let me help you with that question!"),
-            question_context=f"Question {session.current_question}",
-            page_reference=1  # Could be enhanced to track actual page numbers
+        assistant_message = await finish_pdf_turn(
+            session,
+            document,
+            tutoring_response.get("message", "Let me help you with that question!")
         )
         
-        # Add to session
-        session.messages.append(assistant_message)
-        
-        # Note: Assessment was removed in favor of direct tutoring approach
-        # Keeping student_level as intermediate for now
-        
-        # Save session
-        await save_pdf_session(session)
-        
         # Generate context-aware suggestions
-        suggestions = generate_pdf_suggestions(None, session.current_question, session.questions_extracted)
+        suggestions = generate_pdf_suggestions(
+            None, session.current_question, document["questions_found"], question_topic(session, document)
+        )
         
         return PDFChatResponse(
             message=assistant_message,
@@ -376,17 +575,66 @@ Student Response: {request.message}"""
         logger.error(f"PDF chat endpoint error: {e}")
         raise HTTPException(status_code=500, detail="Failed to process message")
 
+@router.post("/send/stream")
+async def send_pdf_chat_message_stream(request: PDFChatRequest):
+    """
+    Send a message in PDF chat context and stream the response as server-sent events.
+    Emits `token` events as text arrives, then a `done` event with the saved message.
+    """
+    started = time.perf_counter()
+    try:
+        # Get session
+        session = await get_or_create_pdf_session(request.session_id)
+        
+        document = await load_document(session)
+        built, document_context = start_pdf_turn(session, document, request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"PDF chat stream endpoint error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to process message")
+    
+    async def on_complete(assistant_content: str) -> Dict[str, Any]:
+        assistant_message = await finish_pdf_turn(session, document, assistant_content)
+        return {
+            "message": assistant_message,
+            "session_id": session.session_id,
+            "document_context": document_context,
+            "suggestions": generate_pdf_suggestions(
+                None, session.current_question, document["questions_found"], question_topic(session, document)
+            )
+        }
+    
+    chunks = tutor_agent.respond_stream(
+        built.content,
+        context={**document_context, **(request.context or {}), "student_level": session.student_level},
+        document_id=session.document_id,
+        document_text=document_prefix(document)
+    )
+    return sse_response(stream_tutor_reply(chunks, on_complete, started))
+
 @router.get("/session/{session_id}/history")
-async def get_pdf_chat_history(session_id: str):
-    """Get PDF chat history for a session"""
+async def get_pdf_chat_history(
+    session_id: str,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """Get PDF chat history for a session, optionally one page of messages at a time"""
     try:
         session = await get_or_create_pdf_session(session_id)
+        end = offset + limit - 1 if limit else -1
+        messages = await pdf_session_log.messages(session_id, offset, end) if session.saved_messages else []
+        document = await document_store.get(session.document_id) if session.document_id else None
         return {
             "session_id": session.session_id,
             "document_name": session.document_name,
-            "questions_extracted": session.questions_extracted,
+            "questions_extracted": document["questions_found"] if document else 0,
+            "processing_status": processing_status(document) if document else None,
+            "pages_processed": document.get("pages_processed", document["page_count"]) if document else 0,
+            "page_count": document["page_count"] if document else 0,
             "current_question": session.current_question,
-            "messages": session.messages,
+            "messages": messages,
+            "total_messages": session.saved_messages,
             "student_level": session.student_level
         }
     except Exception as e:
@@ -410,14 +658,27 @@ async def create_new_pdf_session():
 async def delete_pdf_session(session_id: str):
     """Delete a PDF chat session"""
     try:
-        await redis_client.delete(f"pdf_chat_session:{session_id}")
+        await pdf_session_log.delete(session_id)
         return {"message": "PDF session deleted successfully"}
     except Exception as e:
         logger.error(f"Failed to delete PDF session: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete session")
 
-def generate_pdf_suggestions(assessment: Optional[Dict], current_question: int, total_questions: int) -> List[str]:
-    """Generate helpful suggestions based on PDF context and assessment"""
+TOPIC_SUGGESTIONS = {
+    "integers": "Could a number line help you here?",
+    "fractions": "Can you write the numbers in the same form first?",
+    "algebra": "Which operation would undo what is being done to the unknown?",
+    "geometry": "Which formula or angle fact fits this shape?",
+    "word_problems": "Which numbers in the story matter, and what is it asking for?",
+}
+
+def generate_pdf_suggestions(
+    assessment: Optional[Dict],
+    current_question: int,
+    total_questions: int,
+    topic: str = GENERAL
+) -> List[str]:
+    """Generate helpful suggestions based on PDF context, the question's topic and assessment"""
     suggestions = []
     
     if not assessment:
@@ -448,6 +709,10 @@ def generate_pdf_suggestions(assessment: Optional[Dict], current_question: int,
                 "Can you explain your thinking so far?"
             ]
     
+    # Lead with a nudge suited to the question's topic
+    if topic in TOPIC_SUGGESTIONS:
+        suggestions.insert(1, TOPIC_SUGGESTIONS[topic])
+    
     # Add navigation suggestions
     if current_question < total_questions:
         suggestions.append(f"Ready to move to Question {current_question + 1}?")
@@ -9,7 +9,10 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 
-from services.redis import get_session, set_session, delete_session, extend_session
+from agents.document_parser.classification.topics import classify_question
+from services.jobs import upload_queue
+from services.sessions import get_session, load_session, set_session
+from services.redis_cache import document_store
 from core.config import settings
 from core.logging import get_logger
 
@@ -37,6 +40,19 @@ class SessionResponse(BaseModel):
     updated_at: datetime
 
 
+async def upload_questions(upload_id: str) -> List[Dict[str, Any]]:
+    """Topic-tagged questions of a processed upload; empty until its job has finished."""
+    status = await upload_queue.status(upload_id)
+    document_id = ((status or {}).get("result") or {}).get("document_id")
+    document = await document_store.get(document_id) if document_id else None
+    if not document:
+        return []
+    return [
+        {"number": q["number"], "text": q["text"], "topic": q.get("topic"), "page": q["page"]}
+        for q in document.get("questions", [])
+    ]
+
+
 @router.post("/create", response_model=SessionResponse)
 async def create_session(request: SessionRequest):
     """
@@ -45,19 +61,20 @@ async def create_session(request: SessionRequest):
     try:
         session_id = str(uuid.uuid4())
         
-        # TODO: Fetch questions from processed upload
-        # For now, create mock session data
+        # Questions come from the processed upload; mock data until it is processed
+        questions = await upload_questions(request.upload_id)
+        questions_total = len(questions) or 5
         session_data = {
             "session_id": session_id,
             "upload_id": request.upload_id,
             "student_name": request.student_name,
             "status": "active",
-            "questions_total": 5,  # Mock data
+            "questions_total": questions_total,
             "questions_completed": 0,
             "current_question_index": 0,
             "created_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat(),
-            "questions": [],  # Will be populated by Document Parser Agent
+            "questions": questions,
             "progress": {
                 "skill_level": "unknown",
                 "confidence": "neutral",
@@ -76,7 +93,7 @@ async def create_session(request: SessionRequest):
             session_id=session_id,
             upload_id=request.upload_id,
             status="active",
-            questions_total=5,
+            questions_total=questions_total,
             questions_completed=0,
             current_question_index=0,
             student_name=request.student_name,
@@ -97,13 +114,11 @@ async def get_session_info(session_id: str):
     Get session information and progress.
     """
     try:
-        session_data = await get_session(session_id)
+        # Read and extend session expiration in one round trip
+        session_data = await load_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        # Extend session expiration
-        await extend_session(session_id)
-        
         return SessionResponse(
             session_id=session_data["session_id"],
             upload_id=session_data["upload_id"],
@@ -162,7 +177,7 @@ async def get_current_question(session_id: str):
     Get the current question for the session.
     """
     try:
-        session_data = await get_session(session_id)
+        session_data = await load_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
@@ -180,17 +195,16 @@ async def get_current_question(session_id: str):
                 }
             }
         
-        # TODO: Return actual question data from Document Parser Agent
+        question = questions[current_index]
         current_question = {
             "question_id": f"q_{current_index + 1}",
             "index": current_index,
-            "text": f"Sample question {current_index + 1}",
-            "type": "algebra",
+            "number": question.get("number", current_index + 1),
+            "text": question["text"],
+            "type": question.get("topic") or classify_question(question["text"]).topic,
             "difficulty": "intermediate"
         }
         
-        await extend_session(session_id)
-        
         return {
             "session_id": session_id,
             "question": current_question,
@@ -5,12 +5,14 @@ Document upload and processing endpoints
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
 from core.config import settings
 from core.logging import get_logger
+from services.file_storage.ingest import UploadTooLargeError, ingest_upload
+from services.jobs.uploads import PROCESS_UPLOAD, fetch_upload, record_upload, upload_queue
 
 logger = get_logger("upload")
 
@@ -22,6 +24,7 @@ class UploadResponse(BaseModel):
     upload_id: str
     filename: str
     file_size: int
+    content_hash: str
     status: str
     message: str
     timestamp: datetime
@@ -42,87 +45,36 @@ async def upload_document(file: UploadFile = File(...)):
                 detail=f"File type not supported. Allowed: {', '.join(settings.ALLOWED_EXTENSIONS)}"
             )
         
-        # Check file size
-        content = await file.read()
-        if len(content) > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE // 1024 // 1024}MB"
-            )
+        # Stream to storage, hashing as we go and stopping at the size limit
+        try:
+            stored = await ingest_upload(file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # Generate unique upload ID
         upload_id = str(uuid.uuid4())
         
-        # Save file temporarily and process with tutor agent
-        import tempfile
-        import os
-        
-        # Save the uploaded file temporarily
-        temp_file_path = None
-        try:
-            with tempfile.NamedTemporaryFile(mode='wb', suffix=f'.{file_extension}', delete=False) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-            
-            # Import tutor agent
-            from agents.assessment.gemini_agent import tutor_agent
-            
-            # For non-text files, we'll need to handle them differently
-            # For now, create a context description
-            try:
-                if file_extension in ['txt', 'md']:
-                    # Process text files directly
-                    tutoring_response = await tutor_agent.process_file_upload(
-                        file_path=temp_file_path,
-                        context={"upload_id": upload_id, "filename": file.filename}
-                    )
-                else:
-                    # For other file types, create a description file
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as desc_file:
-                        desc_content = f"""File: {file.filename}
-Type: {file_extension}
-Size: {len(content)} bytes
-Upload ID: {upload_id}
-
-This is a {file_extension} file that needs to be processed for tutoring."""
-                        desc_file.write(desc_content)
-                        desc_temp_path = desc_file.name
-                    
-                    try:
-                        tutoring_response = await tutor_agent.process_file_upload(
-                            file_path=desc_temp_path,
-                            context={"upload_id": upload_id, "filename": file.filename, "original_file_type": file_extension}
-                        )
-                    finally:
-                        if os.path.exists(desc_temp_path):
-                            os.unlink(desc_temp_path)
-                            
-                logger.info(f"Successfully processed file {file.filename} with tutor agent")
-                
-            except ValueError as ve:
-                # Handle Gemini API filtering or safety errors
-                logger.warning(f"Gemini API filtered response for uploaded file {file.filename}: {ve}")
-                tutoring_response = {"message": "File uploaded successfully! What would you like to work on from this material?"}
-            except Exception as tutor_error:
-                # Handle other API errors
-                logger.error(f"Error processing uploaded file {file.filename} with tutor agent: {tutor_error}")
-                tutoring_response = {"message": "File uploaded successfully! I'm ready to help you with the content."}
-            
-            logger.info(f"Document uploaded and processed: {file.filename}, ID: {upload_id}")
-            
-        except Exception as e:
-            logger.error(f"Error processing uploaded file: {e}")
-            # Continue with upload even if tutoring fails
-        finally:
-            # Clean up temporary file
-            if temp_file_path and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        # Hand the heavy work to the job workers and answer straight away
+        await record_upload(upload_id, stored, file.filename, file_extension)
+        await upload_queue.enqueue(
+            PROCESS_UPLOAD,
+            {
+                "path": str(stored.path),
+                "size": stored.size,
+                "sha256": stored.sha256,
+                "filename": file.filename,
+                "file_type": file_extension,
+            },
+            job_id=upload_id
+        )
+        logger.info(f"Document uploaded and queued: {file.filename}, ID: {upload_id}")
         
         return UploadResponse(
             upload_id=upload_id,
             filename=file.filename,
-            file_size=len(content),
-            status="uploaded",
+            file_size=stored.size,
+            content_hash=stored.sha256,
+            status="queued",
             message="Document uploaded successfully. Processing started.",
             timestamp=datetime.utcnow()
         )
@@ -140,18 +92,41 @@ async def get_upload_status(upload_id: str):
     Get upload processing status.
     """
     try:
-        # TODO: Check processing status from database/Redis
-        logger.info(f"Checking status for upload: {upload_id}")
+        job = await upload_queue.status(upload_id)
+        if job is not None:
+            result = job.get("result") or {}
+            return {
+                "upload_id": upload_id,
+                "status": job["status"],  # queued, processing, completed, failed
+                "stage": job.get("stage"),
+                "progress": job.get("progress", 0),
+                "questions_found": result.get("questions_found", job.get("questions_found", 0)),
+                "page_count": result.get("page_count", job.get("page_count")),
+                "attempts": job.get("attempts", 0),
+                "message": job.get("message"),
+                "error": job.get("error") if job["status"] == "failed" else None,
+                "processing_started_at": job.get("started_at"),
+                "processing_completed_at": job.get("completed_at"),
+                "timestamp": datetime.utcnow()
+            }
         
+        # The job record has expired; fall back to the uploads table
+        row = await fetch_upload(upload_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Upload not found")
         return {
             "upload_id": upload_id,
-            "status": "processing",  # uploaded, processing, completed, failed
-            "progress": 50,
-            "questions_found": 0,
-            "message": "Processing document...",
+            "status": row["status"],
+            "stage": row["status"],
+            "progress": 100 if row["processing_completed_at"] else 0,
+            "questions_found": row["questions_extracted"] or 0,
+            "processing_started_at": row["processing_started_at"],
+            "processing_completed_at": row["processing_completed_at"],
             "timestamp": datetime.utcnow()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Status check error: {e}")
         raise HTTPException(status_code=500, detail="Status check failed")
@@ -0,0 +1,61 @@
+"""
+Server-sent event helpers for streaming tutor replies
+"""
+
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from core.metrics import metrics
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Stop nginx/ALB-style proxies from buffering the stream
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format a single server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+async def stream_tutor_reply(
+    chunks: AsyncIterator[str],
+    on_complete: Callable[[str], Awaitable[Dict[str, Any]]],
+    started: float
+) -> AsyncIterator[str]:
+    """
+    Relay tutor text fragments as `token` events, then persist and send `done`.
+
+    Args:
+        chunks: Text fragments from the tutor agent
+        on_complete: Persists the full reply and returns the `done` payload
+        started: perf_counter() timestamp when the request was received
+    """
+    parts = []
+    ttft_ms = None
+
+    async for chunk in chunks:
+        if ttft_ms is None:
+            ttft_ms = (time.perf_counter() - started) * 1000
+            metrics.observe("chat.time_to_first_token_ms", ttft_ms)
+        parts.append(chunk)
+        yield sse_event("token", {"text": chunk})
+
+    payload = await on_complete("".join(parts).strip())
+    total_ms = (time.perf_counter() - started) * 1000
+    metrics.observe("chat.stream_total_ms", total_ms)
+
+    payload["metrics"] = {
+        "time_to_first_token_ms": round(ttft_ms or total_ms, 2),
+        "total_ms": round(total_ms, 2)
+    }
+    yield sse_event("done", payload)
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an event iterator in a text/event-stream response."""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark upload-to-first-question latency against document length: whole-document vs progressive extraction
+
+Usage: python benchmarks/bench_first_question.py [pages ...]
+Time until the PDF chat session could be handed out, leaving out the
+welcome message, which costs the same either way.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from api.routes.pdf_chat import first_question_ready, pdf_extractor, read_pdf_progressively
+from tests.fakes import make_pdf
+
+QUESTIONS_PER_PAGE = 3
+
+
+def make_document(pages: int) -> bytes:
+    return make_pdf([
+        [f"{page * QUESTIONS_PER_PAGE + q + 1}. Solve {q + 2}x + {page} = {q * page + 7} and show your working."
+         for q in range(QUESTIONS_PER_PAGE)] + ["Write your answer in the space below."] * 30
+        for page in range(pages)
+    ])
+
+
+async def time_first_question(pdf: bytes):
+    started = time.perf_counter()
+    pages = read_pdf_progressively(pdf, "bench.pdf")
+    async for extraction in pages:
+        if first_question_ready(extraction):
+            break
+    ready = time.perf_counter() - started
+    # The upload route hands the rest to a background task; drain it here
+    async for extraction in pages:
+        pass
+    return ready, time.perf_counter() - started, extraction
+
+
+async def main():
+    page_counts = [int(arg) for arg in sys.argv[1:]] or [10, 50, 200]
+    await pdf_extractor.warm()
+    print(f"🧪 Upload-to-first-question benchmark ({pdf_extractor.workers} extraction workers, first shard of {pdf_extractor.first_shard_pages} pages)")
+    for pages in page_counts:
+        pdf = make_document(pages)
+        ready, total, extraction = await time_first_question(pdf)
+        assert extraction["complete"] and extraction["page_count"] == pages
+        print(f"📄 {pages:4d} pages ({len(pdf) // 1024}KB)")
+        print(f"  whole document (old) {total * 1000:8.1f}ms")
+        print(f"  progressive           {ready * 1000:8.1f}ms  ({total / ready:.1f}x sooner, {extraction['questions_found']} questions by the end)")
+    pdf_extractor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
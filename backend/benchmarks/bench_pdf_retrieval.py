@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF chat prompt size and turn latency: whole document vs per-question retrieval
+
+Usage: python benchmarks/bench_pdf_retrieval.py
+The stand-in model's latency grows with prompt size, as real prefill does.
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from agents.assessment.gemini_agent import GeminiTutorAgent
+from agents.document_parser.parsing.retrieval import QuestionIndex
+from agents.document_parser.parsing.segmentation import group_questions, segment_questions
+from agents.tutor.response_generation.context_builder import ContextBuilder
+from core.tokens import estimate_tokens
+from tests.fakes import use_model
+
+PAGES = 20
+QUESTIONS_PER_PAGE = 5
+BASE_LATENCY = 0.05  # seconds
+PER_1K_TOKENS = 0.02  # seconds of simulated prefill per 1k prompt tokens
+TURNS = 30
+
+TOPICS = [
+    "Find the area of a triangle with base {a} cm and height {b} cm.",
+    "Solve for x: {a}x + {b} = {c}.",
+    "Simplify the expression {a}y + {b}y - {c}y.",
+    "A rectangle has length {a} m and width {b} m. Find its perimeter.",
+    "Use Pythagoras to find the hypotenuse when the legs are {a} and {b}.",
+    "Write {a}/{c} as a decimal, rounding to two places.",
+]
+
+
+class PrefillModel:
+    """Stand-in GenerativeModel whose latency scales with prompt tokens"""
+
+    def __init__(self):
+        self.prompt_tokens = []
+
+    async def generate_content_async(self, prompt, **kwargs):
+        tokens = estimate_tokens(prompt)
+        self.prompt_tokens.append(tokens)
+        await asyncio.sleep(BASE_LATENCY + PER_1K_TOKENS * tokens / 1000)
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(finish_reason="STOP")],
+            text='{"message": "What do you notice first?"}'
+        )
+
+
+def make_worksheet() -> str:
+    rng = random.Random(7)
+    pages = []
+    number = 1
+    for page in range(1, PAGES + 1):
+        lines = [f"--- Page {page} ---"]
+        for _ in range(QUESTIONS_PER_PAGE):
+            question = rng.choice(TOPICS).format(a=rng.randint(2, 12), b=rng.randint(2, 12), c=rng.randint(13, 40))
+            working = " ".join(["Show all working and explain each step clearly."] * 3)
+            lines.append(f"{number}. {question} {working}")
+            number += 1
+        pages.append("\n".join(lines))
+    return "\n".join(pages)
+
+
+async def run(label: str, agent, model, build_turn):
+    samples = []
+    for turn in range(TURNS):
+        content, document_text = build_turn(turn)
+        started = time.perf_counter()
+        await agent.respond(content, cacheable=False, document_text=document_text)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"  {label:<22} prompt≈{statistics.mean(model.prompt_tokens):7.0f} tokens  "
+        f"p50={statistics.median(samples):7.1f}ms  max={max(samples):7.1f}ms"
+    )
+
+
+async def main():
+    print(f"🧪 PDF chat retrieval benchmark ({PAGES} pages, {PAGES * QUESTIONS_PER_PAGE} questions)")
+    text = make_worksheet()
+    index = QuestionIndex([span.text for span in group_questions(segment_questions(text))])
+    builder = ContextBuilder()
+    messages = ["I'm stuck on the triangle area one", "Is the hypotenuse 13?", "How do I get x on its own?"]
+
+    def whole_document(turn):
+        message = messages[turn % len(messages)]
+        return f"Question {turn + 1}\n\nStudent Response: {message}", text
+
+    def retrieval(turn):
+        message = messages[turn % len(messages)]
+        passages = index.passages_for(turn + 1, message)
+        built = builder.build(message, header=f"Question {turn + 1}", document=passages)
+        return built.content, None
+
+    for label, build_turn in [("whole document", whole_document), ("question retrieval", retrieval)]:
+        model = PrefillModel()
+        agent = use_model(GeminiTutorAgent(), model)
+        agent.context_cache = None
+        await run(label, agent, model, build_turn)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF chat session writes: document text embedded in each session vs referenced from the document store
+
+Usage: python benchmarks/bench_pdf_session_writes.py [pages] [sessions]
+Measures the JSON written to Redis per message and in total for a class of
+students working through the same worksheet.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from agents.document_parser.parsing.segmentation import group_questions, segment_questions
+from api.routes.pdf_chat import PDFChatMessage, PDFChatSession
+
+TURNS = 20
+
+
+def make_text(pages: int) -> str:
+    return "".join(
+        f"\n--- Page {page} ---\n"
+        + "\n".join(f"{page * 3 + q}. Solve {q + 2}x + {page} = {q * page + 7} and show your working." for q in range(3))
+        + "\nWrite your answer in the space below.\n" * 20
+        for page in range(1, pages + 1)
+    )
+
+
+def session_blob(session: PDFChatSession, embedded: dict) -> str:
+    return json.dumps({**session.model_dump(mode="json"), **embedded})
+
+
+def time_turns(label: str, embedded: dict, sessions: int):
+    session = PDFChatSession(session_id="bench", document_id="sha256", document_name="worksheet.pdf")
+    written = 0
+    started = time.perf_counter()
+    for turn in range(TURNS):
+        session.messages.append(PDFChatMessage(role="user", content=f"Is the answer {turn}?"))
+        session.messages.append(PDFChatMessage(role="assistant", content="What do you get if you subtract first?" * 3))
+        written += len(session_blob(session, embedded))
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<26} {written / TURNS / 1024:8.1f}KB per message  "
+          f"{written * sessions / 1024 / 1024:8.1f}MB for {sessions} students  {elapsed / TURNS * 1000:6.2f}ms to serialize")
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    text = make_text(pages)
+    questions = [span.to_dict() for span in group_questions(segment_questions(text))]
+    embedded = {
+        "extracted_text": text,
+        "question_segments": [question["text"] for question in questions],
+        "question_numbers": [question["number"] for question in questions],
+        "question_pages": [question["page"] for question in questions],
+    }
+    document_kb = len(json.dumps({"text": text, "questions": questions})) / 1024
+    print(f"🧪 PDF session write benchmark ({pages} pages, {TURNS} turns, document {document_kb:.0f}KB)")
+    time_turns("text in every session", embedded, sessions)
+    time_turns("document store reference", {}, sessions)
+    print(f"  (plus one {document_kb:.0f}KB document store entry shared by all {sessions} students)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark question segmentation on long documents: the old per-line heuristic vs the single-pass segmenter
+
+Usage: python benchmarks/bench_question_segmentation.py [pages ...]
+The old heuristic only counted questions; the segmenter also returns each
+question's text, sub-parts, page and offsets.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from agents.document_parser.parsing.segmentation import group_questions, segment_questions
+
+QUESTIONS_PER_PAGE = 3  # question numbers stay under 1000 up to 333 pages
+RUNS = 20
+
+STEMS = [
+    "Find the area of a triangle with base {a} cm and height {b} cm.",
+    "Solve for x: {a}x + {b} = {c}.",
+    "Simplify the expression {a}y + {b}y - {c}y.",
+    "A rectangle has length {a} m and width {b} m. What is its perimeter?",
+    "Evaluate {a} squared minus {b}.",
+]
+
+
+def count_math_questions(text: str) -> int:
+    """The heuristic the PDF chat route used before the segmenter"""
+    question_indicators = [
+        "?", "find", "calculate", "solve", "what is", "determine",
+        "evaluate", "simplify", "factorize", "expand", "graph",
+        "plot", "draw", "construct", "prove", "show that"
+    ]
+    question_count = 0
+    for line in text.lower().split('\n'):
+        line = line.strip()
+        if len(line) > 10:
+            if any(indicator in line for indicator in question_indicators):
+                question_count += 1
+            elif any(line.startswith(f"{i}.") or line.startswith(f"{i})") for i in range(1, 51)):
+                question_count += 1
+            elif any(line.startswith(f"{letter})") for letter in "abcdefghijklm"):
+                question_count += 1
+    return max(1, min(question_count, 20))
+
+
+def make_text(pages: int) -> str:
+    """Extracted text in the shape PDFExtractor produces, with sub-parts and wrapped lines"""
+    rng = random.Random(pages)
+    lines = ["Mathematics Homework", "Show all working."]
+    number = 0
+    for page in range(1, pages + 1):
+        lines.append(f"--- Page {page} ---")
+        for _ in range(QUESTIONS_PER_PAGE):
+            number += 1
+            values = {"a": rng.randint(2, 20), "b": rng.randint(2, 20), "c": rng.randint(2, 50)}
+            lines.append(f"{number}. " + rng.choice(STEMS).format(**values))
+            if rng.random() < 0.3:
+                lines.extend(["(a) Give your answer in its simplest form", "(b) Check it by substitution"])
+            lines.append("Write your answer in the space below, showing the method you used.")
+    return "\n".join(lines)
+
+
+def time_call(func, text: str) -> float:
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        func(text)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    page_counts = [int(arg) for arg in sys.argv[1:]] or [100, 200, 300]
+    print(f"🧪 Question segmentation benchmark ({QUESTIONS_PER_PAGE} questions per page, median of {RUNS} runs)")
+    for pages in page_counts:
+        text = make_text(pages)
+        expected = pages * QUESTIONS_PER_PAGE
+        old_ms = time_call(count_math_questions, text)
+        new_ms = time_call(lambda t: group_questions(segment_questions(t)), text)
+        found = group_questions(segment_questions(text))
+        assert len(found) == expected and found[-1].page == pages
+        print(f"📄 {pages} pages ({len(text) // 1024}KB, {expected} questions)")
+        print(f"  old heuristic   {old_ms:8.2f} ms  counted {count_math_questions(text)}")
+        print(f"  segmenter       {new_ms:8.2f} ms  found {len(found)} with pages and offsets ({old_ms / new_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark Redis value encodings: bytes stored and encode/decode CPU time per value
+
+Usage: python benchmarks/bench_redis_codec.py
+zstd rows appear only when the zstandard package is installed.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from api.routes.chat import ChatMessage, ChatSession
+from services import codec as codec_module
+from services.codec import ValueCodec
+
+RUNS = 200
+
+
+def chat_session(messages: int) -> dict:
+    """A chat session as it was stored before the message log, messages included"""
+    session = ChatSession(session_id="4f1c2a9e-8d7b-4e0a-9c1f-2b3d4e5f6a7b", current_problem="Solve 3x + 5 = 20")
+    for turn in range(messages // 2):
+        session.messages.append(ChatMessage(role="user", content=f"Is the answer x = {turn}?", metadata={"source": "web"}))
+        session.messages.append(ChatMessage(
+            role="assistant",
+            content="Good thinking! What do you get if you subtract 5 from both sides first?",
+            metadata={"assessment": None, "problem": "Solve 3x + 5 = 20", "context_tokens": 412}
+        ))
+    return session.model_dump(mode="json")
+
+
+def document(pages: int) -> dict:
+    """A document store entry for a worksheet"""
+    questions = [
+        {"number": n, "part": None, "text": f"{n}. Solve {n}x + 3 = {n * 4 + 3} and check your answer by substitution.",
+         "page": (n - 1) // 3 + 1, "start": n * 90, "end": n * 90 + 80, "topic": "algebra"}
+        for n in range(1, pages * 3 + 1)
+    ]
+    text = "\n".join(f"--- Page {page} ---\n" + "\n".join(q["text"] for q in questions if q["page"] == page)
+                     + "\nShow all your working in the space provided." for page in range(1, pages + 1))
+    return {"text": text, "page_count": pages, "pages_processed": pages, "questions": questions,
+            "questions_found": len(questions), "success": True, "complete": True}
+
+
+def time_us(func, *args) -> float:
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    codecs = [("json (before)", None)]
+    codecs += [(f"{s} + {c}", ValueCodec(serializer=s, compression=c))
+               for s in ("json", "orjson") for c in ("none", "zlib")]
+    if codec_module.zstandard is not None:
+        codecs.append(("orjson + zstd", ValueCodec(serializer="orjson", compression="zstd")))
+    if codec_module.orjson is None:
+        print("⚠️ orjson not installed; orjson rows use stdlib json")
+
+    values = [
+        ("chat session, 20 messages", chat_session(20)),
+        ("chat session, 200 messages", chat_session(200)),
+        ("worksheet document, 20 pages", document(20)),
+    ]
+    print(f"🧪 Redis value codec benchmark (median of {RUNS} runs)")
+    for label, value in values:
+        print(f"📦 {label}")
+        baseline = len(json.dumps(value))
+        for name, codec in codecs:
+            if codec is None:
+                encoded = json.dumps(value)
+                size, encode, decode = len(encoded), time_us(json.dumps, value), time_us(json.loads, encoded)
+            else:
+                encoded = codec.encode(value)
+                assert codec.decode(encoded) == value
+                size, encode, decode = len(encoded), time_us(codec.encode, value), time_us(codec.decode, encoded)
+            print(f"  {name:<16} {size / 1024:8.1f}KB ({size / baseline:4.0%})  "
+                  f"encode {encode:8.1f}µs  decode {decode:8.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark Redis round trips in session routes: chained commands vs pipelined helpers
+
+Usage: python benchmarks/bench_redis_round_trips.py [rtt_ms]
+Uses a local Redis if one is reachable, otherwise fakeredis with rtt_ms
+(default 0.5) of simulated network latency added to every round trip.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+import redis.asyncio as redis
+
+from core.config import settings
+from services.redis import redis_client
+from services.sessions import (
+    RedisSessionBackend, SessionLog, extend_session, get_session, load_session, session_store, set_session
+)
+
+ITERATIONS = 200
+
+
+def counting(connection_class, rtt: float):
+    """Connection class that counts every packet sent, i.e. every round trip"""
+
+    class CountingConnection(connection_class):
+        round_trips = 0
+
+        async def send_packed_command(self, *args, **kwargs):
+            CountingConnection.round_trips += 1
+            if rtt:
+                await asyncio.sleep(rtt)
+            return await super().send_packed_command(*args, **kwargs)
+
+    return CountingConnection
+
+
+async def connect(rtt: float):
+    """Point the shared client at a local Redis or fakeredis; returns (backend, connection class)"""
+    connection_class = counting(redis.Connection, 0)
+    client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+        settings.redis_url, decode_responses=True, connection_class=connection_class
+    ))
+    try:
+        await client.ping()
+        redis_client.redis = client
+        redis_client.binary = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+            settings.redis_url, connection_class=connection_class
+        ))
+        return "redis", connection_class
+    except Exception:
+        pass
+    try:
+        import fakeredis
+    except ImportError:
+        return None, None
+    connection_class = counting(fakeredis.aioredis.FakeConnection, rtt)
+    server = fakeredis.FakeServer()
+    redis_client.redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    redis_client.binary = fakeredis.aioredis.FakeRedis(server=server)
+    for client in (redis_client.redis, redis_client.binary):
+        client.connection_pool.connection_class = connection_class
+    return f"fakeredis, {rtt * 1000:.1f}ms simulated RTT", connection_class
+
+
+def session_data(session_id: str) -> dict:
+    return {
+        "session_id": session_id,
+        "status": "active",
+        "questions_total": 10,
+        "questions": [{"number": n, "text": f"Solve {n}x + 3 = {n * 4}", "topic": "algebra"} for n in range(1, 11)],
+        "progress": {"skill_level": "unknown", "confidence": "neutral", "performance": []},
+    }
+
+
+# What each route did before, and does now
+
+async def get_info_chained(session_id):
+    await get_session(session_id)
+    await extend_session(session_id)
+
+
+async def get_info_pipelined(session_id):
+    await load_session(session_id)
+
+
+async def respond_chained(session_id):
+    data = await get_session(session_id)
+    await set_session(session_id, data)
+    await extend_session(session_id)
+
+
+async def respond_pipelined(session_id):
+    data = await get_session(session_id)
+    await set_session(session_id, data)
+
+
+async def chat_save_chained(session_id):
+    key = f"bench_chat:{session_id}"
+    async with redis_client.redis.pipeline(transaction=True) as pipe:
+        pipe.rpush(f"{key}:messages", json.dumps({"role": "user", "content": "Is it 4?"}))
+        pipe.expire(f"{key}:messages", 3600)
+        await pipe.execute()
+    await redis_client.set_json(key, {"session_id": session_id, "summary_upto": 0}, expire=3600)
+
+
+async def chat_save_pipelined(session_id):
+    await SessionLog(prefix="bench_chat:").save(
+        session_id, {"session_id": session_id, "summary_upto": 0}, [{"role": "user", "content": "Is it 4?"}]
+    )
+
+
+async def time_flow(flow, connection_class):
+    await set_session("bench", session_data("bench"))
+    samples = []
+    before = connection_class.round_trips
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        await flow("bench")
+        samples.append((time.perf_counter() - started) * 1000)
+    return (connection_class.round_trips - before) / ITERATIONS, statistics.median(samples)
+
+
+async def main():
+    rtt = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.0005
+    backend, connection_class = await connect(rtt)
+    if backend is None:
+        print("❌ Needs a local Redis or the fakeredis package")
+        return
+    session_store.use(RedisSessionBackend(redis_client))
+    print(f"🧪 Redis round trip benchmark ({backend}, median of {ITERATIONS})")
+    flows = [
+        ("session info / current question", get_info_chained, get_info_pipelined),
+        ("tutor respond", respond_chained, respond_pipelined),
+        ("chat session save", chat_save_chained, chat_save_pipelined),
+    ]
+    for label, chained, pipelined in flows:
+        old_trips, old_ms = await time_flow(chained, connection_class)
+        new_trips, new_ms = await time_flow(pipelined, connection_class)
+        print(f"📡 {label}")
+        print(f"  chained    {old_trips:4.1f} round trips  {old_ms:7.3f}ms")
+        print(f"  pipelined  {new_trips:4.1f} round trips  {new_ms:7.3f}ms  ({old_ms / new_ms:.1f}x)")
+    await redis_client.redis.delete("session:bench", "bench_chat:bench", "bench_chat:bench:messages")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
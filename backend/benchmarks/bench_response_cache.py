@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark tutor response cache hit-path latency against an uncached call
+
+Usage: python benchmarks/bench_response_cache.py
+Uses a local Redis for the shared tier if one is reachable.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from services.redis import redis_client
+from services.redis_cache import LRUCache, TutorResponseCache
+from tests.fakes import make_agent
+
+UPSTREAM_DELAY = 0.05  # Simulated Gemini latency; real calls take seconds
+ITERATIONS = 2000
+
+
+def summarize(label: str, samples_us):
+    samples_us = sorted(samples_us)
+    p95 = samples_us[int(len(samples_us) * 0.95) - 1]
+    print(f"  {label:<22} p50={statistics.median(samples_us):9.1f}µs  p95={p95:9.1f}µs  n={len(samples_us)}")
+
+
+async def time_calls(agent, content, n):
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        await agent.respond(content, context={"student_level": "intermediate"})
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+async def main():
+    print("🧪 Tutor response cache benchmark")
+    content = "New Problem: What is 15 + 27?\n\nStudent needs help with this problem."
+
+    agent = make_agent(delay=UPSTREAM_DELAY)
+    agent.response_cache = None
+    summarize("miss (upstream call)", await time_calls(agent, content, 20))
+
+    agent = make_agent(delay=UPSTREAM_DELAY)
+    agent.response_cache = TutorResponseCache(local=LRUCache(max_entries=1024))
+    await agent.respond(content, context={"student_level": "intermediate"})
+    summarize("L1 hit (in-process)", await time_calls(agent, content, ITERATIONS))
+
+    try:
+        await redis_client.initialize()
+    except Exception:
+        print("  L2 hit (redis)         skipped - no local Redis")
+        return
+
+    writer = TutorResponseCache(local=LRUCache(max_entries=1024))
+    key = writer.make_key(content, "intermediate")
+    await writer.set(key, {"message": "Start with the ones column."})
+    samples = []
+    for _ in range(ITERATIONS):
+        reader = TutorResponseCache(local=LRUCache(max_entries=1))
+        started = time.perf_counter()
+        await reader.get(key)
+        samples.append((time.perf_counter() - started) * 1e6)
+    summarize("L2 hit (redis)", samples)
+    await writer.delete(key)
+    await redis_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
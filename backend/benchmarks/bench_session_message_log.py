@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark chat session persistence: rewriting the whole session blob vs appending to a message log
+
+Usage: python benchmarks/bench_session_message_log.py [messages ...]
+Uses a local Redis if one is reachable, otherwise fakeredis if installed.
+Bytes written are counted either way.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from agents.tutor.response_generation.context_builder import context_builder
+from api.routes import chat
+from api.routes.chat import ChatMessage, ChatSession
+from services.redis import redis_client
+from services.sessions import RedisSessionBackend
+
+REPLY = "Good thinking! What do you get if you subtract 3 from both sides first?"
+
+
+async def connect() -> str:
+    try:
+        await redis_client.initialize()
+        return "redis"
+    except Exception:
+        pass
+    try:
+        import fakeredis
+    except ImportError:
+        return ""
+    server = fakeredis.FakeServer()
+    redis_client.redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    redis_client.binary = fakeredis.aioredis.FakeRedis(server=server)
+    return "fakeredis"
+
+
+class CountingRedis:
+    """Forward to the shared client, counting the bytes of every value written"""
+
+    def __init__(self, client):
+        self.client = client
+        self.written = 0
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def set_json(self, key, value, expire=None):
+        self.written += len(self.client.codec.encode(value))
+        return await self.client.set_json(key, value, expire)
+
+    async def set_json_and_append(self, key, value, list_key, items, expire=None, publish=None):
+        self.written += len(self.client.codec.encode(value)) + sum(len(self.client.codec.encode(item)) for item in items)
+        return await self.client.set_json_and_append(key, value, list_key, items, expire, publish)
+
+
+async def blob_save(redis: CountingRedis, session: ChatSession):
+    """How sessions were saved before the log: the whole session every turn"""
+    await redis.set_json(f"bench_blob:{session.session_id}", session.model_dump(mode="json"), expire=3600)
+
+
+async def blob_load(redis: CountingRedis, session_id: str) -> ChatSession:
+    return ChatSession(**await redis.get_json(f"bench_blob:{session_id}"))
+
+
+async def converse(messages: int, blob: bool, redis: CountingRedis):
+    """Play a conversation; returns (bytes written per turn, last turn save ms, last turn load ms, total ms)"""
+    session_id = f"{'blob' if blob else 'log'}-{messages}"
+    session = ChatSession(session_id=session_id)
+    saves = []
+    loads = []
+    started = time.perf_counter()
+    for turn in range(messages // 2):
+        load_started = time.perf_counter()
+        if turn:
+            session = await (blob_load(redis, session_id) if blob else chat.get_or_create_session(session_id))
+        loads.append(time.perf_counter() - load_started)
+
+        session.messages.append(ChatMessage(role="user", content=f"Is the answer {turn}?"))
+        session.messages.append(ChatMessage(role="assistant", content=REPLY))
+        session.summary, folded = context_builder.fold_summary(
+            session.summary, session.summary_upto - session.message_offset, session.messages
+        )
+        session.summary_upto = session.message_offset + folded
+
+        save_started = time.perf_counter()
+        await (blob_save(redis, session) if blob else chat.save_session(session))
+        saves.append(time.perf_counter() - save_started)
+    total = time.perf_counter() - started
+
+    tail = max(1, len(saves) // 10)
+    return (
+        redis.written / len(saves),
+        statistics.median(saves[-tail:]) * 1000,
+        statistics.median(loads[-tail:]) * 1000,
+        total * 1000
+    )
+
+
+async def main():
+    message_counts = [int(arg) for arg in sys.argv[1:]] or [10, 100, 500]
+    backend = await connect()
+    if not backend:
+        print("❌ Needs a local Redis or the fakeredis package")
+        return
+    print(f"🧪 Session persistence benchmark ({backend})")
+    for messages in message_counts:
+        print(f"💬 {messages} messages")
+        for label, blob in (("whole-session rewrite", True), ("append-only log", False)):
+            redis = CountingRedis(redis_client)
+            chat.session_log.store = RedisSessionBackend(redis)
+            per_turn, save_ms, load_ms, total_ms = await converse(messages, blob, redis)
+            print(f"  {label:<22} {per_turn / 1024:7.2f}KB written per turn  "
+                  f"late turns: save {save_ms:6.3f}ms load {load_ms:6.3f}ms  whole conversation {total_ms:8.1f}ms")
+    await redis_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
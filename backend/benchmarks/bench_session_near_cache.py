@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the session near cache: loading a chat session per turn with and without it
+
+Usage: python benchmarks/bench_session_near_cache.py [rtt_ms]
+Uses fakeredis with rtt_ms (default 0.5) of simulated network latency added
+to every round trip. Two workers taking turns on the same session (no
+sticky routing) show the version check falling back to Redis.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from api.routes.chat import ChatMessage, ChatSession
+from services.redis import RedisClient
+from services.sessions import RedisSessionBackend, SessionLog, SessionNearCache
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+TURNS = 200
+WINDOW = 20  # Messages after summary_upto that a turn loads
+REPLY = "Good thinking! What do you get if you subtract 3 from both sides first?"
+
+
+def counting(connection_class, rtt: float):
+    """Connection class that counts every packet sent, i.e. every round trip"""
+
+    class CountingConnection(connection_class):
+        round_trips = 0
+
+        async def send_packed_command(self, *args, **kwargs):
+            CountingConnection.round_trips += 1
+            if rtt:
+                await asyncio.sleep(rtt)
+            return await super().send_packed_command(*args, **kwargs)
+
+    return CountingConnection
+
+
+def worker_client(server, connection_class) -> RedisClient:
+    client = RedisClient()
+    client.redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    client.binary = fakeredis.aioredis.FakeRedis(server=server)
+    for redis in (client.redis, client.binary):
+        redis.connection_pool.connection_class = connection_class
+    return client
+
+
+async def converse(logs, connection_class):
+    """Play TURNS turns, each served by the next log; returns (load ms p50, round trips per load)"""
+    session_id = f"bench-{id(logs)}"
+    await logs[0].save(session_id, ChatSession(session_id=session_id).model_dump(mode="json", exclude={"messages"}), [])
+    samples = []
+    round_trips = 0
+    for turn in range(TURNS):
+        log = logs[turn % len(logs)]
+        before = connection_class.round_trips
+        started = time.perf_counter()
+        fields, messages = await log.load(session_id)
+        session = ChatSession(**fields, messages=messages)
+        samples.append((time.perf_counter() - started) * 1000)
+        round_trips += connection_class.round_trips - before
+
+        new_messages = [
+            ChatMessage(role="user", content=f"Is the answer {turn}?"),
+            ChatMessage(role="assistant", content=REPLY),
+        ]
+        count = session.summary_upto + len(messages) + len(new_messages)
+        session.summary_upto = max(0, count - WINDOW)
+        await log.save(
+            session_id,
+            session.model_dump(mode="json", exclude={"messages"}),
+            [message.model_dump(mode="json") for message in new_messages]
+        )
+    return statistics.median(samples), round_trips / TURNS
+
+
+async def main():
+    if fakeredis is None:
+        print("❌ Needs the fakeredis package")
+        return
+    rtt = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.0005
+    connection_class = counting(fakeredis.aioredis.FakeConnection, rtt)
+    server = fakeredis.FakeServer()
+    print(f"🧪 Session near cache benchmark (fakeredis, {rtt * 1000:.1f}ms simulated RTT, "
+          f"{TURNS} turns, {WINDOW} messages loaded per turn)")
+
+    def log(near_cache=None):
+        store = RedisSessionBackend(worker_client(server, connection_class))
+        return SessionLog(prefix="bench_chat:", store=store, near_cache=near_cache)
+
+    scenarios = [
+        ("no near cache", [log()]),
+        ("near cache, 1 worker", [log(SessionNearCache(worker_id="a"))]),
+        ("near cache, 2 workers", [log(SessionNearCache(worker_id="a")), log(SessionNearCache(worker_id="b"))]),
+    ]
+    baseline = None
+    for label, logs in scenarios:
+        load_ms, round_trips = await converse(logs, connection_class)
+        baseline = baseline or load_ms
+        hits = sum(log.near_cache.hits for log in logs if log.near_cache)
+        lookups = sum(log.near_cache.hits + log.near_cache.misses for log in logs if log.near_cache)
+        hit_rate = f"hit rate {hits / lookups:4.0%}" if lookups else " " * 13
+        print(f"  {label:<22} load {load_ms:6.3f}ms  {round_trips:3.1f} round trips  {hit_rate}  "
+              f"saved {baseline - load_ms:6.3f}ms per turn")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark session backends: a tutoring turn against process memory vs Redis
+
+Usage: python benchmarks/bench_session_store.py [sessions]
+The Redis rows use a local Redis if one is reachable, otherwise fakeredis if installed.
+The memory store is bounded to a quarter of the sessions to show LRU eviction.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from services.redis import redis_client
+from services.sessions import MemorySessionBackend, RedisSessionBackend, SessionBackend, SessionLog
+
+
+async def connect() -> str:
+    try:
+        await redis_client.initialize()
+        return "redis"
+    except Exception:
+        pass
+    try:
+        import fakeredis
+    except ImportError:
+        return ""
+    server = fakeredis.FakeServer()
+    redis_client.redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    redis_client.binary = fakeredis.aioredis.FakeRedis(server=server)
+    return "fakeredis"
+
+
+def session_data(session_id: str) -> dict:
+    return {
+        "session_id": session_id,
+        "status": "active",
+        "current_question_index": 0,
+        "questions": [{"number": n, "text": f"Solve {n}x + 5 = {n * 3 + 5}", "topic": "algebra"} for n in range(1, 11)],
+        "progress": {"skill_level": "unknown", "confidence": "neutral", "performance": []},
+    }
+
+
+async def turn(store: SessionBackend, log: SessionLog, session_id: str):
+    """One tutoring turn: load and save the session record, then a chat turn"""
+    session = await store.get_and_touch(f"session:bench:{session_id}", 3600)
+    if session is None:
+        session = session_data(session_id)
+    session["progress"]["performance"].append({"student_response": "x = 5"})
+    await store.set(f"session:bench:{session_id}", session, 3600)
+
+    loaded = await log.load(session_id)
+    fields = loaded[0] if loaded else {"session_id": session_id, "summary_upto": 0}
+    await log.save(session_id, fields, [
+        {"role": "user", "content": "Is it x = 5?"},
+        {"role": "assistant", "content": "Good thinking! How could you check that?"},
+    ])
+
+
+async def run(store: SessionBackend, sessions: int, turns: int):
+    """Returns (median ms per turn, turns per second)"""
+    log = SessionLog(prefix="bench_chat:", store=store)
+    samples = []
+    started = time.perf_counter()
+    for _ in range(turns):
+        for n in range(sessions):
+            turn_started = time.perf_counter()
+            await turn(store, log, str(n))
+            samples.append(time.perf_counter() - turn_started)
+    elapsed = time.perf_counter() - started
+    return statistics.median(samples) * 1000, len(samples) / elapsed
+
+
+async def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    turns = 5
+    print(f"🧪 Session store benchmark ({sessions} sessions x {turns} turns)")
+
+    backends = [
+        ("memory", MemorySessionBackend()),
+        # Each session holds three keys; keep a quarter of them
+        ("memory, bounded", MemorySessionBackend(max_entries=sessions * 3 // 4)),
+    ]
+    redis_backend = await connect()
+    if redis_backend:
+        backends.append((redis_backend, RedisSessionBackend(redis_client)))
+    else:
+        print("⚠️ No local Redis or fakeredis; showing memory only")
+
+    for label, store in backends:
+        per_turn, rate = await run(store, sessions, turns)
+        extra = ""
+        if isinstance(store, MemorySessionBackend):
+            stats = store.stats()
+            extra = f"  {stats['entries']} keys, {stats['bytes'] / 1024:.0f}KB, {stats['evictions']} evicted"
+        print(f"  {label:<16} {per_turn:7.3f}ms per turn  {rate:9.0f} turns/s{extra}")
+
+    if redis_backend:
+        for n in range(sessions):
+            await redis_client.delete(f"session:bench:{n}", f"bench_chat:{n}", f"bench_chat:{n}:messages")
+        await redis_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark local question topic classification: throughput and accuracy on the labelled fixture
+
+Usage: python benchmarks/bench_topic_classifier.py [questions]
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from agents.document_parser.classification.topics import TOPICS, _build_centroids, classify_questions
+
+FIXTURE = project_root / "tests" / "fixtures" / "labelled_questions.json"
+RUNS = 5
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    labelled = json.loads(FIXTURE.read_text())
+    texts = [labelled[i % len(labelled)]["text"] for i in range(count)]
+    print(f"🧪 Topic classifier benchmark ({count} questions, median of {RUNS} runs)")
+    started = time.perf_counter()
+    _build_centroids()
+    print(f"  TF-IDF centroids, built once at import  {(time.perf_counter() - started) * 1000:7.2f}ms")
+
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        classify_questions(texts)
+        samples.append(time.perf_counter() - started)
+    elapsed = statistics.median(samples)
+    print(f"  batch of {count}: {elapsed * 1000:8.1f}ms  {count / elapsed:10.0f} questions/s  "
+          f"{elapsed / count * 1e6:6.1f}µs per question")
+
+    tags = classify_questions([item["text"] for item in labelled])
+    confusion = Counter((item["topic"], tag.topic) for item, tag in zip(labelled, tags))
+    correct = sum(n for (expected, got), n in confusion.items() if expected == got)
+    print(f"📊 Accuracy on {len(labelled)} labelled questions: {correct / len(labelled):.1%}")
+    for topic in TOPICS:
+        total = sum(n for (expected, _), n in confusion.items() if expected == topic)
+        misses = {got: n for (expected, got), n in confusion.items() if expected == topic and got != topic}
+        print(f"  {topic:<14} {confusion[(topic, topic)]}/{total}" + (f"  missed as {misses}" if misses else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark server peak RSS under parallel uploads: buffered read() vs streaming ingestion
+
+Usage: python benchmarks/bench_upload_ingest.py [uploads] [size_mb]
+Starts a uvicorn server per mode and reads its peak RSS (VmHWM) from /proc, so Linux only.
+Starlette still spools each multipart file part in memory up to 1MB before
+rolling it to disk, which bounds what streaming can save per upload.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+import httpx
+
+MODES = ["buffered", "streaming"]
+
+
+def build_app(mode: str, upload_dir: str):
+    """Minimal app with one upload endpoint in the given mode."""
+    from fastapi import FastAPI, File, HTTPException, UploadFile
+
+    from core.config import settings
+    from services.file_storage.ingest import UploadTooLargeError, ingest_upload
+
+    app = FastAPI()
+    settings.UPLOAD_DIR = upload_dir
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        if mode == "buffered":
+            # The previous route behaviour
+            content = await file.read()
+            if len(content) > settings.MAX_FILE_SIZE:
+                raise HTTPException(status_code=400, detail="File too large")
+            await asyncio.sleep(0.2)  # Work done while the bytes are held
+            return {"size": len(content)}
+        try:
+            stored = await ingest_upload(file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await asyncio.sleep(0.2)
+        return {"size": stored.size}
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def peak_rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def upload_all(port: int, paths, timeout: float = 120.0):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+        async def one(path):
+            with open(path, "rb") as f:
+                response = await client.post("/upload", files={"file": (path.name, f, "application/pdf")})
+            response.raise_for_status()
+
+        await asyncio.gather(*(one(p) for p in paths))
+
+
+async def run_mode(mode: str, paths, upload_dir: Path):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", mode, str(port), str(upload_dir)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        async with httpx.AsyncClient() as client:
+            for _ in range(100):
+                try:
+                    await client.get(f"http://127.0.0.1:{port}/docs")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+        idle = peak_rss_mb(server.pid)
+        started = time.perf_counter()
+        await upload_all(port, paths)
+        elapsed = time.perf_counter() - started
+        peak = peak_rss_mb(server.pid)
+        print(f"  {mode:<10} idle={idle:7.1f}MB  peak={peak:7.1f}MB  (+{peak - idle:6.1f}MB)  {elapsed:6.2f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main():
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    size_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 9.5
+    print(f"🧪 Upload ingestion benchmark ({uploads} parallel uploads of {size_mb}MB)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(uploads):
+            path = Path(tmp) / f"worksheet-{i}.pdf"
+            path.write_bytes(os.urandom(int(size_mb * 1024 * 1024)))
+            paths.append(path)
+        for mode in MODES:
+            await run_mode(mode, paths, Path(tmp) / f"stored-{mode}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        import uvicorn
+
+        uvicorn.run(build_app(sys.argv[2], sys.argv[4]), host="127.0.0.1", port=int(sys.argv[3]), log_level="warning")
+    else:
+        asyncio.run(main())
@@ -33,26 +33,94 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    REDIS_CODEC: str = "orjson"  # orjson or json; json when orjson is not installed
+    REDIS_COMPRESSION: str = "zstd"  # zstd, zlib or none; zlib when zstandard is not installed
+    REDIS_COMPRESS_MIN_BYTES: int = 1024  # Smaller values are stored uncompressed
     
     # LLM API Keys
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
     GEMINI_API_KEY: Optional[str] = None
     
+    # LLM Request Settings
+    LLM_MAX_CONCURRENCY: int = 8  # Global cap on in-flight upstream LLM calls
+    LLM_REQUEST_TIMEOUT: float = 30.0  # seconds
+    LLM_CONTEXT_CACHE_BACKEND: str = "gemini"  # gemini, local or none
+    LLM_CONTEXT_CACHE_TTL: int = 7200  # seconds, matches PDF session lifetime
+    LLM_PROVIDERS: List[str] = ["gemini", "openai", "anthropic"]  # Failover/hedge order
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_DEFAULT_DELAY: float = 8.0  # seconds, used until p95 has enough samples
+    LLM_HEDGE_MIN_DELAY: float = 0.5  # seconds
+    LLM_MIN_CONCURRENCY: int = 1  # Floor for the adaptive concurrency limit
+    LLM_LATENCY_TARGET_MS: float = 10000.0  # Calls slower than this shrink the limit
+    LLM_BREAKER_FAILURE_RATE: float = 0.5  # Share of failed or slow calls that opens a circuit
+    LLM_BREAKER_SLOW_CALL_MS: float = 20000.0
+    LLM_BREAKER_MIN_CALLS: int = 10
+    LLM_BREAKER_WINDOW: int = 20  # Recent calls considered per provider
+    LLM_BREAKER_RESET_TIMEOUT: float = 30.0  # seconds before a half-open trial call
+    OPENAI_MODEL: str = "gpt-4o"
+    ANTHROPIC_MODEL: str = "claude-3-5-sonnet-latest"
+    
+    # Conversation Context Budget (estimated tokens per turn)
+    CONTEXT_MAX_TOKENS: int = 6000  # System prompt + document excerpt + conversation
+    CONTEXT_DOCUMENT_TOKENS: int = 3000
+    CONTEXT_SUMMARY_TOKENS: int = 400  # Rolling summary of older turns
+    CONTEXT_RECENT_TURNS: int = 6  # Turns sent verbatim before folding into the summary
+    
+    # Tutor Response Cache
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL: int = 3600  # 1 hour
+    
+    # Document Artifact Cache (keyed by upload SHA-256)
+    ARTIFACT_CACHE_MAX_ENTRIES: int = 128
+    ARTIFACT_CACHE_TTL: int = 86400  # 1 day
+    
+    # Document Store (extracted text and questions, shared by sessions)
+    # Without Redis the local tier is the only copy: documents live PDF sessions
+    # still use are kept past this limit until PDF_SESSION_TTL after their last turn
+    DOCUMENT_STORE_MAX_ENTRIES: int = 64
+    DOCUMENT_STORE_TTL: int = 86400  # 1 day; must outlive the sessions referencing it
+    DOCUMENT_READER_LEASE_TTL: int = 120  # Seconds one upload may go without saving progress before another takes over reading
+    
+    # PDF Processing
+    PDF_EXTRACT_WORKERS: int = 2  # Extraction processes; 0 extracts in a thread instead
+    PDF_EXTRACT_PAGES_PER_SHARD: int = 8
+    PDF_FIRST_SHARD_PAGES: int = 2  # Pages extracted ahead of the rest so tutoring can start
+    
+    # Background Jobs
+    JOB_WORKER_CONCURRENCY: int = 2  # Jobs run at once per standalone worker process
+    JOB_INLINE_WORKERS: int = 0  # Job slots run inside the API process; at least 1 without Redis
+    JOB_VISIBILITY_TIMEOUT: int = 300  # seconds without a heartbeat before a job is retried
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_STATUS_TTL: int = 86400  # 1 day
+    
     # File Storage Configuration
     UPLOAD_DIR: str = "./data/uploads"
     PROCESSED_DIR: str = "./data/processed"
     MAX_FILE_SIZE: int = 10485760  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 65536  # Bytes read and written per step while streaming uploads
     ALLOWED_EXTENSIONS: List[str] = ["pdf", "png", "jpg", "jpeg"]
     
     # OCR Configuration
     OCR_ENGINE: str = "paddleocr"  # paddleocr or tesseract
     OCR_LANGUAGE: str = "en"
     TESSERACT_CMD: str = "/usr/bin/tesseract"
+    OCR_WORKERS: int = 2  # OCR processes; 0 runs OCR in a thread instead
+    OCR_PREPROCESS: bool = True  # Downscale, deskew, binarize and crop images before OCR
+    OCR_TARGET_DPI: int = 200  # Resolution photos are downscaled to, assuming a page-wide shot
+    OCR_CACHE_MAX_ENTRIES: int = 512  # Recognized text per image hash
+    OCR_CACHE_TTL: int = 604800  # 1 week
     
     # Session Configuration
     SESSION_TIMEOUT: int = 3600  # 1 hour
+    PDF_SESSION_TTL: int = 7200  # 2 hours since the last turn
     MAX_QUESTIONS_PER_SESSION: int = 20
+    SESSION_MEMORY_MAX_ENTRIES: int = 10000  # In-process store when Redis is unavailable
+    SESSION_MEMORY_MAX_BYTES: int = 67108864  # 64MB
+    SESSION_MEMORY_SWEEP_INTERVAL: float = 60  # Seconds between expiry sweeps
+    SESSION_NEAR_CACHE_MAX_ENTRIES: int = 256  # Chat message logs kept per worker
+    SESSION_INVALIDATION_CHANNEL: str = "session_invalidations"
     
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
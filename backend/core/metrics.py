@@ -0,0 +1,91 @@
+"""
+TutorAgent MVP In-Process Metrics
+Lightweight counters and latency summaries exposed through the health routes
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class LatencySummary:
+    """Rolling window of latency samples in milliseconds."""
+
+    def __init__(self, window: int = 1000):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def observe(self, value_ms: float):
+        """Record a single latency sample."""
+        self._samples.append(value_ms)
+        self.count += 1
+
+    def percentile(self, pct: float) -> float:
+        """Get a percentile (0-100) over the current window."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get summary statistics for the current window."""
+        if not self._samples:
+            return {"count": self.count, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "avg_ms": round(sum(self._samples) / len(self._samples), 2),
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "max_ms": round(max(self._samples), 2),
+        }
+
+
+class Metrics:
+    """Process-wide registry of named counters and latency summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._latencies: Dict[str, LatencySummary] = {}
+
+    def incr(self, name: str, amount: int = 1):
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, value_ms: float):
+        """Record a latency sample in milliseconds."""
+        with self._lock:
+            summary = self._latencies.get(name)
+            if summary is None:
+                summary = self._latencies[name] = LatencySummary()
+            summary.observe(value_ms)
+
+    def counter(self, name: str) -> int:
+        """Get the current value of a counter."""
+        return self._counters.get(name, 0)
+
+    def latency(self, name: str) -> Dict[str, float]:
+        """Get summary statistics for a latency metric."""
+        with self._lock:
+            summary = self._latencies.get(name)
+            return summary.snapshot() if summary else LatencySummary().snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get every counter and latency summary."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "latencies": {name: s.snapshot() for name, s in self._latencies.items()},
+            }
+
+    def reset(self):
+        """Clear all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._latencies.clear()
+
+
+# Create global metrics instance
+metrics = Metrics()
@@ -0,0 +1,26 @@
+"""
+TutorAgent MVP Token Estimation
+"""
+
+CHARS_PER_TOKEN = 4  # Rough average for English and maths text
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the LLM token count of text without calling a tokenizer."""
+    if not text:
+        return 0
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " …") -> str:
+    """Cut text to roughly max_tokens, ending on a word boundary where possible."""
+    if max_tokens <= 0 or not text:
+        return ""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max(0, max_chars - len(marker))]
+    space = cut.rfind(" ")
+    if space > len(cut) // 2:
+        cut = cut[:space]
+    return cut.rstrip() + marker
@@ -19,8 +19,16 @@ sys.path.insert(0, str(project_root))
 from core.config import settings
 from core.logging import setup_logging
 from api.routes import health, upload, session, agents, chat, pdf_chat
+from agents.document_parser.ocr.engine import ocr_engine
+from agents.document_parser.parsing.extraction import pdf_extractor
 from services.database import database
 from services.redis import redis_client
+from services.sessions import RedisSessionBackend, session_near_cache, session_store
+from services.file_storage.ingest import UploadSizeLimitMiddleware
+from services.jobs import build_upload_worker, upload_queue
+
+# Upload job slots run inside this process, if any
+inline_worker = None
 
 # Setup logging
 logger = setup_logging()
@@ -50,7 +58,9 @@ def is_cors_allowed(origin: str) -> bool:
     
     return False
 
-# Add middleware
+# Add middleware; the upload size limit sits inside CORS so its 413s carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origin_regex=r"https://(.*\.)?vercel\.app$|http://localhost:.*|http://127\.0\.0\.1:.*",
@@ -91,9 +101,37 @@ async def startup_event():
         try:
             await redis_client.initialize()
             logger.info("✅ Redis connected")
+            session_store.use(RedisSessionBackend(redis_client))
+            session_near_cache.listen(redis_client)
         except Exception as e:
             logger.warning(f"⚠️  Redis not available: {e}")
-            logger.info("💡 Sessions will use memory storage")
+            session_store.backend.start()
+            logger.info(f"💡 Sessions will use memory storage (up to {settings.SESSION_MEMORY_MAX_ENTRIES} keys)")
+        
+        # Start PDF extraction workers before the first upload arrives
+        try:
+            await pdf_extractor.warm()
+            logger.info("✅ PDF extraction pool ready")
+        except Exception as e:
+            logger.warning(f"⚠️  PDF extraction pool not available: {e}")
+        
+        # Start OCR workers for scanned pages and photos
+        try:
+            await ocr_engine.warm()
+            if ocr_engine.available:
+                logger.info("✅ OCR pool ready")
+        except Exception as e:
+            logger.warning(f"⚠️  OCR pool not available: {e}")
+        
+        # Run upload jobs here when there is no shared queue for worker processes
+        global inline_worker
+        inline_slots = settings.JOB_INLINE_WORKERS if upload_queue.distributed else max(1, settings.JOB_INLINE_WORKERS)
+        if inline_slots:
+            inline_worker = build_upload_worker(inline_slots)
+            inline_worker.start()
+            logger.info(f"✅ Upload jobs running in-process ({inline_slots} slots)")
+        else:
+            logger.info("💡 Upload jobs queued for worker processes (python -m services.jobs.worker)")
         
         # Initialize agents (placeholder for now)
         logger.info("✅ Agents initialized")
@@ -111,8 +149,14 @@ async def shutdown_event():
     logger.info("🛑 Shutting down TutorAgent MVP...")
     
     try:
+        if inline_worker is not None:
+            await inline_worker.stop()
         await database.disconnect()
+        await session_store.backend.stop()
+        await session_near_cache.stop()
         await redis_client.close()
+        pdf_extractor.shutdown()
+        ocr_engine.shutdown()
         logger.info("✅ Cleanup completed")
     except Exception as e:
         logger.error(f"❌ Error during shutdown: {e}")
@@ -0,0 +1,105 @@
+"""
+TutorAgent MVP Value Codec
+Versioned binary encoding for JSON values stored in Redis, with optional compression
+"""
+
+import json
+import zlib
+from typing import Any, Union
+
+from core.metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # Optional; stdlib json is used instead
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional; zlib is used instead
+    zstandard = None
+
+# Encoded values start with MAGIC, which is a UTF-8 continuation byte and so
+# can never begin the JSON text stored before the codec existed.
+# Header layout: MAGIC, format version, serializer id, compression id
+MAGIC = 0xB7
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+SERIALIZERS = {"json": 0, "orjson": 1}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+class ValueCodec:
+    """
+    Encodes JSON-compatible values to bytes and back.
+
+    Values whose serialized form reaches compress_min_bytes are compressed.
+    The header records how each value was written, so decoding does not
+    depend on the current settings and plain JSON from before the codec
+    still loads. Asking for orjson or zstd without the package installed
+    falls back to json or zlib.
+    """
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "zstd",
+        compress_min_bytes: int = 1024,
+        level: int = 3
+    ):
+        if serializer not in SERIALIZERS or compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown codec {serializer}/{compression}")
+        if serializer == "orjson" and orjson is None:
+            serializer = "json"
+        if compression == "zstd" and zstandard is None:
+            compression = "zlib"
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self.level = level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=level) if compression == "zstd" else None
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize, compress if large enough, and prefix the header."""
+        if self.serializer == "orjson":
+            payload = orjson.dumps(value)
+        else:
+            payload = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+        compression = self.compression if len(payload) >= self.compress_min_bytes else "none"
+        if compression == "zstd":
+            body = self._zstd_compressor.compress(payload)
+        elif compression == "zlib":
+            body = zlib.compress(payload, self.level)
+        else:
+            body = payload
+
+        metrics.incr("codec.serialized_bytes", len(payload))
+        metrics.incr("codec.stored_bytes", len(body) + HEADER_SIZE)
+        return bytes((MAGIC, FORMAT_VERSION, SERIALIZERS[self.serializer], COMPRESSIONS[compression])) + body
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """Decode a value written by any codec version, or plain JSON."""
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data or data[0] != MAGIC:
+            return json.loads(data)
+        if len(data) < HEADER_SIZE or data[1] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported codec format {data[1] if len(data) > 1 else None}")
+
+        serializer, compression, body = data[2], data[3], data[HEADER_SIZE:]
+        if compression == COMPRESSIONS["zstd"]:
+            if zstandard is None:
+                raise ValueError("Value is zstd-compressed but zstandard is not installed")
+            body = zstandard.ZstdDecompressor().decompress(body)
+        elif compression == COMPRESSIONS["zlib"]:
+            body = zlib.decompress(body)
+        elif compression != COMPRESSIONS["none"]:
+            raise ValueError(f"Unknown compression {compression}")
+
+        if serializer == SERIALIZERS["orjson"] and orjson is not None:
+            return orjson.loads(body)
+        if serializer in SERIALIZERS.values():
+            return json.loads(body)
+        raise ValueError(f"Unknown serializer {serializer}")
@@ -0,0 +1,155 @@
+"""
+TutorAgent MVP Upload Ingestion
+Streams uploads to content-addressed storage in bounded chunks
+"""
+
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import metrics
+
+logger = get_logger("file_storage")
+
+# Multipart framing and headers around the file part
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised as soon as an upload crosses the byte limit."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File too large. Maximum size: {max_bytes // 1024 // 1024}MB")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StoredUpload:
+    """An upload written to storage, addressed by the SHA-256 of its bytes."""
+    path: Path
+    size: int
+    sha256: str
+    deduplicated: bool = False
+
+
+def content_path(directory: Path, sha256: str, extension: str) -> Path:
+    """Storage path for content, fanned out by hash prefix."""
+    suffix = f".{extension}" if extension else ""
+    return directory / sha256[:2] / f"{sha256}{suffix}"
+
+
+async def ingest_upload(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    directory: Optional[str] = None,
+    chunk_size: Optional[int] = None
+) -> StoredUpload:
+    """
+    Stream an upload to storage while hashing it, without holding it in memory.
+
+    The file is written to a temporary name in chunks and renamed to its
+    content address once complete; identical content is stored once.
+
+    Raises:
+        UploadTooLargeError: As soon as more than max_bytes have been read;
+            the partial file is removed
+    """
+    max_bytes = settings.MAX_FILE_SIZE if max_bytes is None else max_bytes
+    directory = Path(directory or settings.UPLOAD_DIR)
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    extension = Path(file.filename or "").suffix.lstrip(".").lower()
+
+    partial = directory / f".partial-{uuid.uuid4().hex}"
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(partial, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    metrics.incr("uploads.rejected_too_large")
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        await _remove(partial)
+        raise
+
+    sha256 = digest.hexdigest()
+    final = content_path(directory, sha256, extension)
+    deduplicated = await aiofiles.os.path.exists(final)
+    if deduplicated:
+        await _remove(partial)
+    else:
+        await aiofiles.os.makedirs(final.parent, exist_ok=True)
+        await aiofiles.os.replace(partial, final)
+
+    metrics.incr("uploads.bytes", size)
+    return StoredUpload(path=final, size=size, sha256=sha256, deduplicated=deduplicated)
+
+
+async def read_stored(upload: StoredUpload) -> bytes:
+    """Read a stored upload back, for the small text files that need it whole."""
+    async with aiofiles.open(upload.path, "rb") as f:
+        return await f.read()
+
+
+async def _remove(path: Path):
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove partial upload {path}: {e}")
+
+
+def declared_size_too_large(content_length: Optional[str], max_bytes: Optional[int] = None) -> bool:
+    """Check a request's Content-Length against the limit before reading its body."""
+    max_bytes = settings.MAX_FILE_SIZE if max_bytes is None else max_bytes
+    try:
+        return content_length is not None and int(content_length) > max_bytes + MULTIPART_OVERHEAD
+    except ValueError:
+        return False
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Answers 413 for requests whose Content-Length is over the upload limit,
+    before any of the body is read. Chunked uploads without a declared
+    length are still cut off by ingest_upload.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: Optional[int] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            headers = dict(scope.get("headers") or [])
+            content_length = headers.get(b"content-length")
+            if content_length and declared_size_too_large(content_length.decode("latin-1"), self.max_bytes):
+                metrics.incr("uploads.rejected_too_large")
+                max_bytes = settings.MAX_FILE_SIZE if self.max_bytes is None else self.max_bytes
+                body = json.dumps({"detail": str(UploadTooLargeError(max_bytes))}).encode("utf-8")
+                await send({
+                    "type": "http.response.start",
+                    "status": 413,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+                })
+                await send({"type": "http.response.body", "body": body})
+                return
+        await self.app(scope, receive, send)
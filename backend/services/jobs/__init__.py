@@ -0,0 +1,6 @@
+# Import job queue pieces at services level
+from services.jobs.queue import Job, JobQueue
+from services.jobs.worker import JobWorker
+from services.jobs.uploads import PROCESS_UPLOAD, build_upload_worker, upload_queue
+
+__all__ = ['Job', 'JobQueue', 'JobWorker', 'PROCESS_UPLOAD', 'build_upload_worker', 'upload_queue']
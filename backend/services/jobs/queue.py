@@ -0,0 +1,259 @@
+"""
+TutorAgent MVP Job Queue
+Reliable Redis list queue for background work, with per-job status records
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from core.logging import get_logger
+from core.metrics import metrics
+from services.redis import RedisClient, redis_client
+from services.redis_cache.lru import LRUCache
+
+logger = get_logger("jobs")
+
+# Status fields stored as numbers; Redis hashes hand everything back as strings
+INT_FIELDS = ("progress", "attempts", "questions_found", "page_count")
+JSON_FIELDS = ("result",)
+
+
+@dataclass
+class Job:
+    """A unit of background work. `raw` is the exact queued payload, needed to acknowledge it."""
+    id: str
+    kind: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    raw: Optional[str] = field(default=None, repr=False, compare=False)
+
+    def dumps(self) -> str:
+        data = asdict(self)
+        data.pop("raw")
+        return json.dumps(data)
+
+    @classmethod
+    def loads(cls, raw: str) -> "Job":
+        return cls(**json.loads(raw), raw=raw)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class JobQueue:
+    """
+    FIFO job queue shared by API and worker processes through Redis.
+
+    Claiming moves a job atomically from the pending list to a processing
+    list, so a worker that dies mid-job leaves it there; workers heartbeat
+    their jobs and `requeue_stale` puts abandoned ones back. Without Redis
+    the queue falls back to an in-process asyncio queue, which only the
+    API process's own workers can drain.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis: RedisClient = redis_client,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        status_ttl: int = 86400,
+        on_failed: Optional[Callable[[Job, str], Awaitable[None]]] = None
+    ):
+        self.name = name
+        self.redis = redis
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.status_ttl = status_ttl
+        self.on_failed = on_failed
+        self.pending_key = f"jobs:{name}:pending"
+        self.processing_key = f"jobs:{name}:processing"
+        self._local: Optional[asyncio.Queue] = None
+        self._suspects: Set[str] = set()
+        self._local_status = LRUCache(max_entries=4096, ttl=status_ttl, name=f"jobs_{name}_status")
+
+    @property
+    def distributed(self) -> bool:
+        """Whether jobs go through Redis and can be run by separate worker processes."""
+        return self.redis.available
+
+    def _status_key(self, job_id: str) -> str:
+        return f"job:{self.name}:{job_id}"
+
+    def _local_queue(self) -> asyncio.Queue:
+        if self._local is None:
+            self._local = asyncio.Queue()
+        return self._local
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], job_id: Optional[str] = None) -> Job:
+        """Record a queued status for a new job and hand it to the workers."""
+        job = Job(id=job_id or str(uuid.uuid4()), kind=kind, payload=payload)
+        job.raw = job.dumps()
+        await self.set_status(
+            job.id,
+            status="queued",
+            stage="queued",
+            progress=0,
+            message="Waiting for a worker",
+            kind=kind,
+            attempts=0,
+            created_at=_now()
+        )
+        if self.distributed:
+            if await self.redis.list_push(self.pending_key, job.raw) is None:
+                raise RuntimeError(f"Failed to enqueue job {job.id}")
+        else:
+            self._local_queue().put_nowait(job)
+        metrics.incr(f"jobs.{self.name}.enqueued")
+        return job
+
+    async def claim(self, timeout: float = 1.0) -> Optional[Job]:
+        """Take the oldest pending job, waiting up to timeout seconds for one."""
+        if self.distributed:
+            raw = await self.redis.list_move(self.pending_key, self.processing_key, timeout)
+            if raw is None:
+                return None
+            job = Job.loads(raw)
+        else:
+            try:
+                job = await asyncio.wait_for(self._local_queue().get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        job.attempts += 1
+        await self.set_status(
+            job.id,
+            status="processing",
+            attempts=job.attempts,
+            started_at=_now(),
+            heartbeat_at=time.time()
+        )
+        return job
+
+    async def heartbeat(self, job: Job):
+        """Mark a claimed job as still being worked on."""
+        await self.set_status(job.id, heartbeat_at=time.time())
+
+    async def complete(self, job: Job, result: Optional[Dict[str, Any]] = None, message: str = "Processing complete"):
+        """Acknowledge a finished job and record its result."""
+        await self._ack(job)
+        await self.set_status(
+            job.id,
+            status="completed",
+            stage="completed",
+            progress=100,
+            message=message,
+            result=result or {},
+            completed_at=_now()
+        )
+        metrics.incr(f"jobs.{self.name}.completed")
+
+    async def fail(self, job: Job, error: str):
+        """Retry a failed job, or mark it failed once it has used up its attempts."""
+        await self._ack(job)
+        if job.attempts < self.max_attempts:
+            logger.warning(f"Job {job.id} failed on attempt {job.attempts}, retrying: {error}")
+            await self._requeue(job, error)
+            return
+        logger.error(f"Job {job.id} failed after {job.attempts} attempts: {error}")
+        await self.set_status(
+            job.id,
+            status="failed",
+            message="Processing failed",
+            error=error,
+            completed_at=_now()
+        )
+        metrics.incr(f"jobs.{self.name}.failed")
+        if self.on_failed is not None:
+            try:
+                await self.on_failed(job, error)
+            except Exception as e:
+                logger.error(f"Failure hook for job {job.id} raised: {e}")
+
+    async def _requeue(self, job: Job, reason: str):
+        retry = Job(id=job.id, kind=job.kind, payload=job.payload, attempts=job.attempts)
+        retry.raw = retry.dumps()
+        await self.set_status(job.id, status="queued", message="Waiting to retry", error=reason)
+        if self.distributed:
+            await self.redis.list_push(self.pending_key, retry.raw)
+        else:
+            self._local_queue().put_nowait(retry)
+        metrics.incr(f"jobs.{self.name}.retried")
+
+    async def _ack(self, job: Job):
+        if self.distributed and job.raw is not None:
+            await self.redis.list_remove(self.processing_key, job.raw)
+
+    async def requeue_stale(self) -> int:
+        """Return jobs whose worker stopped heartbeating to the pending list."""
+        if not self.distributed:
+            return 0
+        requeued = 0
+        cutoff = time.time() - self.visibility_timeout
+        suspects = set()
+        for raw in await self.redis.list_range(self.processing_key):
+            job = Job.loads(raw)
+            # The queued payload predates its claim, so this attempt is one more
+            attempt = job.attempts + 1
+            status = await self.status(job.id) or {}
+            if status.get("attempts") != attempt:
+                # Claimed but not yet marked processing; give the claimer one
+                # more pass before treating it as lost
+                if raw not in self._suspects:
+                    suspects.add(raw)
+                    continue
+            elif float(status.get("heartbeat_at") or 0) > cutoff:
+                continue
+            # Only the worker that removes the entry gets to requeue it
+            if await self.redis.list_remove(self.processing_key, raw):
+                logger.warning(f"Job {job.id} timed out on attempt {attempt}")
+                await self.fail(Job(id=job.id, kind=job.kind, payload=job.payload, attempts=attempt), "Worker timed out")
+                requeued += 1
+        self._suspects = suspects
+        return requeued
+
+    async def set_status(self, job_id: str, **fields):
+        """Merge fields into a job's status record."""
+        fields["updated_at"] = _now()
+        if self.distributed:
+            encoded = {
+                key: json.dumps(value) if key in JSON_FIELDS else str(value)
+                for key, value in fields.items()
+                if value is not None
+            }
+            await self.redis.hash_set_many(self._status_key(job_id), encoded, expire=self.status_ttl)
+        else:
+            current = self._local_status.get(job_id) or {}
+            self._local_status.set(job_id, {**current, **fields})
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's status record, or None if it is unknown or expired."""
+        if not self.distributed:
+            status = self._local_status.get(job_id)
+            return dict(status) if status else None
+        raw = await self.redis.hash_get_all(self._status_key(job_id))
+        if not raw:
+            return None
+        status: Dict[str, Any] = dict(raw)
+        for key in INT_FIELDS:
+            if key in status:
+                status[key] = int(status[key])
+        for key in JSON_FIELDS:
+            if key in status:
+                status[key] = json.loads(status[key])
+        return status
+
+    async def stats(self) -> Dict[str, Any]:
+        """Queue depth for health reporting."""
+        if self.distributed:
+            return {
+                "backend": "redis",
+                "pending": await self.redis.list_length(self.pending_key),
+                "processing": await self.redis.list_length(self.processing_key),
+            }
+        return {"backend": "memory", "pending": self._local_queue().qsize()}
@@ -0,0 +1,207 @@
+"""
+TutorAgent MVP Upload Processing Jobs
+Background processing of uploaded documents and their `uploads` table rows
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from core.logging import get_logger
+from services.database import database
+from services.file_storage.ingest import StoredUpload, read_stored
+from services.jobs.queue import Job, JobQueue
+from services.jobs.worker import JobWorker, ProgressReporter
+from services.redis_cache import artifact_cache, document_store
+
+logger = get_logger("jobs")
+
+PROCESS_UPLOAD = "process_upload"
+
+
+async def record_upload(upload_id: str, stored: StoredUpload, filename: str, file_type: str):
+    """Insert the upload's row; the database is optional, so failures are only logged."""
+    if not database.is_connected:
+        return
+    try:
+        await database.execute(
+            """
+            INSERT INTO uploads (id, filename, file_size, file_type, upload_path, status)
+            VALUES (:id, :filename, :file_size, :file_type, :upload_path, 'queued')
+            ON CONFLICT (id) DO NOTHING
+            """,
+            {
+                "id": upload_id,
+                "filename": filename,
+                "file_size": stored.size,
+                "file_type": file_type,
+                "upload_path": str(stored.path),
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record upload {upload_id}: {e}")
+
+
+async def update_upload(upload_id: str, status: str, started: bool = False, completed: bool = False,
+                        questions_extracted: Optional[int] = None):
+    """Update the upload's status and processing timestamps."""
+    if not database.is_connected:
+        return
+    assignments = ["status = :status", "updated_at = :now"]
+    values: Dict[str, Any] = {"id": upload_id, "status": status, "now": datetime.utcnow()}
+    if started:
+        assignments.append("processing_started_at = :now")
+    if completed:
+        assignments.append("processing_completed_at = :now")
+    if questions_extracted is not None:
+        assignments.append("questions_extracted = :questions")
+        values["questions"] = questions_extracted
+    try:
+        await database.execute(f"UPDATE uploads SET {', '.join(assignments)} WHERE id = :id", values)
+    except Exception as e:
+        logger.warning(f"Failed to update upload {upload_id}: {e}")
+
+
+async def fetch_upload(upload_id: str) -> Optional[Dict[str, Any]]:
+    """Get the upload's row, for status checks after its job record has expired."""
+    if not database.is_connected:
+        return None
+    try:
+        row = await database.fetch_one(
+            """
+            SELECT status, questions_extracted, processing_started_at, processing_completed_at
+            FROM uploads WHERE id = :id
+            """,
+            {"id": upload_id}
+        )
+        return dict(row) if row else None
+    except Exception as e:
+        logger.warning(f"Failed to fetch upload {upload_id}: {e}")
+        return None
+
+
+async def process_upload(job: Job, report: ProgressReporter) -> Dict[str, Any]:
+    """
+    Extract, segment and topic-tag an uploaded document, then get the
+    tutor's reply to it. The text and questions go to the document store
+    under the content hash, which is returned as document_id.
+
+    Results are cached by content hash, so a re-upload of the same bytes
+    finishes without redoing any of the work.
+    """
+    from agents.assessment.gemini_agent import tutor_agent
+    from agents.document_parser.classification.topics import tag_questions
+    from agents.document_parser.ocr.engine import ocr_engine
+    from agents.document_parser.parsing.extraction import pdf_extractor
+    from agents.document_parser.parsing.segmentation import group_questions, segment_questions
+    from agents.tutor.response_generation.context_builder import context_builder
+
+    payload = job.payload
+    upload_id, filename, file_extension = job.id, payload["filename"], payload["file_type"]
+    stored = StoredUpload(path=Path(payload["path"]), size=payload["size"], sha256=payload["sha256"])
+    await update_upload(upload_id, "processing", started=True)
+
+    artifacts = await artifact_cache.get(stored.sha256) or {}
+    if artifacts.get("upload_welcome") is not None:
+        logger.info(f"Document {filename} matches an earlier upload, reusing its artifacts")
+        questions_found = artifacts.get("upload_questions", 0)
+        await update_upload(upload_id, "completed", completed=True, questions_extracted=questions_found)
+        return {"questions_found": questions_found, "deduplicated": True, "document_id": stored.sha256}
+
+    page_count = None
+    document_text = ""
+    document = await document_store.get(stored.sha256)
+    if document is not None and not document.get("complete", True):
+        document = None  # Still being read for a PDF chat session
+    if file_extension == "pdf":
+        extraction = document
+        if extraction is None:
+            # Scanned pages are OCR'd as part of extraction
+            await report("extracting", 10, "Extracting text")
+            result = await pdf_extractor.extract(stored.path)
+            extraction = {"text": result.text, "page_count": result.page_count, "failed_pages": result.failed_pages}
+        page_count = extraction["page_count"]
+        document_text = extraction["text"]
+    elif file_extension in ["png", "jpg", "jpeg"]:
+        if document is not None:
+            document_text = document["text"]
+        else:
+            await report("ocr", 10, "Reading the image")
+            document_text = await ocr_engine.ocr_image(await read_stored(stored)) or ""
+
+    questions = (document or {}).get("questions")
+    if questions is None and document_text.strip():
+        await report("segmenting", 50, "Finding questions", page_count=page_count)
+        questions = tag_questions([span.to_dict() for span in group_questions(segment_questions(document_text))])
+        await document_store.set(stored.sha256, {
+            "text": document_text,
+            "page_count": page_count or 1,
+            "pages_processed": page_count or 1,
+            "questions": questions,
+            "questions_found": max(1, len(questions)),
+            "success": True,
+            "complete": True,
+        })
+    questions_found = len(questions or [])
+
+    await report("tutoring", 70, "Preparing the tutor", questions_found=questions_found)
+    if file_extension in ["txt", "md"]:
+        # Process text files directly
+        content = (await read_stored(stored)).decode("utf-8", errors="replace")
+        context = {"upload_id": upload_id, "filename": filename}
+    elif document_text.strip():
+        # Extracted or recognized text, trimmed to the document budget
+        content = f"""File: {filename}
+Type: {file_extension}
+Questions found: {questions_found}
+
+{context_builder.document_excerpt(document_text)}"""
+        context = {"upload_id": upload_id, "filename": filename, "original_file_type": file_extension}
+    else:
+        # Nothing readable was found; describe the file instead
+        content = f"""File: {filename}
+Type: {file_extension}
+Size: {stored.size} bytes
+Questions found: {questions_found}
+
+This is a {file_extension} file that needs to be processed for tutoring."""
+        context = {"upload_id": upload_id, "filename": filename, "original_file_type": file_extension}
+
+    try:
+        tutoring_response = await tutor_agent.respond(content, context=context)
+        if not tutor_agent.is_fallback(tutoring_response):
+            await artifact_cache.set(stored.sha256, {
+                **artifacts,
+                "upload_welcome": tutoring_response.get("message"),
+                "upload_questions": questions_found,
+            })
+    except ValueError as ve:
+        # Handle Gemini API filtering or safety errors; the document itself is still processed
+        logger.warning(f"Gemini API filtered response for uploaded file {filename}: {ve}")
+
+    await update_upload(upload_id, "completed", completed=True, questions_extracted=questions_found)
+    logger.info(f"Document processed: {filename}, ID: {upload_id}")
+    result = {"questions_found": questions_found, "document_id": stored.sha256}
+    if page_count is not None:
+        result["page_count"] = page_count
+    return result
+
+
+async def mark_upload_failed(job: Job, error: str):
+    await update_upload(job.id, "failed", completed=True)
+
+
+def build_upload_worker(concurrency: int) -> JobWorker:
+    """Create a worker for the upload queue."""
+    return JobWorker(upload_queue, {PROCESS_UPLOAD: process_upload}, concurrency=concurrency)
+
+
+# Create global upload job queue instance
+upload_queue = JobQueue(
+    "uploads",
+    visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    status_ttl=settings.JOB_STATUS_TTL,
+    on_failed=mark_upload_failed
+)
@@ -0,0 +1,176 @@
+"""
+TutorAgent MVP Job Worker
+Runs queued jobs; start standalone with `python -m services.jobs.worker`
+"""
+
+import argparse
+import asyncio
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.logging import get_logger
+from core.metrics import metrics
+from services.jobs.queue import Job, JobQueue
+
+logger = get_logger("jobs")
+
+# Reports a job's current stage and percentage to its status record
+ProgressReporter = Callable[..., Awaitable[None]]
+JobHandler = Callable[[Job, ProgressReporter], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class JobWorker:
+    """
+    Pulls jobs from a queue and runs them, `concurrency` at a time.
+
+    Runs inside the API process (started from main.py) or on its own via
+    this module's entry point, so workers scale separately from the API.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 1,
+        poll_timeout: float = 1.0
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = max(1, concurrency)
+        self.poll_timeout = poll_timeout
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self):
+        """Start the worker loops and stale-job reaper as background tasks."""
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._loop(n)) for n in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._reap()))
+        logger.info(f"Job worker started for '{self.queue.name}' with {self.concurrency} slots")
+
+    def request_stop(self):
+        """Ask run() to return once running jobs finish; safe to call from a signal handler."""
+        self._stopping.set()
+
+    async def stop(self, timeout: float = 30.0):
+        """Stop claiming jobs and wait for running ones to finish, cancelling them after timeout."""
+        self._stopping.set()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run(self):
+        """Run until stop() is called."""
+        self.start()
+        await self._stopping.wait()
+        await self.stop()
+
+    async def _loop(self, slot: int):
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            job = await self.queue.claim(timeout=self.poll_timeout)
+            if job is None:
+                # An empty queue waits inside claim(); returning early means Redis errored
+                if time.monotonic() - started < self.poll_timeout / 2:
+                    await asyncio.sleep(self.poll_timeout)
+                continue
+            await self.process(job)
+
+    async def process(self, job: Job):
+        """Run one claimed job to completion, failure or retry."""
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await self.queue.fail(job, f"No handler for job kind '{job.kind}'")
+            return
+
+        async def report(stage: str, progress: int, message: Optional[str] = None, **fields):
+            await self.queue.set_status(job.id, stage=stage, progress=progress, message=message, **fields)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        started = time.perf_counter()
+        try:
+            result = await handler(job, report)
+        except asyncio.CancelledError:
+            # Shutting down: leave the job in the processing list for another worker
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) raised: {e}")
+            await self.queue.fail(job, f"{type(e).__name__}: {e}")
+        else:
+            await self.queue.complete(job, result)
+        finally:
+            heartbeat.cancel()
+            metrics.observe(f"jobs.{self.queue.name}.run", (time.perf_counter() - started) * 1000)
+
+    async def _heartbeat(self, job: Job):
+        interval = max(1.0, self.queue.visibility_timeout / 3)
+        while True:
+            await asyncio.sleep(interval)
+            await self.queue.heartbeat(job)
+
+    async def _reap(self):
+        interval = max(1.0, self.queue.visibility_timeout / 2)
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping.is_set():
+                break
+            try:
+                await self.queue.requeue_stale()
+            except Exception as e:
+                logger.error(f"Stale job check failed: {e}")
+
+
+async def main(concurrency: Optional[int] = None):
+    """Entry point for a standalone worker process."""
+    from core.config import settings
+    from agents.document_parser.ocr.engine import ocr_engine
+    from agents.document_parser.parsing.extraction import pdf_extractor
+    from services.database import database
+    from services.jobs.uploads import build_upload_worker
+    from services.redis import redis_client
+
+    # Workers only make sense with a shared queue
+    await redis_client.initialize()
+    try:
+        await database.connect()
+    except Exception as e:
+        logger.warning(f"⚠️  Database not available, upload rows will not be updated: {e}")
+    await pdf_extractor.warm()
+    await ocr_engine.warm()
+
+    worker = build_upload_worker(concurrency or settings.JOB_WORKER_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.request_stop)
+
+    logger.info("🚀 Job worker running")
+    try:
+        await worker.run()
+    finally:
+        pdf_extractor.shutdown()
+        ocr_engine.shutdown()
+        await database.disconnect()
+        await redis_client.close()
+        logger.info("✅ Job worker stopped")
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Run TutorAgent background job workers")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs run at once in this process")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
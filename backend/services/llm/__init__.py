@@ -0,0 +1,65 @@
+"""
+TutorAgent MVP LLM Service Package
+Provider-agnostic LLM access with hedging, failover and circuit breaking
+"""
+
+from typing import List
+
+from core.config import settings
+from services.llm.base import (
+    LLMError,
+    LLMProvider,
+    LLMRequest,
+    LLMResult,
+    LLMUnavailableError,
+    inline_document,
+)
+from services.llm.resilience import AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitOpenError, ConcurrencyLimitError
+from services.llm.providers import AnthropicProvider, FakeProvider, GeminiProvider, OpenAIProvider
+from services.llm.service import LLMService
+
+
+def build_llm_service(primary: LLMProvider) -> LLMService:
+    """Create an LLMService with primary first, then every other provider with a configured key."""
+    providers: List[LLMProvider] = [primary]
+    for name in settings.LLM_PROVIDERS:
+        if name == primary.name:
+            continue
+        if name == "openai" and settings.OPENAI_API_KEY:
+            providers.append(OpenAIProvider(settings.OPENAI_API_KEY, settings.OPENAI_MODEL))
+        elif name == "anthropic" and settings.ANTHROPIC_API_KEY:
+            providers.append(AnthropicProvider(settings.ANTHROPIC_API_KEY, settings.ANTHROPIC_MODEL))
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=settings.LLM_MAX_CONCURRENCY,
+        min_limit=settings.LLM_MIN_CONCURRENCY,
+        max_limit=settings.LLM_MAX_CONCURRENCY,
+        latency_target_ms=settings.LLM_LATENCY_TARGET_MS
+    )
+
+    def make_breaker(name: str) -> CircuitBreaker:
+        return CircuitBreaker(
+            name,
+            failure_rate=settings.LLM_BREAKER_FAILURE_RATE,
+            slow_call_ms=settings.LLM_BREAKER_SLOW_CALL_MS,
+            min_calls=settings.LLM_BREAKER_MIN_CALLS,
+            window=settings.LLM_BREAKER_WINDOW,
+            reset_timeout=settings.LLM_BREAKER_RESET_TIMEOUT
+        )
+
+    return LLMService(
+        providers,
+        timeout=settings.LLM_REQUEST_TIMEOUT,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        hedge_enabled=settings.LLM_HEDGE_ENABLED,
+        hedge_default_delay=settings.LLM_HEDGE_DEFAULT_DELAY,
+        hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+        limiter=limiter,
+        breaker_factory=make_breaker
+    )
+
+
+__all__ = [
+    'AdaptiveConcurrencyLimiter', 'AnthropicProvider', 'CircuitBreaker', 'CircuitOpenError',
+    'ConcurrencyLimitError', 'FakeProvider', 'GeminiProvider', 'LLMError', 'LLMProvider', 'LLMRequest',
+    'LLMResult', 'LLMService', 'LLMUnavailableError', 'OpenAIProvider', 'build_llm_service', 'inline_document',
+]
@@ -0,0 +1,69 @@
+"""
+TutorAgent MVP LLM Provider Interface
+Common async interface implemented by every LLM provider adapter
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+def inline_document(text: str, prompt: str) -> str:
+    """Prepend document text to a prompt. The document goes first so the
+    bytes shared across turns form a stable prefix."""
+    return f"""DOCUMENT:
+{text}
+
+{prompt}"""
+
+
+class LLMError(Exception):
+    """Base error for LLM provider failures."""
+
+
+class LLMUnavailableError(LLMError):
+    """Raised when no provider can serve a request."""
+
+
+@dataclass
+class LLMRequest:
+    """A provider-agnostic generation request."""
+    prompt: str
+    system_instruction: Optional[str] = None
+    # Document text to send ahead of the prompt when a provider holds no cached copy
+    prefix: Optional[str] = None
+    # Provider-specific overrides keyed by provider name, e.g. a Gemini cached-content model
+    provider_hints: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def full_prompt(self) -> str:
+        """Get the prompt with any document prefix inlined ahead of it."""
+        if not self.prefix:
+            return self.prompt
+        return inline_document(self.prefix, self.prompt)
+
+    def hint(self, provider: str, key: str) -> Any:
+        """Get a provider-specific hint, if any."""
+        return self.provider_hints.get(provider, {}).get(key)
+
+
+@dataclass
+class LLMResult:
+    """Text produced by a provider."""
+    text: str
+    provider: str
+    latency_ms: float
+    hedged: bool = False
+
+
+class LLMProvider(ABC):
+    """Adapter for a single upstream LLM API."""
+
+    name: str = "provider"
+
+    @abstractmethod
+    async def generate(self, request: LLMRequest) -> str:
+        """Generate a complete reply."""
+
+    @abstractmethod
+    def stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """Stream reply text fragments."""
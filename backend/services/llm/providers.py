@@ -0,0 +1,218 @@
+"""
+TutorAgent MVP LLM Provider Adapters
+Gemini, OpenAI and Anthropic adapters plus an in-process fake for tests
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, List, Optional
+
+import httpx
+
+from services.llm.base import LLMError, LLMProvider, LLMRequest
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini via google.generativeai.
+    
+    The system instruction is configured on the model itself, so
+    request.system_instruction is not resent. A `model` hint (e.g. a
+    cached-content model) replaces the default model and the document
+    prefix it already holds.
+    """
+
+    name = "gemini"
+
+    def __init__(self, model: Any):
+        self.model = model
+
+    def _resolve(self, request: LLMRequest):
+        hinted = request.hint(self.name, "model")
+        if hinted is not None:
+            return hinted, request.prompt
+        return self.model, request.full_prompt()
+
+    async def generate(self, request: LLMRequest) -> str:
+        model, prompt = self._resolve(request)
+        response = await model.generate_content_async(prompt)
+        
+        # Log the full response for debugging
+        logger.info(f"Full Gemini API response: {response}")
+        
+        # Check if response has valid candidates
+        if not hasattr(response, 'candidates') or not response.candidates:
+            logger.error("No valid candidates in Gemini response")
+            # Try to get finish_reason from prompt_feedback if available
+            if hasattr(response, 'prompt_feedback'):
+                logger.error(f"Prompt feedback: {response.prompt_feedback}")
+            raise ValueError("No valid response candidates from Gemini API")
+        
+        # Check if any candidate was blocked or filtered
+        for i, candidate in enumerate(response.candidates):
+            logger.info(f"Candidate {i} finish_reason: {getattr(candidate, 'finish_reason', 'unknown')}")
+            if hasattr(candidate, 'safety_ratings'):
+                logger.info(f"Candidate {i} safety_ratings: {candidate.safety_ratings}")
+        
+        # Try to get text from response
+        try:
+            return response.text
+        except ValueError as text_error:
+            logger.error(f"Failed to extract text from Gemini response: {text_error}")
+            # Log individual candidate parts for debugging
+            for i, candidate in enumerate(response.candidates):
+                if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
+                    logger.error(f"Candidate {i} parts: {candidate.content.parts}")
+                    for j, part in enumerate(candidate.content.parts):
+                        logger.error(f"Part {j}: {part}")
+            raise ValueError(f"Unable to extract text from Gemini response: {text_error}")
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        model, prompt = self._resolve(request)
+        response = await model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions via the openai SDK."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str, temperature: float = 0.7, max_output_tokens: int = 2048):
+        from openai import AsyncOpenAI
+
+        self.client = AsyncOpenAI(api_key=api_key)
+        self.model = model
+        self.temperature = temperature
+        self.max_output_tokens = max_output_tokens
+
+    def _messages(self, request: LLMRequest) -> List[dict]:
+        messages = []
+        if request.system_instruction:
+            messages.append({"role": "system", "content": request.system_instruction})
+        messages.append({"role": "user", "content": request.full_prompt()})
+        return messages
+
+    async def generate(self, request: LLMRequest) -> str:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(request),
+            temperature=self.temperature,
+            max_tokens=self.max_output_tokens
+        )
+        text = response.choices[0].message.content if response.choices else None
+        if not text:
+            raise LLMError("Empty response text from OpenAI API")
+        return text
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(request),
+            temperature=self.temperature,
+            max_tokens=self.max_output_tokens,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class AnthropicProvider(LLMProvider):
+    """Anthropic Messages API over httpx (no SDK dependency)."""
+
+    name = "anthropic"
+    api_url = "https://api.anthropic.com/v1/messages"
+    api_version = "2023-06-01"
+
+    def __init__(self, api_key: str, model: str, temperature: float = 0.7, max_output_tokens: int = 2048):
+        self.client = httpx.AsyncClient(
+            headers={
+                "x-api-key": api_key,
+                "anthropic-version": self.api_version,
+                "content-type": "application/json",
+            },
+            timeout=None  # Per-call timeouts are enforced by LLMService
+        )
+        self.model = model
+        self.temperature = temperature
+        self.max_output_tokens = max_output_tokens
+
+    def _body(self, request: LLMRequest, stream: bool = False) -> dict:
+        body = {
+            "model": self.model,
+            "max_tokens": self.max_output_tokens,
+            "temperature": self.temperature,
+            "messages": [{"role": "user", "content": request.full_prompt()}],
+        }
+        if request.system_instruction:
+            body["system"] = request.system_instruction
+        if stream:
+            body["stream"] = True
+        return body
+
+    async def generate(self, request: LLMRequest) -> str:
+        response = await self.client.post(self.api_url, json=self._body(request))
+        if response.status_code != 200:
+            raise LLMError(f"Anthropic API error {response.status_code}: {response.text[:200]}")
+        blocks = response.json().get("content", [])
+        text = "".join(block.get("text", "") for block in blocks if block.get("type") == "text")
+        if not text:
+            raise LLMError("Empty response text from Anthropic API")
+        return text
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        async with self.client.stream("POST", self.api_url, json=self._body(request, stream=True)) as response:
+            if response.status_code != 200:
+                raise LLMError(f"Anthropic API error {response.status_code}")
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[6:])
+                if event.get("type") == "content_block_delta":
+                    text = event.get("delta", {}).get("text")
+                    if text:
+                        yield text
+
+
+class FakeProvider(LLMProvider):
+    """In-process provider with scripted latency and failures, for tests."""
+
+    def __init__(
+        self,
+        name: str,
+        text: str = '{"message": "What do you think the first step is?"}',
+        latency: float = 0.0,
+        error: Optional[Exception] = None
+    ):
+        self.name = name
+        self.text = text
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        words = self.text.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
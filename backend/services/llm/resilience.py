@@ -0,0 +1,224 @@
+"""
+TutorAgent MVP LLM Resilience
+Circuit breaker and AIMD adaptive concurrency limiter for upstream LLM calls
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+from core.metrics import metrics
+from services.llm.base import LLMUnavailableError
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class ConcurrencyLimitError(LLMUnavailableError):
+    """Raised when no upstream slot frees up before the request's deadline."""
+
+
+class Slot:
+    """A held upstream slot. Set latency_ms to judge the call on something other than its full duration."""
+
+    def __init__(self):
+        self.latency_ms: Optional[float] = None
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker over a rolling window of call outcomes.
+    
+    The circuit opens when, over at least `min_calls` recent calls, the
+    share of failures or of calls slower than `slow_call_ms` reaches
+    `failure_rate`. After `reset_timeout` seconds one trial call is let
+    through; its outcome closes the circuit or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        slow_call_ms: float = 20000.0,
+        min_calls: int = 10,
+        window: int = 20,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Check whether a call may go upstream now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        metrics.incr(f"llm.{self.name}.short_circuited")
+        return False
+
+    def record_success(self, latency_ms: float):
+        """Record a completed call and its latency."""
+        self._record(failed=False, slow=latency_ms >= self.slow_call_ms)
+
+    def record_failure(self):
+        """Record a failed or timed-out call."""
+        self._record(failed=True, slow=False)
+
+    def record_cancelled(self):
+        """Release a half-open trial slot held by a call that was cancelled."""
+        if self.state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def _record(self, failed: bool, slow: bool):
+        if self.state == self.HALF_OPEN:
+            self._trial_in_flight = False
+            if failed or slow:
+                self._open()
+            else:
+                self.state = self.CLOSED
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append((failed, slow))
+        if self.state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            threshold = self.failure_rate * len(self._outcomes)
+            if failures >= threshold or slow_calls >= threshold:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = self._clock()
+        self._outcomes.clear()
+        metrics.incr(f"llm.{self.name}.circuit_opened")
+
+    def status(self) -> Dict[str, Any]:
+        """Get breaker state for health reporting."""
+        failures = sum(1 for f, _ in self._outcomes if f)
+        slow_calls = sum(1 for _, s in self._outcomes if s)
+        status = {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": failures,
+            "recent_slow_calls": slow_calls,
+        }
+        if self.state == self.OPEN:
+            status["retry_in_s"] = round(max(0.0, self.reset_timeout - (self._clock() - self.opened_at)), 1)
+        return status
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on concurrent upstream calls.
+    
+    Each call that finishes within `latency_target_ms` grows the limit by
+    roughly one per limit's worth of calls (additive increase). A failure
+    or a call over target halves it (multiplicative decrease), at most
+    once per `decrease_cooldown` seconds so one slow burst does not
+    collapse the limit to the floor.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        latency_target_ms: float = 10000.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_ms = latency_target_ms
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self._clock = clock
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+
+    @property
+    def current_limit(self) -> int:
+        """Whole number of calls currently allowed in flight."""
+        return int(self.limit)
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None) -> AsyncIterator[Slot]:
+        """
+        Hold one upstream slot; the limit adapts to how the call went.
+
+        Waiting for a slot gives up after timeout seconds with
+        ConcurrencyLimitError, so callers can fail over or fall back
+        instead of queueing behind a collapsed limit.
+        """
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self.in_flight < self.current_limit),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                metrics.incr("llm.limiter.rejected")
+                raise ConcurrencyLimitError(f"No LLM slot free within {timeout}s (limit {self.current_limit})")
+            self.in_flight += 1
+
+        held = Slot()
+        started = time.perf_counter()
+        ok = None
+        try:
+            yield held
+            ok = True
+        except asyncio.CancelledError:
+            # A cancelled hedge says nothing about upstream health
+            raise
+        except Exception:
+            ok = False
+            raise
+        finally:
+            if ok is not None:
+                latency_ms = held.latency_ms if held.latency_ms is not None else (time.perf_counter() - started) * 1000
+                self._adjust(ok, latency_ms)
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def _adjust(self, ok: bool, latency_ms: float):
+        if ok and latency_ms <= self.latency_target_ms:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        elif self._clock() - self._last_decrease >= self.decrease_cooldown:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            self._last_decrease = self._clock()
+            metrics.incr("llm.limiter.decreases")
+
+    def status(self) -> Dict[str, Any]:
+        """Get limiter state for health reporting."""
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "latency_target_ms": self.latency_target_ms,
+        }
@@ -0,0 +1,233 @@
+"""
+TutorAgent MVP LLM Service
+Routes requests across providers with latency-based hedging and failover
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from core.metrics import LatencySummary, metrics
+from services.llm.base import LLMProvider, LLMRequest, LLMResult, LLMUnavailableError
+from services.llm.resilience import AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitOpenError, ConcurrencyLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class LLMService:
+    """
+    Provider-agnostic entry point for LLM calls.
+
+    Providers are tried in order. If the current provider has not answered
+    within its observed p95 latency, a hedged request goes to the next
+    provider and whichever answers first wins. A provider that errors or
+    times out fails over to the next one immediately.
+
+    Each provider sits behind a circuit breaker so a degraded provider is
+    skipped without waiting out its timeout, and all upstream calls share
+    an adaptive concurrency limit.
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        timeout: float = 30.0,
+        max_concurrency: int = 8,
+        hedge_enabled: bool = True,
+        hedge_default_delay: float = 8.0,
+        hedge_min_delay: float = 0.5,
+        hedge_min_samples: int = 20,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        breaker_factory: Optional[Callable[[str], CircuitBreaker]] = None
+    ):
+        self.providers = providers
+        self.timeout = timeout
+        self.hedge_enabled = hedge_enabled
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        # Shared by every request in this process so a classroom burst
+        # cannot open an unbounded number of upstream connections
+        self.limiter = limiter or AdaptiveConcurrencyLimiter(
+            initial_limit=max_concurrency,
+            max_limit=max_concurrency
+        )
+        breaker_factory = breaker_factory or CircuitBreaker
+        self.breakers: Dict[str, CircuitBreaker] = {p.name: breaker_factory(p.name) for p in providers}
+        self._latency: Dict[str, LatencySummary] = {p.name: LatencySummary(window=500) for p in providers}
+
+    @property
+    def provider_names(self) -> List[str]:
+        """Names of configured providers, in preference order."""
+        return [p.name for p in self.providers]
+
+    def hedge_delay(self, provider: LLMProvider) -> float:
+        """Seconds to wait on a provider before hedging: its p95 once warmed up."""
+        summary = self._latency[provider.name]
+        if summary.count < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, summary.percentile(95) / 1000)
+
+    def status(self) -> Dict[str, Any]:
+        """Get circuit and concurrency state for health reporting."""
+        return {
+            "providers": [
+                {
+                    "name": p.name,
+                    "circuit": self.breakers[p.name].status(),
+                    "latency": self._latency[p.name].snapshot(),
+                }
+                for p in self.providers
+            ],
+            "concurrency": self.limiter.status(),
+        }
+
+    def _next_allowed(self, remaining: List[LLMProvider]) -> Optional[LLMProvider]:
+        """Pop providers off `remaining` until one whose circuit lets a call through."""
+        while remaining:
+            provider = remaining.pop(0)
+            if self.breakers[provider.name].allow():
+                return provider
+        return None
+
+    async def _attempt(self, provider: LLMProvider, request: LLMRequest) -> str:
+        breaker = self.breakers[provider.name]
+        # Waiting for a slot and the call itself share one deadline
+        deadline = time.monotonic() + self.timeout
+        try:
+            async with self.limiter.slot(timeout=self.timeout):
+                started = time.perf_counter()
+                text = await asyncio.wait_for(provider.generate(request), timeout=deadline - time.monotonic())
+                latency_ms = (time.perf_counter() - started) * 1000
+        except ConcurrencyLimitError:
+            # Load shed before the provider was called; says nothing about its
+            # health, but frees a half-open trial for the next request
+            breaker.record_cancelled()
+            raise
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success(latency_ms)
+        self._latency[provider.name].observe(latency_ms)
+        metrics.observe(f"llm.{provider.name}.latency_ms", latency_ms)
+        return text
+
+    async def generate(self, request: LLMRequest) -> LLMResult:
+        """Generate a reply from the first provider to answer successfully."""
+        remaining = list(self.providers)
+        if not remaining:
+            raise LLMUnavailableError("No LLM providers configured")
+
+        started = time.perf_counter()
+        pending: Dict[asyncio.Task, LLMProvider] = {}
+        last_error: Optional[BaseException] = None
+        hedged = False
+
+        def launch() -> Optional[LLMProvider]:
+            provider = self._next_allowed(remaining)
+            if provider is not None:
+                pending[asyncio.create_task(self._attempt(provider, request))] = provider
+            return provider
+
+        leader = launch()
+        if leader is None:
+            metrics.incr("llm.short_circuited")
+            raise CircuitOpenError("Every LLM provider circuit is open")
+
+        try:
+            while pending:
+                wait_for = None
+                if self.hedge_enabled and remaining and not hedged:
+                    wait_for = self.hedge_delay(leader)
+                done, _ = await asyncio.wait(pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    hedged = True
+                    hedge = launch()
+                    if hedge is not None:
+                        metrics.incr("llm.hedges")
+                        logger.info(f"Hedging slow {leader.name} request to {hedge.name}")
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        metrics.incr(f"llm.{provider.name}.wins")
+                        return LLMResult(
+                            text=task.result(),
+                            provider=provider.name,
+                            latency_ms=(time.perf_counter() - started) * 1000,
+                            hedged=hedged
+                        )
+                    last_error = error
+                    metrics.incr(f"llm.{provider.name}.errors")
+                    logger.warning(f"LLM provider {provider.name} failed: {type(error).__name__}: {error}")
+                    if remaining and not pending:
+                        next_provider = launch()
+                        if next_provider is not None:
+                            leader = next_provider
+                            metrics.incr("llm.failovers")
+        finally:
+            # Losing hedges are cancelled and reaped so they release their slots
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise last_error or LLMUnavailableError("All LLM providers failed")
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """Stream a reply, failing over only before the first fragment is sent."""
+        last_error: Optional[BaseException] = None
+        for provider in self.providers:
+            breaker = self.breakers[provider.name]
+            if not breaker.allow():
+                last_error = last_error or CircuitOpenError(f"{provider.name} circuit is open")
+                continue
+            produced = False
+            first_chunk_ms = 0.0
+            # Waiting for a slot and for the first fragment share one deadline
+            deadline = time.monotonic() + self.timeout
+            try:
+                async with self.limiter.slot(timeout=self.timeout) as slot:
+                    started = time.perf_counter()
+                    chunks = provider.stream(request).__aiter__()
+                    while True:
+                        timeout = self.timeout if produced else deadline - time.monotonic()
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                        except StopAsyncIteration:
+                            break
+                        if not produced:
+                            first_chunk_ms = (time.perf_counter() - started) * 1000
+                            # A long, healthy stream is not a slow call; adapt on time to first token
+                            slot.latency_ms = first_chunk_ms
+                        produced = True
+                        yield chunk
+                # Long replies stream for a while, so judge the provider on time to first token
+                breaker.record_success(first_chunk_ms)
+                metrics.incr(f"llm.{provider.name}.wins")
+                return
+            except (asyncio.CancelledError, GeneratorExit):
+                # Client went away mid-stream; not the provider's fault
+                breaker.record_cancelled()
+                raise
+            except ConcurrencyLimitError as e:
+                breaker.record_cancelled()
+                last_error = e
+                continue
+            except Exception as e:
+                breaker.record_failure()
+                if produced:
+                    raise
+                last_error = e
+                metrics.incr(f"llm.{provider.name}.errors")
+                logger.warning(f"LLM provider {provider.name} stream failed: {type(e).__name__}: {e}")
+        if isinstance(last_error, CircuitOpenError):
+            metrics.incr("llm.short_circuited")
+        raise last_error or LLMUnavailableError("No LLM providers configured")
@@ -3,21 +3,39 @@ TutorAgent MVP Redis Service
 """
 
 import json
-from typing import Any, Optional, Union
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from core.config import settings
 from core.logging import get_logger
+from services.codec import ValueCodec
 
 logger = get_logger("redis")
 
 
 class RedisClient:
-    """Redis client wrapper for session management and caching."""
+    """
+    Redis client wrapper for session management and caching.
+
+    JSON helpers store values through codec as compact, versioned bytes on
+    a second connection that does not decode responses; other helpers use
+    plain strings.
+    """
     
-    def __init__(self):
+    def __init__(self, codec: Optional[ValueCodec] = None):
         self.redis: Optional[Redis] = None
+        self.binary: Optional[Redis] = None
+        self.codec = codec or ValueCodec(
+            serializer=settings.REDIS_CODEC,
+            compression=settings.REDIS_COMPRESSION,
+            compress_min_bytes=settings.REDIS_COMPRESS_MIN_BYTES
+        )
+    
+    @property
+    def available(self) -> bool:
+        """Check whether a Redis connection has been initialized."""
+        return self.redis is not None
     
     async def initialize(self):
         """Initialize Redis connection."""
@@ -31,16 +49,22 @@ class RedisClient:
             
             # Test connection
             await self.redis.ping()
+            self.binary = redis.from_url(settings.redis_url, health_check_interval=30)
             logger.info("✅ Redis connection established")
             
         except Exception as e:
             logger.error(f"❌ Failed to connect to Redis: {e}")
+            # Leave the client unavailable so callers fall back to memory
+            self.redis = None
+            self.binary = None
             raise
     
     async def close(self):
         """Close Redis connection."""
         if self.redis:
             await self.redis.close()
+            if self.binary:
+                await self.binary.close()
             logger.info("✅ Redis connection closed")
     
     async def get(self, key: str) -> Optional[str]:
@@ -55,22 +79,23 @@ class RedisClient:
         self, 
         key: str, 
         value: str, 
-        expire: Optional[int] = None
+        expire: Optional[int] = None,
+        only_if_absent: bool = False
     ) -> bool:
-        """Set key-value pair with optional expiration."""
+        """Set key-value pair with optional expiration; False if only_if_absent and the key exists."""
         try:
-            return await self.redis.set(key, value, ex=expire)
+            return bool(await self.redis.set(key, value, ex=expire, nx=only_if_absent))
         except Exception as e:
             logger.error(f"❌ Redis SET error for key {key}: {e}")
             return False
     
-    async def delete(self, key: str) -> bool:
-        """Delete key."""
+    async def delete(self, *keys: str) -> bool:
+        """Delete one or more keys in one round trip."""
         try:
-            result = await self.redis.delete(key)
+            result = await self.redis.delete(*keys)
             return result > 0
         except Exception as e:
-            logger.error(f"❌ Redis DELETE error for key {key}: {e}")
+            logger.error(f"❌ Redis DELETE error for key {', '.join(keys)}: {e}")
             return False
     
     async def exists(self, key: str) -> bool:
@@ -90,11 +115,11 @@ class RedisClient:
             return False
     
     async def get_json(self, key: str) -> Optional[dict]:
-        """Get JSON value by key."""
+        """Get JSON value by key, in any codec format."""
         try:
-            value = await self.get(key)
+            value = await self.binary.get(key)
             if value:
-                return json.loads(value)
+                return self.codec.decode(value)
             return None
         except (json.JSONDecodeError, Exception) as e:
             logger.error(f"❌ Redis GET_JSON error for key {key}: {e}")
@@ -108,12 +133,84 @@ class RedisClient:
     ) -> bool:
         """Set JSON value with optional expiration."""
         try:
-            json_value = json.dumps(value)
-            return await self.set(key, json_value, expire)
+            return await self.binary.set(key, self.codec.encode(value), ex=expire)
         except Exception as e:
             logger.error(f"❌ Redis SET_JSON error for key {key}: {e}")
             return False
     
+    async def get_json_and_touch(self, key: str, expire: int) -> Optional[dict]:
+        """Get a JSON value and reset its expiration in one round trip."""
+        try:
+            async with self.binary.pipeline(transaction=True) as pipe:
+                pipe.get(key)
+                pipe.expire(key, expire)
+                value, _ = await pipe.execute()
+            return self.codec.decode(value) if value else None
+        except Exception as e:
+            logger.error(f"❌ Redis GET_JSON_AND_TOUCH error for key {key}: {e}")
+            return None
+    
+    async def set_json_and_append(
+        self,
+        key: str,
+        value: dict,
+        list_key: str,
+        items: List[dict],
+        expire: Optional[int] = None,
+        publish: Optional[Tuple[str, str]] = None
+    ) -> Optional[int]:
+        """
+        Set a JSON value and append JSON items to a list in one transaction,
+        both with optional expiration, and optionally publish a (channel,
+        message) with it. Returns the list's new length, or None on error.
+        """
+        try:
+            async with self.binary.pipeline(transaction=True) as pipe:
+                pipe.set(key, self.codec.encode(value), ex=expire)
+                if items:
+                    pipe.rpush(list_key, *(self.codec.encode(item) for item in items))
+                if expire:
+                    pipe.expire(list_key, expire)
+                pipe.llen(list_key)
+                if publish:
+                    pipe.publish(*publish)
+                results = await pipe.execute()
+            return results[-2] if publish else results[-1]
+        except Exception as e:
+            logger.error(f"❌ Redis SET_JSON_AND_APPEND error for key {key}: {e}")
+            return None
+    
+    async def get_json_and_length(self, key: str, list_key: str) -> Tuple[Optional[dict], int]:
+        """Get a JSON value and the length of a list in one round trip."""
+        try:
+            async with self.binary.pipeline(transaction=True) as pipe:
+                pipe.get(key)
+                pipe.llen(list_key)
+                value, length = await pipe.execute()
+            return (self.codec.decode(value) if value else None), length
+        except Exception as e:
+            logger.error(f"❌ Redis GET_JSON_AND_LENGTH error for key {key}: {e}")
+            return None, 0
+    
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message. Returns the number of subscribers that got it."""
+        try:
+            return await self.redis.publish(channel, message)
+        except Exception as e:
+            logger.error(f"❌ Redis PUBLISH error for channel {channel}: {e}")
+            return 0
+    
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+        """Yield messages published on a channel; connection errors are raised to the caller."""
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.reset()
+    
     async def incr(self, key: str, amount: int = 1) -> Optional[int]:
         """Increment counter."""
         try:
@@ -145,32 +242,69 @@ class RedisClient:
         except Exception as e:
             logger.error(f"❌ Redis HGETALL error for key {key}: {e}")
             return None
+    
+    async def hash_set_many(self, key: str, mapping: dict, expire: Optional[int] = None) -> bool:
+        """Set several hash fields at once with optional expiration."""
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=mapping)
+                if expire:
+                    pipe.expire(key, expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Redis HSET error for key {key}: {e}")
+            return False
+    
+    async def list_push(self, key: str, value: str) -> Optional[int]:
+        """Push a value onto the head of a list."""
+        try:
+            return await self.redis.lpush(key, value)
+        except Exception as e:
+            logger.error(f"❌ Redis LPUSH error for key {key}: {e}")
+            return None
+    
+    async def list_move(self, source: str, destination: str, timeout: float) -> Optional[str]:
+        """Atomically move the tail of one list to the head of another, waiting up to timeout seconds."""
+        try:
+            return await self.redis.blmove(source, destination, timeout, "RIGHT", "LEFT")
+        except Exception as e:
+            logger.error(f"❌ Redis BLMOVE error for key {source}: {e}")
+            return None
+    
+    async def list_remove(self, key: str, value: str) -> int:
+        """Remove every occurrence of a value from a list."""
+        try:
+            return await self.redis.lrem(key, 0, value)
+        except Exception as e:
+            logger.error(f"❌ Redis LREM error for key {key}: {e}")
+            return 0
+    
+    async def list_range(self, key: str, start: int = 0, end: int = -1) -> List[str]:
+        """Get a range of list values."""
+        try:
+            return await self.redis.lrange(key, start, end)
+        except Exception as e:
+            logger.error(f"❌ Redis LRANGE error for key {key}: {e}")
+            return []
+    
+    async def list_range_json(self, key: str, start: int = 0, end: int = -1) -> List[dict]:
+        """Get a range of JSON list items, in any codec format."""
+        try:
+            return [self.codec.decode(value) for value in await self.binary.lrange(key, start, end)]
+        except Exception as e:
+            logger.error(f"❌ Redis LRANGE error for key {key}: {e}")
+            return []
+    
+    async def list_length(self, key: str) -> int:
+        """Get the length of a list."""
+        try:
+            return await self.redis.llen(key)
+        except Exception as e:
+            logger.error(f"❌ Redis LLEN error for key {key}: {e}")
+            return 0
 
 
 # Create global Redis client instance
 redis_client = RedisClient()
 
-
-# Helper functions for session management
-async def get_session(session_id: str) -> Optional[dict]:
-    """Get session data."""
-    return await redis_client.get_json(f"session:{session_id}")
-
-
-async def set_session(session_id: str, session_data: dict) -> bool:
-    """Set session data with default expiration."""
-    return await redis_client.set_json(
-        f"session:{session_id}", 
-        session_data, 
-        expire=settings.SESSION_TIMEOUT
-    )
-
-
-async def delete_session(session_id: str) -> bool:
-    """Delete session."""
-    return await redis_client.delete(f"session:{session_id}")
-
-
-async def extend_session(session_id: str) -> bool:
-    """Extend session expiration."""
-    return await redis_client.expire(f"session:{session_id}", settings.SESSION_TIMEOUT)
@@ -0,0 +1,11 @@
+# Import cache tiers at services level
+from services.redis_cache.lru import LRUCache
+from services.redis_cache.two_tier import TwoTierCache
+from services.redis_cache.response_cache import TutorResponseCache, normalize_text
+from services.redis_cache.artifact_cache import DocumentArtifactCache, artifact_cache
+from services.redis_cache.document_store import DocumentStore, document_store
+
+__all__ = [
+    'DocumentArtifactCache', 'DocumentStore', 'LRUCache', 'TutorResponseCache', 'TwoTierCache',
+    'artifact_cache', 'document_store', 'normalize_text',
+]
@@ -0,0 +1,44 @@
+"""
+TutorAgent MVP Document Artifact Cache
+Content-addressed cache of extras derived from uploaded documents
+"""
+
+from typing import Optional
+
+from core.config import settings
+from services.redis import RedisClient
+from services.redis_cache.lru import LRUCache
+from services.redis_cache.two_tier import TwoTierCache
+
+
+class DocumentArtifactCache(TwoTierCache):
+    """
+    Caches derived extras of an upload, such as its welcome message, by
+    the SHA-256 of its bytes (computed while the upload streams to
+    storage), so the same worksheet uploaded by a whole class gets them
+    generated once. The extracted text and questions live in the
+    DocumentStore.
+    """
+
+    def __init__(
+        self,
+        local: Optional[LRUCache] = None,
+        redis: Optional[RedisClient] = None,
+        ttl: int = settings.ARTIFACT_CACHE_TTL,
+        prefix: str = "doc_artifacts:"
+    ):
+        super().__init__(
+            local if local is not None else LRUCache(
+                max_entries=settings.ARTIFACT_CACHE_MAX_ENTRIES,
+                ttl=ttl,
+                name="artifact_cache"
+            ),
+            redis=redis,
+            ttl=ttl,
+            prefix=prefix,
+            name="artifact_cache"
+        )
+
+
+# Create global artifact cache instance
+artifact_cache = DocumentArtifactCache()
@@ -0,0 +1,154 @@
+"""
+TutorAgent MVP Document Store
+Extracted text and questions of each document, stored once and referenced by sessions
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+from core.metrics import metrics
+from services.redis import RedisClient
+from services.redis_cache.lru import LRUCache
+from services.redis_cache.two_tier import TwoTierCache
+
+
+class DocumentStore(TwoTierCache):
+    """
+    Documents keyed by document_id, which is the SHA-256 of the uploaded
+    bytes, so every session on the same worksheet shares one copy.
+
+    A document still being read in the background changes on every batch
+    of pages, possibly in another worker, so only complete documents are
+    kept in the local tier while Redis is available. One upload at a time
+    reads a document, holding a lease it renews as it saves progress, and
+    a save never replaces a document with more pages read.
+
+    Without Redis the local tier is the only copy, so documents that live
+    sessions retain() are kept even after the LRU evicts them, until
+    session_ttl after the session's last use.
+    """
+
+    def __init__(
+        self,
+        local: Optional[LRUCache] = None,
+        redis: Optional[RedisClient] = None,
+        ttl: int = settings.DOCUMENT_STORE_TTL,
+        prefix: str = "document:",
+        lease_ttl: int = settings.DOCUMENT_READER_LEASE_TTL,
+        session_ttl: int = settings.PDF_SESSION_TTL
+    ):
+        super().__init__(
+            local if local is not None else LRUCache(
+                max_entries=settings.DOCUMENT_STORE_MAX_ENTRIES,
+                ttl=ttl,
+                name="document_store"
+            ),
+            redis=redis,
+            ttl=ttl,
+            prefix=prefix,
+            name="document_store"
+        )
+        self.lease_ttl = lease_ttl
+        self.session_ttl = session_ttl
+        # Documents live sessions use while there is no Redis: document_id -> (monotonic expiry, document)
+        self._retained: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Reader leases while there is no Redis: document_id -> monotonic expiry
+        self._readers: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a document in the local tier, then Redis."""
+        value = self.local.get(key)
+        if value is not None:
+            metrics.incr(f"{self.name}.l1_hits")
+            return value
+
+        if self.redis.available:
+            value = await self.redis.get_json(f"{self.prefix}{key}")
+            if value is not None:
+                metrics.incr(f"{self.name}.l2_hits")
+                if value.get("complete", True):
+                    self.local.set(key, value)
+                return value
+        else:
+            retained = self._retained.get(key)
+            if retained is not None and retained[0] > time.monotonic():
+                metrics.incr(f"{self.name}.retained_hits")
+                self.local.set(key, retained[1])
+                return retained[1]
+
+        metrics.incr(f"{self.name}.misses")
+        return None
+
+    async def _stored(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.local.get(key)
+        if value is None and self.redis.available:
+            value = await self.redis.get_json(f"{self.prefix}{key}")
+        elif value is None and key in self._retained:
+            value = self._retained[key][1]
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        """
+        Store a document; partial ones only locally when there is no Redis.
+
+        Skipped if the stored copy has more pages read, or is complete and
+        value is not, so a reader that fell behind cannot undo progress.
+        """
+        stored = await self._stored(key)
+        if stored is not None and (
+            stored.get("pages_processed", 0) > value.get("pages_processed", 0)
+            or (stored.get("complete", True) and not value.get("complete", True))
+        ):
+            metrics.incr(f"{self.name}.stale_writes")
+            return
+        if self.redis.available:
+            if value.get("complete", True):
+                self.local.set(key, value)
+            else:
+                self.local.delete(key)
+            await self.redis.set_json(f"{self.prefix}{key}", value, expire=self.ttl)
+        else:
+            self.local.set(key, value)
+            if key in self._retained:
+                self._retained[key] = (self._retained[key][0], value)
+
+    def retain(self, key: str, value: Dict[str, Any]):
+        """
+        Record that a live session uses a document, keeping it for another
+        session_ttl seconds. Only needed without Redis, which holds every
+        document for the store's ttl.
+        """
+        if self.redis.available:
+            return
+        now = time.monotonic()
+        for expired in [k for k, (expires_at, _) in self._retained.items() if expires_at <= now]:
+            del self._retained[expired]
+        self._retained[key] = (now + self.session_ttl, value)
+
+    async def claim_reader(self, key: str) -> bool:
+        """Take the lease on reading a document; False while another upload holds it."""
+        if self.redis.available:
+            return await self.redis.set(f"{self.prefix}{key}:reader", "1", expire=self.lease_ttl, only_if_absent=True)
+        now = time.monotonic()
+        if self._readers.get(key, 0.0) > now:
+            return False
+        self._readers[key] = now + self.lease_ttl
+        return True
+
+    async def renew_reader(self, key: str):
+        """Extend the lease held on reading a document."""
+        if self.redis.available:
+            await self.redis.expire(f"{self.prefix}{key}:reader", self.lease_ttl)
+        elif key in self._readers:
+            self._readers[key] = time.monotonic() + self.lease_ttl
+
+    async def release_reader(self, key: str):
+        """Give up the lease on reading a document."""
+        if self.redis.available:
+            await self.redis.delete(f"{self.prefix}{key}:reader")
+        self._readers.pop(key, None)
+
+
+# Create global document store instance
+document_store = DocumentStore()
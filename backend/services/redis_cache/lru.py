@@ -0,0 +1,106 @@
+"""
+TutorAgent MVP In-Process LRU Cache
+Size- and TTL-bounded cache used as the near tier in front of Redis
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from core.metrics import metrics
+
+
+class LRUCache:
+    """
+    Least-recently-used cache with a max entry count and per-entry TTL.
+
+    on_evict, if given, is called with the key and value of every entry
+    dropped for space or found expired, so owners of resources the values
+    refer to can release them. It is not called for delete() or clear().
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: Optional[float] = None,
+        name: str = "lru",
+        clock: Callable[[], float] = time.monotonic,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.name = name
+        self._clock = clock
+        self._on_evict = on_evict
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value, refreshing its recency. Returns None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            expired = expires_at is not None and expires_at <= self._clock()
+            if expired:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if expired:
+            if self._on_evict is not None:
+                self._on_evict(key, value)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries when full."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl else None
+        evicted = []
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False))
+            self.evictions += len(evicted)
+        if evicted:
+            metrics.incr(f"{self.name}.evictions", len(evicted))
+            if self._on_evict is not None:
+                for evicted_key, (_, evicted_value) in evicted:
+                    self._on_evict(evicted_key, evicted_value)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key. Returns True if it was present."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters for this cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,49 @@
+"""
+TutorAgent MVP Tutor Response Cache
+Two-tier cache (in-process LRU in front of shared Redis) for tutor replies
+"""
+
+import hashlib
+import re
+from typing import Optional
+
+from core.config import settings
+from services.redis import RedisClient
+from services.redis_cache.lru import LRUCache
+from services.redis_cache.two_tier import TwoTierCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different prompts share a cache key."""
+    return _WHITESPACE.sub(" ", text or "").strip().casefold()
+
+
+class TutorResponseCache(TwoTierCache):
+    """Caches tutor responses by a normalized hash of the turn content."""
+
+    def __init__(
+        self,
+        local: Optional[LRUCache] = None,
+        redis: Optional[RedisClient] = None,
+        ttl: int = settings.RESPONSE_CACHE_TTL,
+        prefix: str = "tutor_response:"
+    ):
+        super().__init__(
+            local if local is not None else LRUCache(
+                max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+                ttl=ttl,
+                name="response_cache"
+            ),
+            redis=redis,
+            ttl=ttl,
+            prefix=prefix,
+            name="response_cache"
+        )
+
+    @staticmethod
+    def make_key(*parts: Optional[str]) -> str:
+        """Build a cache key from normalized parts (problem, student response, level...)."""
+        normalized = "\x1f".join(normalize_text(part or "") for part in parts)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -0,0 +1,72 @@
+"""
+TutorAgent MVP Two-Tier Cache
+In-process LRU in front of shared Redis, for JSON-serializable values
+"""
+
+from typing import Any, Dict, Optional
+
+from core.metrics import metrics
+from services.redis import RedisClient, redis_client
+from services.redis_cache.lru import LRUCache
+
+
+class TwoTierCache:
+    """JSON values cached in a local LRU tier and a shared Redis tier."""
+
+    def __init__(
+        self,
+        local: LRUCache,
+        redis: Optional[RedisClient] = None,
+        ttl: int = 3600,
+        prefix: str = "cache:",
+        name: str = "cache"
+    ):
+        self.local = local
+        self.redis = redis if redis is not None else redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.name = name
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a value in the local tier, then Redis."""
+        value = self.local.get(key)
+        if value is not None:
+            metrics.incr(f"{self.name}.l1_hits")
+            return value
+
+        if self.redis.available:
+            value = await self.redis.get_json(f"{self.prefix}{key}")
+            if value is not None:
+                metrics.incr(f"{self.name}.l2_hits")
+                self.local.set(key, value)
+                return value
+
+        metrics.incr(f"{self.name}.misses")
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        """Store a value in both tiers."""
+        self.local.set(key, value)
+        if self.redis.available:
+            await self.redis.set_json(f"{self.prefix}{key}", value, expire=self.ttl)
+
+    async def delete(self, key: str):
+        """Drop a value from both tiers."""
+        self.local.delete(key)
+        if self.redis.available:
+            await self.redis.delete(f"{self.prefix}{key}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters across both tiers."""
+        l1_hits = metrics.counter(f"{self.name}.l1_hits")
+        l2_hits = metrics.counter(f"{self.name}.l2_hits")
+        misses = metrics.counter(f"{self.name}.misses")
+        lookups = l1_hits + l2_hits + misses
+        return {
+            "local": self.local.stats(),
+            "l1_hits": l1_hits,
+            "l2_hits": l2_hits,
+            "misses": misses,
+            "evictions": metrics.counter(f"{self.name}.evictions"),
+            "hit_rate": round((l1_hits + l2_hits) / lookups, 4) if lookups else 0.0,
+        }
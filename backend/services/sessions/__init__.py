@@ -0,0 +1,14 @@
+# Import session storage pieces at services level
+from services.sessions.backends import MemorySessionBackend, RedisSessionBackend, SessionBackend
+from services.sessions.store import (
+    SessionStore, build_memory_backend, delete_session, extend_session, get_session, load_session,
+    session_store, set_session,
+)
+from services.sessions.near_cache import SessionNearCache, session_near_cache
+from services.sessions.log import SessionLog
+
+__all__ = [
+    'MemorySessionBackend', 'RedisSessionBackend', 'SessionBackend', 'SessionLog', 'SessionNearCache',
+    'SessionStore', 'build_memory_backend', 'delete_session', 'extend_session', 'get_session',
+    'load_session', 'session_near_cache', 'session_store', 'set_session',
+]
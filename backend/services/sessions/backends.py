@@ -0,0 +1,344 @@
+"""
+TutorAgent MVP Session Backends
+Where session fields and message logs are kept: Redis, or bounded process memory
+"""
+
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from core.logging import get_logger
+from core.metrics import metrics
+from services.codec import ValueCodec
+from services.redis import RedisClient, redis_client
+
+logger = get_logger("sessions")
+
+
+class SessionBackend(ABC):
+    """
+    Storage for session values and append-only lists, with per-key TTLs.
+
+    Values are JSON-compatible dicts; list items likewise. Reads return
+    copies, so changing a loaded session has no effect until it is saved.
+    """
+
+    name: str = "backend"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        """Get a value, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def get_and_touch(self, key: str, ttl: int) -> Optional[dict]:
+        """Get a value and reset its TTL."""
+
+    @abstractmethod
+    async def set(self, key: str, value: dict, ttl: Optional[int] = None) -> bool:
+        """Store a value, replacing any previous one."""
+
+    @abstractmethod
+    async def get_with_length(self, key: str, list_key: str) -> Tuple[Optional[dict], int]:
+        """Get a value and the length of a list together."""
+
+    @abstractmethod
+    async def set_and_append(
+        self,
+        key: str,
+        value: dict,
+        list_key: str,
+        items: List[dict],
+        ttl: Optional[int] = None,
+        notify: Optional[Tuple[str, str]] = None
+    ) -> Optional[int]:
+        """
+        Store a value and append items to a list together; both get the TTL.
+        notify is a (channel, message) published to other workers with the
+        write. Returns the list's new length, or None if the write failed.
+        """
+
+    @abstractmethod
+    async def list_range(self, list_key: str, start: int = 0, end: int = -1) -> List[dict]:
+        """Get list items start..end (inclusive, negative counts from the end)."""
+
+    @abstractmethod
+    async def list_length(self, list_key: str) -> int:
+        """Number of items in a list."""
+
+    @abstractmethod
+    async def touch(self, key: str, ttl: int) -> bool:
+        """Reset a key's TTL. Returns False if it does not exist."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> bool:
+        """Delete keys. Returns True if any existed."""
+
+    async def publish(self, channel: str, message: str):
+        """Tell other workers something; a no-op where there are none."""
+
+    def start(self):
+        """Start any background work."""
+
+    async def stop(self):
+        """Stop background work."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend counters."""
+        return {"backend": self.name}
+
+
+class RedisSessionBackend(SessionBackend):
+    """Sessions in Redis, shared by every API worker."""
+
+    name = "redis"
+
+    def __init__(self, redis: Optional[RedisClient] = None):
+        self.redis = redis if redis is not None else redis_client
+
+    async def get(self, key: str) -> Optional[dict]:
+        return await self.redis.get_json(key)
+
+    async def get_and_touch(self, key: str, ttl: int) -> Optional[dict]:
+        return await self.redis.get_json_and_touch(key, ttl)
+
+    async def set(self, key: str, value: dict, ttl: Optional[int] = None) -> bool:
+        return await self.redis.set_json(key, value, expire=ttl)
+
+    async def get_with_length(self, key: str, list_key: str) -> Tuple[Optional[dict], int]:
+        return await self.redis.get_json_and_length(key, list_key)
+
+    async def set_and_append(
+        self,
+        key: str,
+        value: dict,
+        list_key: str,
+        items: List[dict],
+        ttl: Optional[int] = None,
+        notify: Optional[Tuple[str, str]] = None
+    ) -> Optional[int]:
+        return await self.redis.set_json_and_append(key, value, list_key, items, expire=ttl, publish=notify)
+
+    async def list_range(self, list_key: str, start: int = 0, end: int = -1) -> List[dict]:
+        return await self.redis.list_range_json(list_key, start, end)
+
+    async def list_length(self, list_key: str) -> int:
+        return await self.redis.list_length(list_key)
+
+    async def touch(self, key: str, ttl: int) -> bool:
+        return await self.redis.expire(key, ttl)
+
+    async def delete(self, *keys: str) -> bool:
+        return await self.redis.delete(*keys)
+
+    async def publish(self, channel: str, message: str):
+        await self.redis.publish(channel, message)
+
+
+@dataclass
+class _Entry:
+    value: Union[bytes, List[bytes]]  # Encoded value, or encoded list items
+    size: int
+    expires_at: Optional[float]
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    Sessions in this process, for single-node deployments and tests.
+
+    Bounded like a Redis maxmemory LRU: the least recently used keys are
+    evicted past max_entries or max_bytes (of encoded values). Expired keys
+    are dropped when read and by a background sweep every sweep_interval
+    seconds once start() is called. Values are stored encoded, as in Redis,
+    which is what makes reads return copies and lets bytes be counted.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        sweep_interval: float = 60.0,
+        codec: Optional[ValueCodec] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.codec = codec or ValueCodec(compression="none")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expiry(self, ttl: Optional[int]) -> Optional[float]:
+        return self._clock() + ttl if ttl else None
+
+    def _live(self, key: str) -> Optional[_Entry]:
+        """The entry for key unless expired, marked most recently used; call with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def _put(self, key: str, entry: _Entry):
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+    def _evict(self):
+        """Drop least recently used keys until within bounds; the newest key is always kept."""
+        evicted = 0
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            evicted += 1
+        if evicted:
+            self.evictions += evicted
+            metrics.incr("session_store.evictions", evicted)
+
+    async def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._live(key)
+        if entry is None or isinstance(entry.value, list):
+            return None
+        return self.codec.decode(entry.value)
+
+    async def get_and_touch(self, key: str, ttl: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                entry.expires_at = self._expiry(ttl)
+        if entry is None or isinstance(entry.value, list):
+            return None
+        return self.codec.decode(entry.value)
+
+    async def set(self, key: str, value: dict, ttl: Optional[int] = None) -> bool:
+        data = self.codec.encode(value)
+        with self._lock:
+            self._put(key, _Entry(data, len(data), self._expiry(ttl)))
+            self._evict()
+        return True
+
+    async def get_with_length(self, key: str, list_key: str) -> Tuple[Optional[dict], int]:
+        return await self.get(key), await self.list_length(list_key)
+
+    async def set_and_append(
+        self,
+        key: str,
+        value: dict,
+        list_key: str,
+        items: List[dict],
+        ttl: Optional[int] = None,
+        notify: Optional[Tuple[str, str]] = None
+    ) -> Optional[int]:
+        # notify is dropped: no other worker shares this process's memory
+        data = self.codec.encode(value)
+        encoded = [self.codec.encode(item) for item in items]
+        with self._lock:
+            self._put(key, _Entry(data, len(data), self._expiry(ttl)))
+            entry = self._live(list_key)
+            if entry is None or not isinstance(entry.value, list):
+                entry = _Entry([], 0, None)
+                self._put(list_key, entry)
+            added = sum(len(item) for item in encoded)
+            entry.value.extend(encoded)
+            entry.size += added
+            self._bytes += added
+            if ttl:
+                entry.expires_at = self._expiry(ttl)
+            length = len(entry.value)
+            self._evict()
+        return length
+
+    async def list_range(self, list_key: str, start: int = 0, end: int = -1) -> List[dict]:
+        with self._lock:
+            entry = self._live(list_key)
+            if entry is None or not isinstance(entry.value, list):
+                return []
+            length = len(entry.value)
+            start = max(0, start + length if start < 0 else start)
+            end = end + length if end < 0 else end
+            items = entry.value[start:end + 1]
+        return [self.codec.decode(item) for item in items]
+
+    async def list_length(self, list_key: str) -> int:
+        with self._lock:
+            entry = self._live(list_key)
+            return len(entry.value) if entry is not None and isinstance(entry.value, list) else 0
+
+    async def touch(self, key: str, ttl: int) -> bool:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return False
+            entry.expires_at = self._expiry(ttl)
+            return True
+
+    async def delete(self, *keys: str) -> bool:
+        with self._lock:
+            return sum(self._remove(key) for key in keys) > 0
+
+    def sweep(self) -> int:
+        """Drop every expired key. Returns how many were dropped."""
+        now = self._clock()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry.expires_at is not None and entry.expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                swept = self.sweep()
+                if swept:
+                    logger.debug(f"Expired {swept} in-memory session keys")
+            except Exception as e:
+                logger.error(f"❌ Session sweep failed: {e}")
+
+    def start(self):
+        """Start the background expiry sweep; needs a running event loop."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self):
+        """Stop the background expiry sweep."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
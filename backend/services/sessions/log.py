@@ -0,0 +1,126 @@
+"""
+TutorAgent MVP Session Log
+Chat session fields in one small key, messages in an append-only list
+"""
+
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.metrics import metrics
+from services.sessions.backends import SessionBackend
+from services.sessions.near_cache import SessionNearCache
+from services.sessions.store import SessionStore, session_store
+
+# Written into the fields on every save; a near cache entry is used only while it matches
+VERSION_FIELD = "log_version"
+
+
+class SessionLog:
+    """
+    Chat sessions stored as two keys: "{prefix}{id}" holds the scalar
+    fields as JSON and "{prefix}{id}:messages" is a list of JSON messages.
+
+    A turn appends its new messages and rewrites only the scalar fields, so
+    its cost no longer grows with the conversation; history is read in
+    ranges. Messages already folded into a session's rolling summary
+    (before summary_upto) stay in the log but are not loaded for turns.
+
+    With a near_cache, loads read the fields and the log length in one
+    round trip and take the messages from the cache when its entry is
+    still current, so a worker serving consecutive turns of a session does
+    not reread the log.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        ttl: int = 3600,
+        store: Optional[Union[SessionStore, SessionBackend]] = None,
+        near_cache: Optional[SessionNearCache] = None
+    ):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.store = store if store is not None else session_store
+        self.near_cache = near_cache
+
+    def _messages_key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}:messages"
+
+    async def get_fields(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a session's scalar fields, or None if it does not exist."""
+        fields = await self.store.get(f"{self.prefix}{session_id}")
+        if fields is not None and "messages" in fields:
+            # Saved as one blob before the log existed; move its messages over once
+            messages = fields.pop("messages")
+            await self.save(session_id, fields, messages)
+        if fields is not None:
+            fields.pop(VERSION_FIELD, None)
+        return fields
+
+    async def load(self, session_id: str) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Get a session's fields and the messages from its summary_upto on."""
+        if self.near_cache is None:
+            fields = await self.get_fields(session_id)
+            if fields is None:
+                return None
+            return fields, await self.messages(session_id, fields.get("summary_upto", 0))
+
+        started = time.perf_counter()
+        key = f"{self.prefix}{session_id}"
+        fields, length = await self.store.get_with_length(key, self._messages_key(session_id))
+        if fields is None:
+            return None
+        if "messages" in fields:
+            fields = await self.get_fields(session_id)
+        version = fields.pop(VERSION_FIELD, None)
+        start = fields.get("summary_upto", 0)
+
+        messages = self.near_cache.get(key, version, length, start)
+        if messages is not None:
+            metrics.observe("session_log.load_hit", (time.perf_counter() - started) * 1000)
+            return fields, messages
+
+        messages = await self.messages(session_id, start)
+        if version is not None:
+            self.near_cache.put(key, version, start, messages)
+        metrics.observe("session_log.load_miss", (time.perf_counter() - started) * 1000)
+        return fields, messages
+
+    async def messages(self, session_id: str, start: int = 0, end: int = -1) -> List[Dict[str, Any]]:
+        """Get messages start..end (inclusive, negative counts from the end)."""
+        return await self.store.list_range(self._messages_key(session_id), start, end)
+
+    async def count(self, session_id: str) -> int:
+        """Number of messages in a session's log."""
+        return await self.store.list_length(self._messages_key(session_id))
+
+    async def save(self, session_id: str, fields: Dict[str, Any], new_messages: List[Dict[str, Any]]):
+        """Rewrite a session's fields and append its new messages in one round trip; both keys expire together."""
+        key = f"{self.prefix}{session_id}"
+        if self.near_cache is None:
+            await self.store.set_and_append(key, fields, self._messages_key(session_id), new_messages, self.ttl)
+            return
+
+        version = uuid.uuid4().hex
+        length = await self.store.set_and_append(
+            key,
+            {**fields, VERSION_FIELD: version},
+            self._messages_key(session_id),
+            new_messages,
+            self.ttl,
+            notify=(self.near_cache.channel, self.near_cache.notice(key))
+        )
+        if length is None:
+            self.near_cache.drop(key)
+        else:
+            self.near_cache.append(key, version, length, fields.get("summary_upto", 0), new_messages)
+
+    async def delete(self, session_id: str) -> bool:
+        """Delete a session's fields and messages."""
+        key = f"{self.prefix}{session_id}"
+        deleted = await self.store.delete(key, self._messages_key(session_id))
+        if self.near_cache is not None:
+            self.near_cache.drop(key)
+            await self.store.publish(self.near_cache.channel, self.near_cache.notice(key))
+        return deleted
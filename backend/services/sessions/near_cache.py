@@ -0,0 +1,154 @@
+"""
+TutorAgent MVP Session Near Cache
+Message logs of recently served sessions, kept in the worker that served them
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import metrics
+from services.redis import RedisClient
+from services.redis_cache.lru import LRUCache
+
+logger = get_logger("sessions")
+
+
+@dataclass
+class _Entry:
+    version: str
+    length: int  # Log length the messages were read or written at
+    start: int  # Log position of the first cached message
+    messages: List[Dict[str, Any]]
+
+
+class SessionNearCache:
+    """
+    Decoded messages of sessions this worker served recently, so the next
+    turn on the same session skips reading and decoding its message log.
+
+    Entries are only used when the session's fields carry the version the
+    entry was stored with and its log has the same length; both come back
+    from the store in the round trip that loads the fields, so another
+    worker's write can never be hidden. Writes are also published on a
+    Redis channel, and listen() drops entries other workers have changed
+    so they stop holding memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        channel: str = "session_invalidations",
+        worker_id: Optional[str] = None
+    ):
+        self.entries = LRUCache(max_entries=max_entries, name="session_near_cache")
+        self.channel = channel
+        self.worker_id = worker_id or uuid.uuid4().hex
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    def get(self, key: str, version: Optional[str], length: int, start: int) -> Optional[List[Dict[str, Any]]]:
+        """Cached messages from start on if the entry matches version and length."""
+        entry = self.entries.get(key)
+        if entry is not None and entry.version == version and entry.length == length and entry.start <= start:
+            self.hits += 1
+            metrics.incr("session_near_cache.hits")
+            return entry.messages[start - entry.start:]
+        if entry is not None:
+            self.stale += 1
+            self.entries.delete(key)
+        self.misses += 1
+        metrics.incr("session_near_cache.misses")
+        return None
+
+    def put(self, key: str, version: str, start: int, messages: List[Dict[str, Any]]):
+        """Cache the messages read from start on under version."""
+        self.entries.set(key, _Entry(version, start + len(messages), start, list(messages)))
+
+    def append(self, key: str, version: str, length: int, start: int, messages: List[Dict[str, Any]]):
+        """
+        Record a write that appended messages, leaving the log at length.
+        The entry is extended if it ended where they landed, restarted if
+        they cover everything from start, and dropped otherwise.
+        """
+        base = length - len(messages)
+        entry = self.entries.get(key)
+        if entry is not None and entry.length == base and entry.start <= start:
+            cached = (entry.messages + list(messages))[start - entry.start:]
+        elif base <= start:
+            cached = list(messages[start - base:])
+        else:
+            self.entries.delete(key)
+            return
+        self.entries.set(key, _Entry(version, length, start, cached))
+
+    def drop(self, key: str):
+        """Forget a session this worker changed without knowing the result."""
+        self.entries.delete(key)
+
+    def notice(self, key: str) -> str:
+        """Message telling other workers that key changed."""
+        return f"{self.worker_id} {key}"
+
+    def handle(self, message: str):
+        """Drop the entry named in another worker's notice."""
+        worker_id, _, key = message.partition(" ")
+        if worker_id != self.worker_id and self.entries.delete(key):
+            self.invalidations += 1
+            metrics.incr("session_near_cache.invalidations")
+
+    async def _listen_forever(self, redis: RedisClient):
+        while True:
+            try:
+                async for message in redis.listen(self.channel):
+                    self.handle(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Entries are still checked on every read; this only delays freeing them
+                logger.warning(f"⚠️ Session invalidation listener reconnecting: {e}")
+                await asyncio.sleep(1)
+
+    def listen(self, redis: RedisClient):
+        """Start dropping entries that other workers publish changes for."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen_forever(redis))
+
+    async def stop(self):
+        """Stop listening for other workers' changes."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and the load time a hit saves, from this worker's recent loads."""
+        lookups = self.hits + self.misses
+        hit_ms = metrics.latency("session_log.load_hit")["p50_ms"]
+        miss_ms = metrics.latency("session_log.load_miss")["p50_ms"]
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.entries.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_ms_per_hit": round(max(miss_ms - hit_ms, 0.0), 2) if hit_ms and miss_ms else 0.0,
+        }
+
+
+# Create global near cache instance, shared by the chat and PDF chat session logs
+session_near_cache = SessionNearCache(
+    max_entries=settings.SESSION_NEAR_CACHE_MAX_ENTRIES,
+    channel=settings.SESSION_INVALIDATION_CHANNEL
+)
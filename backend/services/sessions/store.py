@@ -0,0 +1,108 @@
+"""
+TutorAgent MVP Session Store
+The session backend in use, and helpers for tutoring session records
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.logging import get_logger
+from services.sessions.backends import MemorySessionBackend, SessionBackend
+
+logger = get_logger("sessions")
+
+
+class SessionStore:
+    """
+    Front for whichever SessionBackend is in use, so modules can hold on to
+    one store while main.py picks the backend at startup: Redis when it
+    connects, process memory otherwise.
+    """
+
+    def __init__(self, backend: SessionBackend):
+        self.backend = backend
+
+    def use(self, backend: SessionBackend):
+        """Switch to another backend; sessions in the old one are not carried over."""
+        self.backend = backend
+        logger.info(f"💾 Sessions stored in {backend.name}")
+
+    async def get(self, key: str) -> Optional[dict]:
+        return await self.backend.get(key)
+
+    async def get_and_touch(self, key: str, ttl: int) -> Optional[dict]:
+        return await self.backend.get_and_touch(key, ttl)
+
+    async def set(self, key: str, value: dict, ttl: Optional[int] = None) -> bool:
+        return await self.backend.set(key, value, ttl)
+
+    async def get_with_length(self, key: str, list_key: str) -> Tuple[Optional[dict], int]:
+        return await self.backend.get_with_length(key, list_key)
+
+    async def set_and_append(
+        self,
+        key: str,
+        value: dict,
+        list_key: str,
+        items: List[dict],
+        ttl: Optional[int] = None,
+        notify: Optional[Tuple[str, str]] = None
+    ) -> Optional[int]:
+        return await self.backend.set_and_append(key, value, list_key, items, ttl, notify)
+
+    async def list_range(self, list_key: str, start: int = 0, end: int = -1) -> List[dict]:
+        return await self.backend.list_range(list_key, start, end)
+
+    async def list_length(self, list_key: str) -> int:
+        return await self.backend.list_length(list_key)
+
+    async def touch(self, key: str, ttl: int) -> bool:
+        return await self.backend.touch(key, ttl)
+
+    async def delete(self, *keys: str) -> bool:
+        return await self.backend.delete(*keys)
+
+    async def publish(self, channel: str, message: str):
+        await self.backend.publish(channel, message)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.backend.stats()
+
+
+def build_memory_backend() -> MemorySessionBackend:
+    """In-process backend bounded by the SESSION_MEMORY_* settings."""
+    return MemorySessionBackend(
+        max_entries=settings.SESSION_MEMORY_MAX_ENTRIES,
+        max_bytes=settings.SESSION_MEMORY_MAX_BYTES,
+        sweep_interval=settings.SESSION_MEMORY_SWEEP_INTERVAL
+    )
+
+
+# Create global session store instance; memory until main.py connects Redis
+session_store = SessionStore(build_memory_backend())
+
+
+# Helper functions for session management
+async def get_session(session_id: str) -> Optional[dict]:
+    """Get session data."""
+    return await session_store.get(f"session:{session_id}")
+
+
+async def load_session(session_id: str) -> Optional[dict]:
+    """Get session data and extend its expiration in one round trip."""
+    return await session_store.get_and_touch(f"session:{session_id}", settings.SESSION_TIMEOUT)
+
+
+async def set_session(session_id: str, session_data: dict) -> bool:
+    """Set session data with default expiration; saving also extends the session."""
+    return await session_store.set(f"session:{session_id}", session_data, settings.SESSION_TIMEOUT)
+
+
+async def delete_session(session_id: str) -> bool:
+    """Delete session."""
+    return await session_store.delete(f"session:{session_id}")
+
+
+async def extend_session(session_id: str) -> bool:
+    """Extend session expiration."""
+    return await session_store.touch(f"session:{session_id}", settings.SESSION_TIMEOUT)
@@ -0,0 +1,70 @@
+"""
+Tests for the token-budgeted conversation context builder
+"""
+
+from types import SimpleNamespace
+
+from agents.tutor.response_generation.context_builder import ContextBuilder
+from core.tokens import estimate_tokens
+
+
+def make_turns(count: int, words: int = 20):
+    return [
+        SimpleNamespace(
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"turn {i} " + "word " * words
+        )
+        for i in range(count)
+    ]
+
+
+def test_recent_turns_are_included_oldest_first():
+    builder = ContextBuilder(recent_turns=4)
+
+    built = builder.build("Is x = 4?", turns=make_turns(3), header="Current Problem: 2x + 3 = 11")
+
+    assert built.turns_included == 3
+    assert built.content.index("Student: turn 0") < built.content.index("Tutor: turn 1")
+    assert built.content.startswith("Current Problem: 2x + 3 = 11")
+    assert built.content.endswith("Student Response: Is x = 4?")
+
+
+def test_prompt_stays_within_budget_however_long_the_session():
+    builder = ContextBuilder(max_tokens=800, document_tokens=300, summary_tokens=100, recent_turns=6)
+    system_prompt = "You are a tutor. " * 40
+    document = "1. Solve for x. " * 500
+    turns, summary, upto = make_turns(200, words=60), None, 0
+
+    for end in range(2, len(turns), 2):
+        summary, upto = builder.fold_summary(summary, upto, turns[:end])
+        built = builder.build(
+            "Next?", turns=turns[upto:end], system_prompt=system_prompt, document=document, summary=summary
+        )
+        assert built.token_count <= 800
+
+    assert upto == len(turns) - 2 - 6
+    assert estimate_tokens(summary) <= 100
+    assert estimate_tokens(built.document) <= 300
+    assert "Earlier in this session:" in built.content
+
+
+def test_fold_summary_keeps_newest_lines():
+    builder = ContextBuilder(summary_tokens=30, recent_turns=2, summary_line_tokens=5)
+
+    summary, upto = builder.fold_summary(None, 0, make_turns(10))
+
+    assert upto == 8
+    assert "turn 7" in summary
+    assert "turn 0" not in summary
+    assert builder.fold_summary(summary, upto, make_turns(10)) == (summary, 8)
+
+
+def test_token_count_reports_system_prompt_and_content():
+    builder = ContextBuilder()
+
+    built = builder.build("Hi", system_prompt="s" * 400, document="d" * 800)
+
+    assert built.sections["system"] == 100
+    assert built.sections["document"] == 200
+    assert built.document in built.content
+    assert built.token_count == 100 + estimate_tokens(built.content)
@@ -0,0 +1,139 @@
+"""
+Tests for system-instruction prompts and per-document prefix caching
+"""
+
+import asyncio
+
+import pytest
+
+from agents.assessment.context_cache import ContextCache, GeminiContextCache, LocalContextCache
+from core.metrics import metrics
+from core.tokens import estimate_tokens
+from tests.fakes import make_agent
+
+WORKSHEET = "--- Page 1 ---\n1. Find x if 2x + 3 = 11\n2. Simplify 3a + 4a\n" * 20
+
+
+def make_cached_agent():
+    agent = make_agent()
+    agent.response_cache = None
+    agent.context_cache = ContextCache(LocalContextCache(), ttl=600)
+    return agent
+
+
+def test_static_guidelines_live_in_system_instruction():
+    from agents.assessment.gemini_agent import GeminiTutorAgent
+
+    agent = GeminiTutorAgent()
+
+    assert "friendly, intelligent AI math tutor" in str(agent.model._system_instruction)
+    assert agent.tutoring_prompt not in agent._build_tutoring_prompt("What is 15 + 27?")
+    assert agent.tutoring_prompt not in agent._build_streaming_prompt("What is 15 + 27?")
+
+
+@pytest.mark.asyncio
+async def test_document_is_registered_once_and_referenced_afterwards():
+    agent = make_cached_agent()
+    metrics.reset()
+
+    await agent.respond("Document: worksheet.pdf\nQuestion 1 of 2\n\nStudent Response: x = 4?",
+                        document_id="doc-1", document_text=WORKSHEET)
+    await agent.respond("Document: worksheet.pdf\nQuestion 1 of 2\n\nStudent Response: is it 4?",
+                        document_id="doc-1", document_text=WORKSHEET)
+
+    assert metrics.counter("context_cache.registrations") == 1
+    assert metrics.counter("context_cache.hits") == 1
+    assert metrics.counter("context_cache.tokens_saved") == estimate_tokens(WORKSHEET)
+    # Nothing holds the document server-side, so turns carry only their own passages
+    assert not any(WORKSHEET in prompt for prompt in agent.model.prompts)
+
+
+@pytest.mark.asyncio
+async def test_server_side_prefix_goes_only_to_gemini():
+    class ServerSideContextCache(LocalContextCache):
+        server_side = True
+
+        def model_for(self, prefix, base_model):
+            return ("cached", prefix.name)
+
+    agent = make_agent()
+    agent.context_cache = ContextCache(ServerSideContextCache())
+
+    request = await agent._build_request("Student Response: x = 4?", "doc-1", WORKSHEET)
+
+    assert request.prefix is None
+    assert request.full_prompt() == "Student Response: x = 4?"
+    assert request.hint("gemini", "model") == ("cached", "local/doc-1")
+
+
+@pytest.mark.asyncio
+async def test_document_without_an_id_is_sent_inline():
+    agent = make_agent()
+    agent.response_cache = None
+    agent.context_cache = None
+
+    await agent.respond("Student Response: x = 4?", document_text=WORKSHEET)
+
+    assert agent.model.prompts[0].startswith("DOCUMENT:\n" + WORKSHEET)
+
+
+@pytest.mark.asyncio
+async def test_turn_prefix_is_left_out_when_it_cannot_be_cached():
+    agent = make_agent()
+    agent.response_cache = None
+    agent.context_cache = ContextCache(GeminiContextCache("gemini-2.5-pro", system_instruction="guidelines"))
+    metrics.reset()
+
+    await agent.respond("Student Response: x = 4?", document_id="doc-1", document_text="1. Find x if 2x = 8")
+
+    assert "DOCUMENT:" not in agent.model.prompts[0]
+    assert metrics.counter("context_cache.misses") == 0
+
+
+def test_turns_share_the_question_list_of_fully_read_documents():
+    from api.routes.pdf_chat import document_prefix
+
+    questions = [{"text": "1. Find x if 2x = 8"}, {"text": "2. Simplify 3a + 4a"}]
+
+    assert document_prefix({"questions": questions, "complete": True}) == "1. Find x if 2x = 8\n\n2. Simplify 3a + 4a"
+    assert document_prefix({"questions": questions, "complete": False}) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_turns_register_the_document_once():
+    class SlowLocalContextCache(LocalContextCache):
+        creates = 0
+
+        async def create(self, key, text, ttl):
+            self.creates += 1
+            await asyncio.sleep(0.01)
+            return await super().create(key, text, ttl)
+
+    backend = SlowLocalContextCache()
+    cache = ContextCache(backend)
+
+    first, second = await asyncio.gather(cache.register("doc-1", WORKSHEET), cache.register("doc-1", WORKSHEET))
+
+    assert first is second
+    assert backend.creates == 1
+
+
+@pytest.mark.asyncio
+async def test_evicted_documents_are_deleted_from_the_backend():
+    backend = LocalContextCache()
+    cache = ContextCache(backend, max_entries=1)
+
+    await cache.register("doc-1", WORKSHEET)
+    second = await cache.register("doc-2", WORKSHEET.replace("Simplify", "Expand"))
+    await asyncio.sleep(0)
+
+    assert list(backend.documents) == [second.name]
+    assert cache.lookup("doc-1") is None
+
+
+@pytest.mark.asyncio
+async def test_documents_below_backend_minimum_are_not_registered():
+    backend = GeminiContextCache("gemini-2.5-pro", system_instruction="guidelines")
+    cache = ContextCache(backend)
+
+    assert await cache.register("doc-1", "1. Find x if 2x = 8") is None
@@ -0,0 +1,71 @@
+"""
+Tests for non-blocking Gemini generation in GeminiTutorAgent
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.llm import LLMRequest
+from tests.fakes import make_agent
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_during_slow_generations():
+    agent = make_agent(delay=0.3)
+    max_lag = 0.0
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal max_lag
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - started - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    results = await asyncio.gather(*[agent._generate_response(LLMRequest(prompt=f"Problem {i}")) for i in range(10)])
+    stop.set()
+    await beat
+
+    assert all('"message"' in r for r in results)
+    assert max_lag < 0.1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_limits_in_flight_calls():
+    agent = make_agent(delay=0.05, max_concurrency=3)
+
+    await asyncio.gather(*[agent._generate_response(LLMRequest(prompt=f"Problem {i}")) for i in range(12)])
+
+    assert agent.model.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_timeout_bounds_each_call():
+    agent = make_agent(delay=1.0, timeout=0.05)
+
+    started = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        await agent._generate_response(LLMRequest(prompt="What is 15 + 27?"))
+
+    assert time.perf_counter() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_respond_parses_message_from_in_memory_content():
+    agent = make_agent(delay=0)
+
+    result = await agent.respond("New Problem: What is 15 + 27?", context={"is_initial": True})
+
+    assert result == {"message": "What do you think the first step is?"}
+
+
+@pytest.mark.asyncio
+async def test_respond_returns_fallback_on_timeout():
+    agent = make_agent(delay=1.0, timeout=0.05)
+
+    result = await agent.respond("What is 15 + 27?")
+
+    assert result == agent._get_fallback_tutoring_response()
@@ -0,0 +1,81 @@
+"""
+Tests for image cleanup ahead of OCR
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from agents.document_parser.ocr.engine import OCREngine
+from agents.document_parser.preprocessing.image import PreprocessOptions, binarize, decode, preprocess, preprocess_bytes
+from services.redis_cache import LRUCache, TwoTierCache
+from tests.fakes import FakeRedis, make_photo
+
+LINES = [f"{n}. Solve {n + 1}x + 3 = {2 * n + 11} and show working" for n in range(1, 21)]
+
+
+@pytest.mark.parametrize("angle", [-6.0, -1.5, 0.0, 4.0])
+def test_skewed_photo_is_levelled(angle):
+    result = preprocess(make_photo(LINES, angle=angle))
+
+    assert result.skew == pytest.approx(-angle, abs=0.5)
+
+
+def test_photo_is_downscaled_binarized_and_cropped():
+    options = PreprocessOptions(target_dpi=150)
+    result = preprocess(make_photo(LINES, angle=3.0), options)
+
+    assert result.scale == pytest.approx(150 * options.page_width_inches / 3024, rel=0.01)
+    assert set(np.unique(result.image)) <= {0, 255}
+    # Margins and the background around the text are gone
+    x, y, width, height = result.crop
+    assert width < 3024 * result.scale * 0.9 and height < 4032 * result.scale * 0.9
+    assert x > 0 and y > 0
+
+
+def test_uneven_lighting_does_not_turn_into_ink():
+    # Dark left edge, as when a hand or phone shades the page
+    result = preprocess(make_photo(LINES, shadow=0.25), PreprocessOptions(crop=False))
+
+    height, width = result.image.shape
+    darkest_corner = result.image[height * 85 // 100:, : width * 3 // 10]
+    assert (darkest_corner == 0).mean() < 0.01
+    assert (binarize(make_photo(LINES, shadow=0.25))[-600:, :900] == 0).mean() > 0.5
+
+
+def test_every_option_is_part_of_the_cache_key():
+    base = PreprocessOptions()
+
+    assert base.key() != PreprocessOptions(skew_step=0.5).key()
+    assert base.key() != PreprocessOptions(page_width_inches=8.5).key()
+
+
+def test_undecodable_images_are_recognized_as_they_are():
+    assert preprocess_bytes(b"GIF89a not really") == b"GIF89a not really"
+
+
+def test_small_images_are_not_upscaled():
+    image = np.full((200, 300), 255, np.uint8)
+    cv2.putText(image, "1. x = 4", (20, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, 0, 2)
+
+    result = preprocess(image, PreprocessOptions(deskew=False))
+
+    assert result.scale == 1.0
+    assert result.image.shape[0] < 200
+
+
+def size_recognizer(data, engine, language, tesseract_cmd):
+    height, width = decode(data).shape
+    return f"{width}x{height}"
+
+
+@pytest.mark.asyncio
+async def test_ocr_engine_recognizes_the_preprocessed_image():
+    ok, jpeg = cv2.imencode(".jpg", make_photo(LINES, angle=2.0))
+    cache = TwoTierCache(LRUCache(max_entries=8), redis=FakeRedis(), name="test_ocr")
+    raw = OCREngine(workers=0, cache=cache, recognizer=size_recognizer)
+    cleaned = OCREngine(workers=0, cache=cache, recognizer=size_recognizer, preprocess=PreprocessOptions())
+
+    assert await raw.ocr_image(jpeg.tobytes()) == "3024x4032"
+    width, height = map(int, (await cleaned.ocr_image(jpeg.tobytes())).split("x"))
+    assert width * height < 3024 * 4032 / 5
@@ -0,0 +1,79 @@
+"""
+Tests for OCR of scanned pages and image uploads
+"""
+
+import pytest
+
+from agents.document_parser.ocr.engine import OCREngine, recognize
+from agents.document_parser.parsing.extraction import PDFExtractor
+from services.redis_cache import LRUCache, TwoTierCache
+from tests.fakes import FakeRedis, make_pdf, make_scan, read_scan_comment
+
+
+def make_engine(workers: int = 0, recognizer=read_scan_comment, **kwargs) -> OCREngine:
+    cache = TwoTierCache(LRUCache(max_entries=32), redis=FakeRedis(), name="test_ocr")
+    return OCREngine(workers=workers, cache=cache, recognizer=recognizer, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_scanned_pages_are_ocrd_in_page_order():
+    pdf = make_pdf(
+        [["1. Solve 2x = 10"], [], ["3. Expand 3(a + 1)"], []],
+        images={1: make_scan("2. Find y if y - 4 = 9"), 3: make_scan("4. Simplify 5b - 2b")}
+    )
+    extractor = PDFExtractor(workers=0, ocr=make_engine())
+
+    result = await extractor.extract(pdf)
+
+    assert result.ocr_pages == [2, 4]
+    positions = [result.text.index(q) for q in ("1. Solve", "2. Find y", "3. Expand", "4. Simplify")]
+    assert positions == sorted(positions)
+
+
+@pytest.mark.asyncio
+async def test_repeated_image_is_ocrd_once():
+    calls = []
+
+    def counting(data, engine, language, tesseract_cmd):
+        calls.append(1)
+        return read_scan_comment(data, engine, language, tesseract_cmd)
+
+    engine = make_engine(recognizer=counting)
+    scan = make_scan("1. Solve 7 + k = 15")
+
+    first = await engine.ocr_pages(make_pdf([[]], images={0: scan}), [1])
+    second = await engine.ocr_pages(make_pdf([[], []], images={1: scan}), [2])
+    photo = await engine.ocr_image(scan)
+
+    assert len(calls) == 1
+    assert first.texts == {1: "1. Solve 7 + k = 15"}
+    assert second.texts == {2: "1. Solve 7 + k = 15"}
+    assert second.cached_images == 1
+    assert photo == "1. Solve 7 + k = 15"
+
+
+@pytest.mark.asyncio
+async def test_pages_are_ocrd_across_a_process_pool():
+    pages = 6
+    pdf = make_pdf([[]] * pages, images={n: make_scan(f"{n + 1}. Question {n + 1}") for n in range(pages)})
+    engine = make_engine(workers=2)
+    try:
+        result = await engine.ocr_pages(pdf, list(range(1, pages + 1)), pages_per_shard=2)
+    finally:
+        engine.shutdown()
+
+    assert result.texts == {n: f"{n}. Question {n}" for n in range(1, pages + 1)}
+    assert result.failed_pages == []
+
+
+@pytest.mark.asyncio
+async def test_missing_ocr_backend_leaves_scans_blank():
+    engine = make_engine(recognizer=recognize, tesseract_cmd="/nonexistent/tesseract")
+    pdf = make_pdf([["1. Solve 2x = 10"], []], images={1: make_scan("2. Hidden")})
+
+    result = await PDFExtractor(workers=0, ocr=engine).extract(pdf)
+
+    assert not engine.available
+    assert result.ocr_pages == []
+    assert "2. Hidden" not in result.text
+    assert result.success
@@ -0,0 +1,89 @@
+"""
+Tests for page-parallel PDF text extraction
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agents.document_parser.parsing.extraction import PDFExtractor
+from tests.fakes import make_pdf
+
+
+def numbered_pages(count: int):
+    return [[f"{n + 1}. Solve question {n + 1} on page {n + 1}"] for n in range(count)]
+
+
+@pytest.fixture
+def extractor():
+    extractor = PDFExtractor(workers=2, pages_per_shard=3)
+    yield extractor
+    extractor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pages_are_reassembled_in_order(extractor):
+    result = await extractor.extract(make_pdf(numbered_pages(10)))
+
+    assert result.page_count == 10
+    assert result.failed_pages == []
+    positions = [result.text.index(f"--- Page {n} ---") for n in range(1, 11)]
+    assert positions == sorted(positions)
+    assert "7. Solve question 7 on page 7" in result.text
+
+
+@pytest.mark.asyncio
+async def test_page_failures_stay_isolated(extractor):
+    result = await extractor.extract(make_pdf(numbered_pages(6), broken_pages=(1, 4)))
+
+    assert result.failed_pages == [2, 5]
+    assert result.success
+    assert "--- Page 2 ---" not in result.text
+    assert "6. Solve question 6" in result.text
+
+
+@pytest.mark.asyncio
+async def test_unreadable_pdf_raises():
+    with pytest.raises(Exception):
+        await PDFExtractor(workers=0).extract(b"not a pdf")
+
+
+@pytest.mark.asyncio
+async def test_event_loop_keeps_serving_during_extraction(extractor):
+    pdf = make_pdf([["Find x if 2x + 3 = 11"] * 40] * 150)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    await extractor.extract(pdf)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert len(ticks) > 3
+    assert max(gaps) < 0.25
+
+
+def test_shards_cover_every_page_once():
+    extractor = PDFExtractor(workers=4, pages_per_shard=8)
+
+    assert extractor.shards(5) == [(0, 2), (2, 4), (4, 5)]
+    assert extractor.shards(100)[-1] == (96, 100)
+    assert sum(end - start for start, end in extractor.shards(100)) == 100
+
+
+@pytest.mark.asyncio
+async def test_progressive_extraction_yields_pages_in_order():
+    extractor = PDFExtractor(workers=0, pages_per_shard=4, first_shard_pages=1)
+
+    results = [result async for result in extractor.extract_progressive(make_pdf(numbered_pages(10)))]
+
+    assert [result.pages_processed for result in results] == [1, 5, 9, 10]
+    assert not results[0].complete and results[-1].complete
+    assert "1. Solve question 1" in results[0].text and "--- Page 2 ---" not in results[0].text
+    assert results[-1].text == (await extractor.extract(make_pdf(numbered_pages(10)))).text
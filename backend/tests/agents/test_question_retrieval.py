@@ -0,0 +1,138 @@
+"""
+Tests for question segmentation and per-turn BM25 retrieval
+"""
+
+from agents.document_parser.parsing.retrieval import BM25Index, QuestionIndex, get_question_index
+from agents.document_parser.parsing.segmentation import (
+    ProgressiveSegmenter, group_questions, navigate, segment_questions
+)
+
+WORKSHEET = """Year 7 Homework
+Answer all questions.
+--- Page 1 ---
+1. Find x if 2x + 3 = 11
+2) Simplify 3a + 2a
+--- Page 2 ---
+Q3 Find the area of a triangle with base 6 cm and height 4 cm
+Question 4: Expand 2(x + 1)
+5. A rectangle has perimeter 20 cm. Find its width if its length is 6 cm
+"""
+
+
+def question_texts(text: str) -> list:
+    return [span.text for span in group_questions(segment_questions(text))]
+
+
+def test_questions_keep_preamble_and_drop_page_markers():
+    segments = question_texts(WORKSHEET)
+
+    assert len(segments) == 5
+    assert segments[0].startswith("Year 7 Homework")
+    assert segments[2] == "Q3 Find the area of a triangle with base 6 cm and height 4 cm"
+    assert all("--- Page" not in s for s in segments)
+
+
+def test_unnumbered_text_falls_back_to_paragraph_chunks():
+    text = "\n\n".join(["Some notes about fractions. " * 10] * 6)
+
+    segments = question_texts(text)
+
+    assert 1 < len(segments) < 6
+    assert all(len(s) <= 1000 for s in segments)
+
+
+def test_segment_questions_returns_parts_pages_and_offsets():
+    text = WORKSHEET.replace("2) Simplify 3a + 2a\n", "2) Simplify\n(a) 3a + 2a\nb) 4b - b\n")
+
+    spans = segment_questions(text)
+
+    assert [span.label for span in spans] == ["1", "2", "2(a)", "2(b)", "3", "4", "5"]
+    assert [span.page for span in spans] == [1, 1, 1, 1, 2, 2, 2]
+    assert spans[4].text == text[spans[4].start:spans[4].end].strip()
+    assert spans[0].start > 0 and spans[0].text.startswith("Year 7 Homework")
+
+    grouped = group_questions(spans)
+    assert [span.number for span in grouped] == [1, 2, 3, 4, 5]
+    assert grouped[1].text == "2) Simplify\n(a) 3a + 2a\nb) 4b - b"
+    assert grouped[1].end == spans[3].end
+
+
+def test_progressive_segmentation_matches_one_pass_and_keeps_closed_questions():
+    text = WORKSHEET.replace("2) Simplify 3a + 2a\n", "2) Simplify\n(a) 3a + 2a\nb) 4b - b\n")
+    # Batches end between question 2's parts, after its last part, and part way through page 2
+    cuts = [text.index("b)"), text.index("--- Page 2"), text.index("Question 4"), len(text)]
+    segmenter = ProgressiveSegmenter()
+
+    results = [segmenter.feed(text[:cut]) for cut in cuts]
+
+    assert [kept for kept, _ in results] == [0, 1, 1, 2]
+    assert [span.number for span in results[2][1]] == [2, 3]
+    assert segmenter.questions == group_questions(segment_questions(text))
+
+
+def test_progressive_segmentation_redoes_unnumbered_pages_once_questions_start():
+    cover = "Fractions practice\n\n" + "Read each question carefully. " * 40 + "\n\n" + "Show working. " * 40
+    text = cover + "\n--- Page 2 ---\n1. Simplify 4/8\n2. Add 1/3 + 1/6\n"
+    segmenter = ProgressiveSegmenter()
+
+    segmenter.feed(cover)
+    kept, found = segmenter.feed(text)
+
+    assert kept == 0
+    assert found == group_questions(segment_questions(text))
+    assert found[0].text.startswith("Fractions practice")
+
+
+def test_navigate_follows_printed_numbers_and_clamps():
+    numbers = [3, 4, 5, 6]
+
+    assert navigate("can we do question 5 now?", 1, numbers) == 3
+    assert navigate("Q6", 1, numbers) == 4
+    assert navigate("ok, skip to problem #4", 1, numbers) == 2
+    assert navigate("next question please", 4, numbers) == 4
+    assert navigate("let's go back", 2, numbers) == 1
+    assert navigate("I think x = 4", 2, numbers) == 2
+    assert navigate("question 9", 2, numbers) == 2
+    assert navigate("next question", 1, []) == 1
+
+
+def test_navigate_ignores_answers_that_mention_numbers():
+    numbers = [1, 2, 3, 4]
+
+    assert navigate("I think the number 3 is prime", 1, numbers) == 1
+    assert navigate("my answer is #2", 1, numbers) == 1
+    assert navigate("x = 2, so q 4?", 1, numbers) == 1
+    assert navigate("the answer to question 3 is 12", 1, numbers) == 1
+    assert navigate("go back and check step 1", 2, numbers) == 2
+    assert navigate("then I move on to the next step", 2, numbers) == 2
+    assert navigate("the next one is 7", 2, numbers) == 2
+
+
+def test_bm25_ranks_matching_passage_first():
+    index = BM25Index(question_texts(WORKSHEET))
+
+    assert index.search("how do I find the area of the triangle")[0][0] == 2
+    assert index.search("the of and") == []
+
+
+def test_select_sends_current_neighbours_and_best_match():
+    segments = [f"{i}. Simplify expression number {i}" for i in range(1, 21)]
+    segments[16] = "17. Find the hypotenuse using Pythagoras"
+    index = QuestionIndex(segments)
+
+    selected = index.select(current_question=5, message="is this like the pythagoras one?", top_k=1)
+
+    assert selected == [3, 4, 5, 16]
+    passages = index.passages_for(5, "pythagoras", top_k=1)
+    assert "[Question 17]" in passages
+    assert "Question 10" not in passages
+
+
+def test_cached_index_is_rebuilt_when_a_question_grows_in_place():
+    first = get_question_index("growing-doc", ["1. Find x", "2. Simplify"])
+    same = get_question_index("growing-doc", ["1. Find x", "2. Simplify"])
+    grown = get_question_index("growing-doc", ["1. Find x", "2. Simplify the area of the triangle"])
+
+    assert same is first
+    assert grown is not first
+    assert grown.bm25.search("area of the triangle")[0][0] == 1
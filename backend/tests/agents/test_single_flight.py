@@ -0,0 +1,107 @@
+"""
+Tests for single-flight coalescing of identical concurrent requests
+"""
+
+import asyncio
+
+import pytest
+
+from agents.assessment.single_flight import SingleFlight
+from core.metrics import metrics
+from tests.fakes import make_agent
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_upstream_call():
+    flight = SingleFlight("test_flight")
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "welcome"
+
+    metrics.reset()
+    results = await asyncio.gather(*[flight.do("worksheet", upstream) for _ in range(30)])
+
+    assert results == ["welcome"] * 30
+    assert calls == 1
+    assert metrics.counter("test_flight.coalesced") == 29
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_upstream_errors_fan_out_to_every_waiter():
+    flight = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.01)
+        raise ValueError("filtered")
+
+    results = await asyncio.gather(*[flight.do("k", upstream) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_leaves_others_running():
+    flight = SingleFlight()
+    finished = asyncio.Event()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        finished.set()
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", upstream))
+    second = asyncio.create_task(flight.do("k", upstream))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "done"
+    assert finished.is_set()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_cancelling_every_waiter_cancels_upstream():
+    flight = SingleFlight()
+    upstream_cancelled = asyncio.Event()
+
+    async def upstream():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            upstream_cancelled.set()
+            raise
+
+    waiters = [asyncio.create_task(flight.do("k", upstream)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert upstream_cancelled.is_set()
+    assert flight.in_flight == 0
+
+    # A fresh caller starts a new upstream call rather than joining the cancelled one
+    async def fresh():
+        return "again"
+
+    assert await flight.do("k", fresh) == "again"
+
+
+@pytest.mark.asyncio
+async def test_agent_coalesces_identical_welcome_generations():
+    agent = make_agent(delay=0.05)
+    agent.response_cache = None
+
+    results = await asyncio.gather(*[
+        agent.respond("Document: worksheet.pdf\n\nExtracted Text:\n1. Find x if 2x = 8") for _ in range(20)
+    ])
+
+    assert agent.model.calls == 1
+    assert len({r["message"] for r in results}) == 1
@@ -0,0 +1,38 @@
+"""
+Tests for local question topic classification
+"""
+
+import json
+from pathlib import Path
+
+from agents.document_parser.classification.topics import GENERAL, classify_questions, tag_questions
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "labelled_questions.json"
+
+
+def test_accuracy_on_labelled_questions():
+    labelled = json.loads(FIXTURE.read_text())
+
+    tags = classify_questions([item["text"] for item in labelled])
+
+    correct = sum(tag.topic == item["topic"] for tag, item in zip(tags, labelled))
+    assert correct / len(labelled) >= 0.9
+
+
+def test_text_without_maths_is_general():
+    tags = classify_questions(["Name:  Class:  Date:", "Write your name at the top"])
+
+    assert [tag.topic for tag in tags] == [GENERAL, GENERAL]
+    assert tags[0].label == "General"
+
+
+def test_tag_questions_adds_topics_in_order():
+    questions = [
+        {"number": 1, "text": "1. Solve 4x - 1 = 11"},
+        {"number": 2, "text": "2. Find the perimeter of a square with sides of 9 cm"},
+        {"number": 3, "text": "3. Write 0.45 as a fraction in simplest form"},
+    ]
+
+    tag_questions(questions)
+
+    assert [question["topic"] for question in questions] == ["algebra", "geometry", "fractions"]
@@ -0,0 +1,129 @@
+"""
+Tests for the chat and PDF chat routes' use of the tutor agent
+"""
+
+import tempfile
+
+import pytest
+
+from agents.assessment.gemini_agent import tutor_agent
+from api.routes import chat, pdf_chat
+from services.redis_cache import DocumentStore, LRUCache
+from services.sessions import MemorySessionBackend
+from tests.fakes import FakeRedis
+
+
+@pytest.fixture
+def recorded_calls(monkeypatch):
+    """Replace the agent call with a recorder and forbid temp files"""
+    calls = []
+
+    async def fake_respond(content, context=None, **kwargs):
+        calls.append((content, context, kwargs))
+        return {"message": "What do you think the first step is?"}
+
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("chat hot path must not touch the filesystem")
+
+    monkeypatch.setattr(tutor_agent, "respond", fake_respond)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_temp_files)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_send_message_passes_content_in_memory(recorded_calls):
+    first = await chat.send_message(chat.ChatRequest(message="What is 15 + 27?"))
+
+    assert first.message.content == "What do you think the first step is?"
+    assert "New Problem: What is 15 + 27?" in recorded_calls[0][0]
+    assert recorded_calls[0][1] == {"is_initial": True}
+
+
+@pytest.mark.asyncio
+async def test_pdf_chat_send_passes_document_in_memory(recorded_calls, monkeypatch):
+    session = pdf_chat.PDFChatSession(session_id="s1", document_id="d1", document_name="worksheet.pdf")
+    store = DocumentStore(local=LRUCache(max_entries=4), redis=FakeRedis())
+    await store.set("d1", {"text": "1. Find x if 2x + 3 = 11", "page_count": 1, "questions_found": 1})
+    monkeypatch.setattr(pdf_chat, "document_store", store)
+
+    async def load_session(session_id=None):
+        return session
+
+    monkeypatch.setattr(pdf_chat, "get_or_create_pdf_session", load_session)
+
+    response = await pdf_chat.send_pdf_chat_message(
+        pdf_chat.PDFChatRequest(message="Is x = 4?", session_id="s1")
+    )
+
+    content, context, kwargs = recorded_calls[0]
+    assert "[Question 1]\n1. Find x if 2x + 3 = 11" in content
+    assert kwargs == {"document_id": "d1", "document_text": "1. Find x if 2x + 3 = 11"}
+    assert "Student Response: Is x = 4?" in content
+    assert context["document_name"] == "worksheet.pdf"
+    assert context["question_topic"] == "algebra"
+    assert "Topic: Basic Algebra" in content
+    assert response.message.content == "What do you think the first step is?"
+
+
+@pytest.mark.asyncio
+async def test_continuation_turns_carry_recent_dialogue(recorded_calls, monkeypatch):
+    session = chat.ChatSession(session_id="s2")
+
+    async def load_session(session_id=None):
+        return session
+
+    async def no_save(session):
+        pass
+
+    monkeypatch.setattr(chat, "get_or_create_session", load_session)
+    monkeypatch.setattr(chat, "save_session", no_save)
+
+    await chat.send_message(chat.ChatRequest(message="Solve 2x + 3 = 11", session_id="s2"))
+    response = await chat.send_message(chat.ChatRequest(message="Subtract 3 first?", session_id="s2"))
+
+    content = recorded_calls[-1][0]
+    assert "Student: Solve 2x + 3 = 11" in content
+    assert "Tutor: What do you think the first step is?" in content
+    assert content.endswith("Student Response: Subtract 3 first?")
+    assert response.message.metadata["context_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_turns_append_messages_and_history_reads_ranges(recorded_calls, monkeypatch):
+    store = MemorySessionBackend()
+    monkeypatch.setattr(chat, "session_log", chat.SessionLog(prefix="chat_session:", store=store))
+    session_id = (await chat.send_message(chat.ChatRequest(message="Solve 2x + 3 = 11"))).session_id
+
+    for turn in range(10):
+        await chat.send_message(chat.ChatRequest(message=f"Is it {turn}?", session_id=session_id))
+
+    assert await store.list_length(f"chat_session:{session_id}:messages") == 22
+    assert "messages" not in await store.get(f"chat_session:{session_id}")
+    # Turns only load what the rolling summary has not folded in yet
+    session = await chat.get_or_create_session(session_id)
+    assert session.summary_upto > 0 and session.message_offset == session.summary_upto
+    assert len(session.messages) == 22 - session.summary_upto
+    assert session.current_problem == "Solve 2x + 3 = 11"
+
+    history = await chat.get_chat_history(session_id, offset=2, limit=3)
+    assert history["total_messages"] == 22
+    assert [message["content"] for message in history["messages"]] == [
+        "Is it 0?", "What do you think the first step is?", "Is it 1?"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_session_saved_as_one_blob_moves_into_the_log():
+    store = MemorySessionBackend()
+    log = chat.SessionLog(prefix="chat_session:", store=store)
+    await store.set("chat_session:old", {
+        "session_id": "old",
+        "messages": [{"role": "user", "content": "What is 3 + 4?"}],
+        "summary_upto": 0,
+    })
+
+    fields, messages = await log.load("old")
+
+    assert "messages" not in fields and "messages" not in await store.get("chat_session:old")
+    assert [message["content"] for message in messages] == ["What is 3 + 4?"]
+    assert await log.count("old") == 1
@@ -0,0 +1,156 @@
+"""
+Tests for PDF chat sessions that start before the whole document is read
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agents.assessment.gemini_agent import tutor_agent
+from agents.document_parser.parsing.extraction import PDFExtractor
+from api.routes import pdf_chat
+from core.config import settings
+from services.redis_cache import DocumentArtifactCache, DocumentStore, LRUCache
+from services.sessions import MemorySessionBackend, SessionLog
+from tests.fakes import FakeRedis, make_pdf
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    prompts = []
+
+    async def fake_respond(content, context=None, **kwargs):
+        prompts.append(content)
+        return {"message": "Welcome! Shall we start with Question 1?"}
+
+    cache = DocumentArtifactCache(local=LRUCache(max_entries=8), redis=FakeRedis())
+    monkeypatch.setattr(pdf_chat, "artifact_cache", cache)
+    monkeypatch.setattr(pdf_chat, "pdf_session_log", SessionLog(prefix="pdf_chat_session:", store=MemorySessionBackend()))
+    monkeypatch.setattr(pdf_chat, "document_store", DocumentStore(local=LRUCache(max_entries=8), redis=FakeRedis()))
+    monkeypatch.setattr(pdf_chat, "pdf_extractor", PDFExtractor(workers=0, pages_per_shard=3, first_shard_pages=2))
+    monkeypatch.setattr(tutor_agent, "respond", fake_respond)
+
+    app = FastAPI()
+    app.include_router(pdf_chat.router, prefix="/api/v1/pdf-chat")
+    test_client = TestClient(app)
+    test_client.prompts = prompts
+    test_client.cache = cache
+    return test_client
+
+
+def test_session_starts_after_first_pages_and_catches_up(client):
+    pdf = make_pdf([[f"{n}. Solve {n}x = {n * 3}"] for n in range(1, 13)])
+
+    response = client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")}).json()
+
+    assert (response["processing_status"], response["pages_processed"], response["page_count"]) == ("processing", 2, 12)
+    assert response["questions_extracted"] == 2
+    assert "Pages read so far: 2 of 12" in client.prompts[0]
+
+    # The test client returns once background tasks finish, so the rest is read by now
+    history = client.get(f"/api/v1/pdf-chat/session/{response['session_id']}/history").json()
+    assert (history["processing_status"], history["pages_processed"]) == ("completed", 12)
+    assert history["questions_extracted"] == 12
+
+    reply = client.post("/api/v1/pdf-chat/send", json={"session_id": response["session_id"], "message": "question 11 please"}).json()
+    assert reply["document_context"]["current_question"] == 11
+    assert reply["message"]["page_reference"] == 11
+
+
+def test_repeat_upload_reuses_the_fully_read_document(client):
+    pdf = make_pdf([[f"{n}. Expand {n}(x + 1)"] for n in range(1, 7)])
+
+    client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")})
+    again = client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")}).json()
+
+    assert (again["processing_status"], again["questions_extracted"], again["pages_processed"]) == ("completed", 6, 6)
+    assert len(client.prompts) == 1
+
+
+def test_sessions_share_one_stored_copy_of_the_document(client, monkeypatch):
+    pdf = make_pdf([["1. Find x if 2x + 3 = 11", "2. Simplify 3a + 2a"]])
+    saved = []
+
+    async def record_save(session):
+        saved.append(session.model_dump_json())
+
+    monkeypatch.setattr(pdf_chat, "save_pdf_session", record_save)
+
+    first = client.post("/api/v1/pdf-chat/upload", files={"file": ("a.pdf", pdf, "application/pdf")}).json()
+    second = client.post("/api/v1/pdf-chat/upload", files={"file": ("b.pdf", pdf, "application/pdf")}).json()
+
+    assert first["document_id"] == second["document_id"]
+    assert first["session_id"] != second["session_id"]
+    assert all("Simplify 3a + 2a" not in blob for blob in saved)
+
+
+def test_upload_while_another_reads_follows_its_progress(client):
+    pdf = make_pdf([[f"{n}. Solve {n}x = {n * 3}"] for n in range(1, 13)])
+    store = pdf_chat.document_store
+    first = client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")}).json()
+    partial = {"text": "1. Solve x = 3", "page_count": 12, "pages_processed": 4, "questions_found": 4, "success": True, "complete": False}
+    # Reset to a read in progress in another worker
+    store.local.clear()
+    store.redis.store[f"document:{first['document_id']}"] = partial
+    assert asyncio.run(store.claim_reader(first["document_id"]))
+
+    again = client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")}).json()
+
+    assert (again["processing_status"], again["pages_processed"]) == ("processing", 4)
+    assert asyncio.run(store.get(first["document_id"])) == partial
+    # A reader that fell behind cannot undo that progress
+    asyncio.run(store.set(first["document_id"], {**partial, "pages_processed": 2}))
+    assert asyncio.run(store.get(first["document_id"]))["pages_processed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_reading_that_stops_saves_the_pages_read_as_failed(monkeypatch):
+    store = DocumentStore(local=LRUCache(max_entries=8), redis=FakeRedis())
+    monkeypatch.setattr(pdf_chat, "document_store", store)
+    partial = {"text": "1. Solve x = 3", "page_count": 6, "pages_processed": 2, "failed_pages": [], "questions_found": 1, "success": True, "complete": False}
+
+    async def pages():
+        yield partial
+        raise ConnectionError("Redis went away")
+
+    await store.claim_reader("d1")
+    await pdf_chat.finish_pdf_processing(pages(), "d1", {}, None)
+
+    document = await store.get("d1")
+    assert pdf_chat.processing_status(document) == "failed"
+    assert document["failed_pages"] == [3, 4, 5, 6] and document["text"] == "1. Solve x = 3"
+    assert await store.claim_reader("d1")
+
+
+def test_upload_reads_the_file_itself_when_another_reader_stalls(client, monkeypatch):
+    pdf = make_pdf([[f"{n}. Solve {n}x = {n * 3}"] for n in range(1, 5)])
+    monkeypatch.setattr(pdf_chat, "READER_WAIT_TIMEOUT", 0.05)
+    monkeypatch.setattr(pdf_chat, "READER_POLL_INTERVAL", 0.01)
+    store = pdf_chat.document_store
+    document_id = hashlib.sha256(pdf).hexdigest()
+    assert asyncio.run(store.claim_reader(document_id))
+
+    response = client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")}).json()
+
+    assert (response["document_id"], response["questions_extracted"]) == (document_id, 2)
+    assert asyncio.run(store.get(document_id))["complete"]
+    # The stalled upload's lease is left for it to release or expire
+    assert not asyncio.run(store.claim_reader(document_id))
+
+
+def test_failed_upload_releases_the_reader_lease(client, monkeypatch):
+    pdf = make_pdf([[f"{n}. Solve {n}x = {n * 3}"] for n in range(1, 13)])
+
+    async def broken_welcome(filename, document):
+        raise RuntimeError("welcome failed")
+
+    monkeypatch.setattr(pdf_chat, "generate_welcome_message", broken_welcome)
+
+    response = client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")})
+
+    assert response.status_code == 500
+    assert asyncio.run(pdf_chat.document_store.claim_reader(hashlib.sha256(pdf).hexdigest()))
@@ -0,0 +1,62 @@
+"""
+Tests for the Redis round trips made by the session and agents routes
+"""
+
+import pytest
+
+from api.routes import agents, session
+from services.sessions import RedisSessionBackend, session_store
+from tests.fakes import FakeRedis
+
+
+class RecordingRedis(FakeRedis):
+    """FakeRedis that records which helper each round trip went through"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def __getattribute__(self, name):
+        attribute = super().__getattribute__(name)
+        if callable(attribute) and not name.startswith("_"):
+            super().__getattribute__("calls").append(name)
+        return attribute
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = RecordingRedis()
+    monkeypatch.setattr(session_store, "backend", RedisSessionBackend(redis))
+    redis.store["session:s1"] = {
+        "session_id": "s1",
+        "upload_id": "u1",
+        "student_name": None,
+        "status": "active",
+        "questions_total": 2,
+        "questions_completed": 0,
+        "current_question_index": 0,
+        "created_at": "2026-01-05T09:00:00",
+        "updated_at": "2026-01-05T09:00:00",
+        "questions": [{"number": 1, "text": "Solve 3x + 5 = 20", "topic": "algebra", "page": 1}],
+        "progress": {"skill_level": "unknown", "confidence": "neutral", "performance": []},
+    }
+    redis.calls.clear()
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_reads_extend_the_session_in_the_same_round_trip(redis):
+    info = await session.get_session_info("s1")
+    question = await session.get_current_question("s1")
+
+    assert info.status == "active"
+    assert question["question"]["text"] == "Solve 3x + 5 = 20"
+    assert redis.calls == ["get_json_and_touch", "get_json_and_touch"]
+
+
+@pytest.mark.asyncio
+async def test_tutor_respond_saves_without_a_separate_expire(redis):
+    await agents.tutor_respond(agents.StudentResponse(session_id="s1", response_text="x = 5"))
+
+    assert redis.calls == ["get_json", "set_json"]
+    assert redis.store["session:s1"]["progress"]["performance"][0]["student_response"] == "x = 5"
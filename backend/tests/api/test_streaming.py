@@ -0,0 +1,103 @@
+"""
+Tests for server-sent event streaming of tutor replies
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agents.assessment.gemini_agent import GeminiTutorAgent, tutor_agent
+from api.routes import chat, pdf_chat
+from core.metrics import metrics
+from tests.fakes import use_model
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    saved = []
+
+    async def fake_stream(content, context=None, **kwargs):
+        for part in ["Great ", "start! ", "What comes next?"]:
+            await asyncio.sleep(0)
+            yield part
+
+    async def record_save(session):
+        saved.append(session)
+
+    monkeypatch.setattr(tutor_agent, "respond_stream", fake_stream)
+    monkeypatch.setattr(chat, "save_session", record_save)
+    monkeypatch.setattr(pdf_chat, "save_pdf_session", record_save)
+
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/api/v1/chat")
+    app.include_router(pdf_chat.router, prefix="/api/v1/pdf-chat")
+    test_client = TestClient(app)
+    test_client.saved = saved
+    return test_client
+
+
+def test_chat_stream_emits_tokens_then_persists_message(client):
+    metrics.reset()
+
+    response = client.post("/api/v1/chat/send/stream", json={"message": "What is 15 + 27?"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["token", "token", "token", "done"]
+    done = events[-1][1]
+    assert done["message"]["content"] == "Great start! What comes next?"
+    assert done["metrics"]["time_to_first_token_ms"] <= done["metrics"]["total_ms"]
+    assert client.saved[-1].messages[-1].content == "Great start! What comes next?"
+    assert metrics.latency("chat.time_to_first_token_ms")["count"] == 1
+
+
+def test_pdf_chat_stream_requires_document(client):
+    response = client.post("/api/v1/pdf-chat/send/stream", json={"message": "Is x = 4?"})
+
+    assert response.status_code == 400
+
+
+class StreamingModel:
+    """Stand-in for GenerativeModel that streams fixed chunks"""
+
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    async def generate_content_async(self, prompt, stream=False):
+        async def iterate():
+            for i, text in enumerate(self.chunks):
+                if self.fail_after is not None and i >= self.fail_after:
+                    raise RuntimeError("upstream reset")
+                yield SimpleNamespace(text=text)
+        return iterate()
+
+
+async def collect(agent, content):
+    return [part async for part in agent.respond_stream(content)]
+
+
+@pytest.mark.asyncio
+async def test_respond_stream_yields_model_chunks():
+    agent = use_model(GeminiTutorAgent(), StreamingModel(["Let's ", "look at ", "the ones digit."]))
+
+    assert await collect(agent, "What is 15 + 27?") == ["Let's ", "look at ", "the ones digit."]
+
+
+@pytest.mark.asyncio
+async def test_respond_stream_falls_back_when_nothing_produced():
+    agent = use_model(GeminiTutorAgent(), StreamingModel(["never sent"], fail_after=0))
+
+    assert await collect(agent, "What is 15 + 27?") == [agent._get_fallback_tutoring_response()["message"]]
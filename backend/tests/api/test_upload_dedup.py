@@ -0,0 +1,119 @@
+"""
+Tests for content-addressed reuse of upload artifacts
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agents.assessment.gemini_agent import tutor_agent
+from api.routes import pdf_chat, upload
+from core.config import settings
+from core.metrics import metrics
+from services.jobs import JobQueue, JobWorker, uploads as upload_jobs
+from services.redis_cache import DocumentArtifactCache, DocumentStore, LRUCache
+from tests.fakes import FakeRedis, make_pdf
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    calls = {"extract": 0, "respond": 0}
+    cache = DocumentArtifactCache(local=LRUCache(max_entries=8), redis=FakeRedis())
+    real_read = pdf_chat.read_pdf_progressively
+
+    def counting_read(source, filename):
+        calls["extract"] += 1
+        return real_read(source, filename)
+
+    async def fake_respond(content, context=None, **kwargs):
+        calls["respond"] += 1
+        return {"message": "Welcome! Shall we start with Question 1?"}
+
+    async def no_save(session):
+        pass
+
+    monkeypatch.setattr(pdf_chat, "artifact_cache", cache)
+    monkeypatch.setattr(upload_jobs, "artifact_cache", cache)
+    documents = DocumentStore(local=LRUCache(max_entries=8), redis=FakeRedis())
+    monkeypatch.setattr(pdf_chat, "document_store", documents)
+    monkeypatch.setattr(upload_jobs, "document_store", documents)
+    queue = JobQueue("uploads", redis=FakeRedis())
+    monkeypatch.setattr(upload, "upload_queue", queue)
+    monkeypatch.setattr(pdf_chat, "read_pdf_progressively", counting_read)
+    monkeypatch.setattr(pdf_chat, "save_pdf_session", no_save)
+    monkeypatch.setattr(tutor_agent, "respond", fake_respond)
+
+    app = FastAPI()
+    app.include_router(pdf_chat.router, prefix="/api/v1/pdf-chat")
+    app.include_router(upload.router, prefix="/api/v1/upload")
+    test_client = TestClient(app)
+    test_client.calls = calls
+    test_client.cache = cache
+    test_client.worker = JobWorker(queue, {upload_jobs.PROCESS_UPLOAD: upload_jobs.process_upload})
+    return test_client
+
+
+def run_jobs(client):
+    """Drain the upload queue the way a worker process would"""
+    async def drain():
+        while (job := await client.worker.queue.claim(timeout=0)) is not None:
+            await client.worker.process(job)
+
+    asyncio.run(drain())
+
+
+def test_repeat_pdf_upload_reuses_extraction_and_welcome(client):
+    pdf = make_pdf([["1. Find x if 2x + 3 = 11", "2. Simplify 3a + 2a"]])
+    metrics.reset()
+
+    first = client.post("/api/v1/pdf-chat/upload", files={"file": ("ws.pdf", pdf, "application/pdf")})
+    second = client.post("/api/v1/pdf-chat/upload", files={"file": ("copy.pdf", pdf, "application/pdf")})
+
+    assert first.status_code == second.status_code == 200
+    assert client.calls == {"extract": 1, "respond": 1}
+    assert first.json()["session_id"] != second.json()["session_id"]
+    assert second.json()["questions_extracted"] == first.json()["questions_extracted"]
+    assert second.json()["file_size"] == len(pdf)
+    assert client.cache.stats()["hit_rate"] == 0.5
+
+
+def test_different_bytes_are_processed_separately(client):
+    client.post("/api/v1/pdf-chat/upload", files={"file": ("a.pdf", make_pdf([["1. Solve 5y = 20"]]), "application/pdf")})
+    client.post("/api/v1/pdf-chat/upload", files={"file": ("a.pdf", make_pdf([["1. Solve 6y = 24"]]), "application/pdf")})
+
+    assert client.calls["extract"] == 2
+
+
+def test_repeat_document_upload_skips_tutor_agent(client):
+    first = client.post("/api/v1/upload/document", files={"file": ("ws.png", b"\x89PNG worksheet", "image/png")})
+    run_jobs(client)
+    second = client.post("/api/v1/upload/document", files={"file": ("ws.png", b"\x89PNG worksheet", "image/png")})
+    run_jobs(client)
+
+    assert client.calls["respond"] == 1
+    assert first.json()["content_hash"] == second.json()["content_hash"]
+    status = client.get(f"/api/v1/upload/status/{second.json()['upload_id']}").json()
+    assert status["status"] == "completed"
+
+
+def test_document_upload_is_queued_and_status_tracks_the_job(client):
+    pdf = make_pdf([["1. Find x if 2x + 3 = 11", "2. Simplify 3a + 2a"], ["3. Expand 2(x + 4)"]])
+
+    response = client.post("/api/v1/upload/document", files={"file": ("ws.pdf", pdf, "application/pdf")})
+    upload_id = response.json()["upload_id"]
+
+    assert response.json()["status"] == "queued"
+    assert client.calls["respond"] == 0
+    queued = client.get(f"/api/v1/upload/status/{upload_id}").json()
+    assert (queued["status"], queued["progress"]) == ("queued", 0)
+
+    run_jobs(client)
+    done = client.get(f"/api/v1/upload/status/{upload_id}").json()
+    assert (done["status"], done["stage"], done["progress"]) == ("completed", "completed", 100)
+    assert done["questions_found"] == 3
+    assert done["page_count"] == 2
+    assert done["processing_completed_at"] is not None
+    assert client.get("/api/v1/upload/status/not-an-upload").status_code == 404
@@ -0,0 +1,15 @@
+"""
+Shared pytest configuration for the TutorAgent backend test suite
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# The tutor agent is created at import time and refuses to start without a
+# key; tests never reach the real API, so any placeholder will do
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
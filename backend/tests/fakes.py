@@ -0,0 +1,258 @@
+"""
+Offline stand-ins shared across the test suite
+"""
+
+import asyncio
+import io
+import time
+from types import SimpleNamespace
+
+from agents.assessment.gemini_agent import GeminiTutorAgent
+from services.llm import GeminiProvider, LLMService
+
+
+class SlowModel:
+    """Stand-in for GenerativeModel whose calls take a fixed amount of time"""
+
+    def __init__(self, delay: float, text: str = '{"message": "What do you think the first step is?"}'):
+        self.delay = delay
+        self.text = text
+        self.calls = 0
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _response(self):
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(finish_reason="STOP")],
+            text=self.text
+        )
+
+    def generate_content(self, prompt, **kwargs):
+        # Blocking path: would freeze the loop if the agent ever used it
+        time.sleep(self.delay)
+        return self._response()
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._response()
+        finally:
+            self.in_flight -= 1
+
+
+def use_model(agent: GeminiTutorAgent, model, max_concurrency: int = 8, timeout: float = 5.0) -> GeminiTutorAgent:
+    """Point an agent's Gemini provider at a stand-in model, with no other providers"""
+    agent.model = model
+    agent.llm = LLMService(
+        [GeminiProvider(model)],
+        timeout=timeout,
+        max_concurrency=max_concurrency,
+        hedge_enabled=False
+    )
+    return agent
+
+
+def make_agent(delay: float = 0, max_concurrency: int = 8, timeout: float = 5.0) -> GeminiTutorAgent:
+    """Create a tutor agent wired to a SlowModel instead of Gemini"""
+    return use_model(GeminiTutorAgent(), SlowModel(delay), max_concurrency, timeout)
+
+
+class FakeClock:
+    """Manually advanced replacement for time.monotonic"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Minimal stand-in for RedisClient's JSON, hash and list helpers"""
+
+    available = True
+
+    def __init__(self):
+        self.store = {}
+        self.published = []
+
+    async def set(self, key, value, expire=None, only_if_absent=False):
+        if only_if_absent and key in self.store:
+            return False
+        self.store[key] = value
+        return True
+
+    async def exists(self, key):
+        return key in self.store
+
+    async def expire(self, key, seconds):
+        return key in self.store
+
+    async def get_json(self, key):
+        return self.store.get(key)
+
+    async def set_json(self, key, value, expire=None):
+        self.store[key] = value
+        return True
+
+    async def get_json_and_touch(self, key, expire):
+        return self.store.get(key)
+
+    async def get_json_and_length(self, key, list_key):
+        return self.store.get(key), len(self.store.get(list_key, []))
+
+    async def set_json_and_append(self, key, value, list_key, items, expire=None, publish=None):
+        self.store[key] = value
+        self.store.setdefault(list_key, []).extend(items)
+        if publish:
+            await self.publish(*publish)
+        return len(self.store[list_key])
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    async def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys) > 0
+
+    async def hash_set_many(self, key, mapping, expire=None):
+        self.store.setdefault(key, {}).update(mapping)
+        return True
+
+    async def hash_get_all(self, key):
+        return dict(self.store.get(key, {}))
+
+    async def list_push(self, key, value):
+        items = self.store.setdefault(key, [])
+        items.insert(0, value)
+        return len(items)
+
+    async def list_move(self, source, destination, timeout):
+        items = self.store.get(source)
+        if not items:
+            return None
+        value = items.pop()
+        self.store.setdefault(destination, []).insert(0, value)
+        return value
+
+    async def list_remove(self, key, value):
+        items = self.store.get(key, [])
+        removed = items.count(value)
+        self.store[key] = [item for item in items if item != value]
+        return removed
+
+    async def list_range(self, key, start=0, end=-1):
+        items = self.store.get(key, [])
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    async def list_range_json(self, key, start=0, end=-1):
+        return await self.list_range(key, start, end)
+
+    async def list_length(self, key):
+        return len(self.store.get(key, []))
+
+
+def make_pdf(pages, broken_pages=(), images=None) -> bytes:
+    """
+    Build a small text PDF in memory, one list of lines per page.
+    Pages listed in broken_pages get a content stream PyPDF2 cannot decode.
+    images maps a page index to JPEG bytes drawn over the whole page, so a
+    page with an image and no lines looks like a scan.
+    """
+    images = images or {}
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for number, lines in enumerate(pages):
+        xobjects = b""
+        if number in images:
+            jpeg = images[number]
+            width, height = jpeg_size(jpeg)
+            objects.append(
+                b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+                b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n" % (width, height, len(jpeg))
+                + jpeg + b"\nendstream"
+            )
+            xobjects = b" /XObject << /Im1 %d 0 R >>" % len(objects)
+        if number in broken_pages:
+            stream = b"<< /Length 16 /Filter /Bogus >>\nstream\nnot-a-real-data!\nendstream"
+        else:
+            escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+            body = "BT /F1 12 Tf 14 TL 72 720 Td " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET"
+            if number in images:
+                body = "q 612 0 0 792 0 0 cm /Im1 Do Q " + body
+            data = body.encode("latin-1")
+            stream = b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+        objects.append(stream)
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >>%s >> /Contents %d 0 R >>" % (xobjects, content_ref)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(kids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_scan(text: str, size=(400, 120)) -> bytes:
+    """
+    Render a line of text to a grayscale JPEG, like a scanned worksheet line.
+    The text is also stored as the JPEG comment, for read_scan_comment.
+    """
+    from PIL import Image, ImageDraw
+
+    image = Image.new("L", size, color=255)
+    ImageDraw.Draw(image).text((10, size[1] // 2 - 6), text, fill=0)
+    out = io.BytesIO()
+    image.save(out, format="JPEG", comment=text.encode("utf-8"))
+    return out.getvalue()
+
+
+def read_scan_comment(data: bytes, engine: str, language: str, tesseract_cmd: str) -> str:
+    """Stand-in OCR recognizer that reads back the text make_scan embedded"""
+    from PIL import Image
+
+    return Image.open(io.BytesIO(data)).info["comment"].decode("utf-8")
+
+
+def jpeg_size(jpeg: bytes):
+    from PIL import Image
+
+    return Image.open(io.BytesIO(jpeg)).size
+
+
+def make_photo(lines, angle: float = 0.0, size=(3024, 4032), shadow: float = 0.45) -> "np.ndarray":
+    """
+    Render worksheet lines like a phone photo: full camera resolution,
+    rotated by angle degrees, lit unevenly and with sensor noise.
+    """
+    import cv2
+    import numpy as np
+
+    width, height = size
+    image = np.full((height, width), 255, np.uint8)
+    for number, line in enumerate(lines):
+        cv2.putText(image, line, (width // 12, height // 10 + number * 130), cv2.FONT_HERSHEY_SIMPLEX, 2.2, 0, 5)
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    image = cv2.warpAffine(image, rotation, (width, height), borderValue=255)
+    light = np.linspace(shadow, 1.0, width, dtype=np.float32)[None, :] * np.linspace(0.7, 1.0, height, dtype=np.float32)[:, None]
+    noise = np.random.default_rng(7).normal(0, 6, (height, width))
+    return (image * light + noise).clip(0, 255).astype(np.uint8)
@@ -0,0 +1,67 @@
+"""
+Tests for the versioned Redis value codec
+"""
+
+import json
+
+import pytest
+
+from services import codec as codec_module
+from services.codec import MAGIC, ValueCodec
+
+SESSION = {
+    "session_id": "s1",
+    "status": "active",
+    "messages": [
+        {"role": "user", "content": f"Is the answer {n}?", "timestamp": "2026-01-05T09:00:00"}
+        for n in range(40)
+    ],
+    "note": "½ + ¼ = ¾",
+}
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson"])
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+def test_values_round_trip_and_large_ones_shrink(serializer, compression):
+    codec = ValueCodec(serializer=serializer, compression=compression, compress_min_bytes=256)
+
+    small = codec.encode({"welcome": "Hi!"})
+    large = codec.encode(SESSION)
+
+    assert small[0] == MAGIC and small[3] == 0  # Below the threshold: not compressed
+    assert codec.decode(small) == {"welcome": "Hi!"}
+    assert codec.decode(large) == SESSION
+    if compression != "none":
+        assert len(large) < len(json.dumps(SESSION)) / 3
+
+
+def test_plain_json_from_before_the_codec_still_loads():
+    codec = ValueCodec()
+    legacy = json.dumps(SESSION)
+
+    assert codec.decode(legacy) == SESSION
+    assert codec.decode(legacy.encode("utf-8")) == SESSION
+
+
+def test_values_decode_whatever_codec_wrote_them():
+    written = ValueCodec(serializer="json", compression="zlib", compress_min_bytes=0).encode(SESSION)
+
+    assert ValueCodec(serializer="orjson", compression="none").decode(written) == SESSION
+
+
+def test_missing_optional_packages_fall_back_to_stdlib(monkeypatch):
+    monkeypatch.setattr(codec_module, "orjson", None)
+    monkeypatch.setattr(codec_module, "zstandard", None)
+
+    codec = ValueCodec(serializer="orjson", compression="zstd", compress_min_bytes=0)
+
+    assert (codec.serializer, codec.compression) == ("json", "zlib")
+    assert codec.decode(codec.encode(SESSION)) == SESSION
+
+
+def test_unknown_format_version_is_rejected():
+    data = bytearray(ValueCodec().encode(SESSION))
+    data[1] = 99
+
+    with pytest.raises(ValueError):
+        ValueCodec().decode(bytes(data))
@@ -0,0 +1,99 @@
+"""
+Tests for the background job queue and workers
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services.jobs import JobQueue, JobWorker
+from tests.fakes import FakeRedis
+
+
+def redis_queue(**kwargs) -> JobQueue:
+    return JobQueue("test", redis=FakeRedis(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_stages_and_result():
+    queue = JobQueue("test", redis=SimpleNamespace(available=False))
+    stages = []
+
+    async def handler(job, report):
+        await report("extracting", 10, "Extracting text")
+        stages.append((await queue.status(job.id))["stage"])
+        return {"questions_found": job.payload["questions"]}
+
+    worker = JobWorker(queue, {"count": handler}, poll_timeout=0.05)
+    worker.start()
+    job = await queue.enqueue("count", {"questions": 4})
+    assert (await queue.status(job.id))["status"] == "queued"
+    for _ in range(100):
+        status = await queue.status(job.id)
+        if status["status"] == "completed":
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert stages == ["extracting"]
+    assert status["progress"] == 100
+    assert status["result"] == {"questions_found": 4}
+    assert status["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_marked_failed():
+    failed = []
+
+    async def on_failed(job, error):
+        failed.append(job.id)
+
+    queue = redis_queue(max_attempts=2, on_failed=on_failed)
+    calls = []
+
+    async def handler(job, report):
+        calls.append(job.attempts)
+        raise RuntimeError("extraction crashed")
+
+    worker = JobWorker(queue, {"boom": handler})
+    job = await queue.enqueue("boom", {})
+    while (claimed := await queue.claim(timeout=0)) is not None:
+        await worker.process(claimed)
+
+    status = await queue.status(job.id)
+    assert calls == [1, 2]
+    assert status["status"] == "failed"
+    assert "extraction crashed" in status["error"]
+    assert failed == [job.id]
+    assert await queue.stats() == {"backend": "redis", "pending": 0, "processing": 0}
+
+
+@pytest.mark.asyncio
+async def test_job_abandoned_by_dead_worker_is_requeued():
+    queue = redis_queue(visibility_timeout=60)
+    job = await queue.enqueue("slow", {})
+    claimed = await queue.claim(timeout=0)
+
+    # Still heartbeating: left alone
+    assert await queue.requeue_stale() == 0
+    await queue.set_status(job.id, heartbeat_at=time.time() - 120)
+    assert await queue.requeue_stale() == 1
+
+    retry = await queue.claim(timeout=0)
+    assert retry.id == claimed.id
+    assert retry.attempts == 2
+    assert (await queue.stats())["processing"] == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_without_status_gets_one_grace_pass():
+    queue = redis_queue(visibility_timeout=60)
+    await queue.enqueue("slow", {})
+    # A worker that died between moving the job and recording its claim
+    await queue.redis.list_move(queue.pending_key, queue.processing_key, 0)
+
+    assert await queue.requeue_stale() == 0
+    assert await queue.requeue_stale() == 1
+    assert (await queue.stats())["pending"] == 1
@@ -0,0 +1,218 @@
+"""
+Tests for the circuit breaker and adaptive concurrency limiter around LLM calls
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.metrics import metrics
+from services.llm import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConcurrencyLimitError,
+    FakeProvider,
+    GeminiProvider,
+    LLMError,
+    LLMRequest,
+    LLMService,
+)
+from tests.fakes import FakeClock, SlowModel, make_agent
+
+REQUEST = LLMRequest(prompt="What is 15 + 27?", system_instruction="Be a tutor")
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_after_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker("gemini", failure_rate=0.5, min_calls=4, window=4, reset_timeout=30, clock=clock)
+
+    breaker.record_success(100)
+    breaker.record_success(100)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()  # the single half-open trial
+    assert not breaker.allow()
+    breaker.record_success(100)
+    assert breaker.state == "closed"
+
+
+def test_breaker_opens_on_slow_calls_and_failed_trial_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker("gemini", slow_call_ms=1000, min_calls=2, window=2, reset_timeout=5, clock=clock)
+
+    breaker.record_success(5000)
+    breaker.record_success(5000)
+    assert breaker.status()["state"] == "open"
+
+    clock.now += 5
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.status() == {
+        "state": "open", "recent_calls": 0, "recent_failures": 0, "recent_slow_calls": 0, "retry_in_s": 5.0
+    }
+
+
+@pytest.mark.asyncio
+async def test_open_circuits_fail_fast_without_calling_providers():
+    provider = FakeProvider("gemini", latency=5.0)
+    service = LLMService([provider], breaker_factory=lambda name: CircuitBreaker(name, reset_timeout=60))
+    service.breakers["gemini"]._open()
+
+    started = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        await service.generate(REQUEST)
+
+    assert (time.perf_counter() - started) < 0.05
+    assert provider.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_open_primary_is_skipped_for_next_provider():
+    primary = FakeProvider("gemini", error=LLMError("503 overloaded"))
+    secondary = FakeProvider("openai", text="secondary")
+    service = LLMService(
+        [primary, secondary],
+        breaker_factory=lambda name: CircuitBreaker(name, min_calls=2, window=2)
+    )
+
+    for _ in range(2):
+        await service.generate(REQUEST)
+    result = await service.generate(REQUEST)
+
+    assert result.provider == "openai"
+    assert primary.calls == 2
+    assert service.status()["providers"][0]["circuit"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_limiter_halves_on_slow_calls_and_grows_back():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8, latency_target_ms=10, decrease_cooldown=0)
+
+    async with limiter.slot():
+        await asyncio.sleep(0.02)
+    assert limiter.current_limit == 4
+
+    for _ in range(20):
+        async with limiter.slot():
+            pass
+    assert limiter.current_limit > 4
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_in_flight_calls():
+    model = SlowModel(delay=0.02)
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    service = LLMService([GeminiProvider(model)], hedge_enabled=False, limiter=limiter)
+
+    await asyncio.gather(*(service.generate(REQUEST) for _ in range(6)))
+
+    assert model.max_in_flight == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_queued_behind_the_limit_give_up_at_the_deadline():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    service = LLMService([FakeProvider("gemini", latency=1.0)], timeout=0.05, hedge_enabled=False, limiter=limiter)
+
+    async with limiter.slot():
+        started = time.perf_counter()
+        with pytest.raises(ConcurrencyLimitError):
+            await service.generate(REQUEST)
+
+    assert time.perf_counter() - started < 0.5
+    assert service.breakers["gemini"].status()["recent_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_load_shed_half_open_trial_lets_the_next_request_try():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    service = LLMService(
+        [FakeProvider("gemini")],
+        timeout=0.05,
+        hedge_enabled=False,
+        limiter=limiter,
+        breaker_factory=lambda name: CircuitBreaker(name, reset_timeout=30, clock=clock)
+    )
+    service.breakers["gemini"]._open()
+    clock.now += 30
+
+    async with limiter.slot():
+        with pytest.raises(ConcurrencyLimitError):
+            await service.generate(REQUEST)
+        with pytest.raises(ConcurrencyLimitError):
+            [chunk async for chunk in service.stream(REQUEST)]
+
+    assert (await service.generate(REQUEST)).provider == "gemini"
+    assert service.breakers["gemini"].state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_stream_slot_wait_and_first_fragment_share_the_deadline():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    service = LLMService([FakeProvider("gemini", latency=0.08)], timeout=0.1, limiter=limiter)
+
+    async def hold_slot():
+        async with limiter.slot():
+            await asyncio.sleep(0.06)
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    with pytest.raises(asyncio.TimeoutError):
+        [chunk async for chunk in service.stream(REQUEST)]
+    await holder
+
+
+class DrippingProvider(FakeProvider):
+    """Answers at once, then keeps streaming for a while"""
+
+    async def stream(self, request):
+        for word in self.text.split(" "):
+            yield word + " "
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_long_healthy_streams_do_not_cut_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8, latency_target_ms=5, decrease_cooldown=0)
+    service = LLMService([DrippingProvider("gemini")], limiter=limiter)
+
+    chunks = [chunk async for chunk in service.stream(REQUEST)]
+
+    assert len(chunks) > 3
+    assert limiter.current_limit >= 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedge_does_not_count_against_provider():
+    primary = FakeProvider("gemini", latency=1.0)
+    secondary = FakeProvider("openai", latency=0.01)
+    service = LLMService([primary, secondary], hedge_default_delay=0.05)
+
+    await service.generate(REQUEST)
+
+    assert primary.cancelled == 1
+    assert service.breakers["gemini"].status()["recent_failures"] == 0
+    assert service.limiter.current_limit == 8
+
+
+@pytest.mark.asyncio
+async def test_agent_serves_fallback_instantly_when_circuit_open():
+    agent = make_agent(delay=5.0)
+    agent.llm.breakers["gemini"]._open()
+    metrics.reset()
+
+    started = time.perf_counter()
+    response = await agent.respond("What is 2 + 2?", cacheable=False)
+
+    assert (time.perf_counter() - started) < 0.1
+    assert response == agent._get_fallback_tutoring_response()
+    assert metrics.counter("llm.short_circuited") == 1
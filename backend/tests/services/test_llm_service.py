@@ -0,0 +1,104 @@
+"""
+Tests for provider hedging and failover in the LLM service
+"""
+
+import asyncio
+
+import pytest
+
+from core.metrics import metrics
+from services.llm import FakeProvider, LLMError, LLMRequest, LLMService
+
+REQUEST = LLMRequest(prompt="What is 15 + 27?", system_instruction="Be a tutor")
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    primary = FakeProvider("gemini", text="primary")
+    secondary = FakeProvider("openai", text="secondary")
+    service = LLMService([primary, secondary], hedge_default_delay=0.2)
+
+    result = await service.generate(REQUEST)
+
+    assert (result.text, result.provider, result.hedged) == ("primary", "gemini", False)
+    assert secondary.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled():
+    primary = FakeProvider("gemini", text="primary", latency=1.0)
+    secondary = FakeProvider("openai", text="secondary", latency=0.01)
+    service = LLMService([primary, secondary], hedge_default_delay=0.05)
+    metrics.reset()
+
+    result = await service.generate(REQUEST)
+    await asyncio.sleep(0)
+
+    assert (result.text, result.provider, result.hedged) == ("secondary", "openai", True)
+    assert result.latency_ms < 500
+    assert primary.cancelled == 1
+    assert metrics.counter("llm.hedges") == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_tracks_observed_p95():
+    primary = FakeProvider("gemini", latency=0)
+    service = LLMService([primary], hedge_default_delay=8.0, hedge_min_delay=0.001, hedge_min_samples=5)
+
+    assert service.hedge_delay(primary) == 8.0
+    for _ in range(5):
+        await service.generate(REQUEST)
+
+    assert service.hedge_delay(primary) < 0.1
+
+
+@pytest.mark.asyncio
+async def test_failing_primary_fails_over_immediately():
+    primary = FakeProvider("gemini", error=LLMError("503 overloaded"))
+    secondary = FakeProvider("anthropic", text="secondary")
+    service = LLMService([primary, secondary], hedge_default_delay=5.0)
+
+    result = await service.generate(REQUEST)
+
+    assert result.provider == "anthropic"
+    assert result.latency_ms < 1000
+
+
+@pytest.mark.asyncio
+async def test_timed_out_primary_fails_over():
+    primary = FakeProvider("gemini", latency=1.0)
+    secondary = FakeProvider("openai", text="secondary")
+    service = LLMService([primary, secondary], timeout=0.05, hedge_enabled=False)
+
+    result = await service.generate(REQUEST)
+
+    assert result.provider == "openai"
+
+
+@pytest.mark.asyncio
+async def test_all_providers_failing_raises_last_error():
+    service = LLMService([
+        FakeProvider("gemini", error=LLMError("first")),
+        FakeProvider("openai", error=LLMError("second")),
+    ])
+
+    with pytest.raises(LLMError, match="second"):
+        await service.generate(REQUEST)
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_first_fragment():
+    service = LLMService([
+        FakeProvider("gemini", error=LLMError("unavailable")),
+        FakeProvider("openai", text="Start with the ones"),
+    ])
+
+    chunks = [chunk async for chunk in service.stream(REQUEST)]
+
+    assert "".join(chunks) == "Start with the ones"
+
+
+def test_request_inlines_document_prefix_for_providers_without_cache():
+    request = LLMRequest(prompt="Student Response: x = 4", prefix="1. Find x if 2x = 8")
+
+    assert request.full_prompt() == "DOCUMENT:\n1. Find x if 2x = 8\n\nStudent Response: x = 4"
@@ -0,0 +1,117 @@
+"""
+Tests for the two-tier tutor response cache
+"""
+
+import pytest
+
+from services.redis_cache import DocumentStore, LRUCache, TutorResponseCache
+from tests.fakes import FakeClock, FakeRedis, make_agent
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_expires_entries_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(max_entries=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 59
+    assert cache.get("a") == 1
+    clock.now = 61
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_lru_reports_evicted_and_expired_entries_but_not_deletes():
+    clock = FakeClock()
+    dropped = []
+    cache = LRUCache(max_entries=2, ttl=60, clock=clock, on_evict=lambda key, value: dropped.append((key, value)))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    cache.delete("b")
+    clock.now = 61
+    cache.get("c")
+
+    assert dropped == [("a", 1), ("c", 3)]
+
+
+def test_key_normalizes_whitespace_and_case():
+    assert TutorResponseCache.make_key("What is  15 + 27?\n", "Beginner") == \
+        TutorResponseCache.make_key("what is 15 + 27?", "beginner")
+    assert TutorResponseCache.make_key("What is 15 + 27?", "beginner") != \
+        TutorResponseCache.make_key("What is 15 + 27?", "advanced")
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_hit_is_promoted_to_local_tier():
+    redis = FakeRedis()
+    writer = TutorResponseCache(local=LRUCache(max_entries=4), redis=redis)
+    reader = TutorResponseCache(local=LRUCache(max_entries=4), redis=redis)
+    key = TutorResponseCache.make_key("What is 15 + 27?", "intermediate")
+
+    await writer.set(key, {"message": "Start with the ones."})
+
+    assert await reader.get(key) == {"message": "Start with the ones."}
+    assert reader.local.get(key) == {"message": "Start with the ones."}
+
+
+@pytest.mark.asyncio
+async def test_document_store_keeps_partial_documents_out_of_local_tier():
+    redis = FakeRedis()
+    writer = DocumentStore(local=LRUCache(max_entries=4), redis=redis)
+    reader = DocumentStore(local=LRUCache(max_entries=4), redis=redis)
+
+    await writer.set("doc", {"text": "1. Solve", "complete": False})
+    assert (await reader.get("doc"))["complete"] is False
+    await writer.set("doc", {"text": "1. Solve\n2. Expand", "complete": True})
+
+    assert (await reader.get("doc"))["text"] == "1. Solve\n2. Expand"
+    assert reader.local.get("doc")["complete"] is True
+
+
+@pytest.mark.asyncio
+async def test_agent_serves_repeat_turns_from_cache_and_honours_opt_out():
+    agent = make_agent(delay=0)
+    calls = []
+    original = agent._generate_response
+
+    async def counting_generate(request):
+        calls.append(request)
+        return await original(request)
+
+    agent._generate_response = counting_generate
+
+    await agent.respond("What is 15 + 27?", context={"student_level": "intermediate"})
+    await agent.respond("what is 15 +  27?", context={"student_level": "intermediate"})
+    assert len(calls) == 1
+
+    await agent.respond("What is 15 + 27?", context={"student_level": "intermediate", "personalized": True})
+    await agent.respond("What is 15 + 27?", cacheable=False)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_document_store_without_redis_keeps_documents_live_sessions_use():
+    redis = FakeRedis()
+    redis.available = False
+    store = DocumentStore(local=LRUCache(max_entries=1), redis=redis)
+    await store.set("in-use", {"text": "1. Solve 2x = 8"})
+    store.retain("in-use", await store.get("in-use"))
+
+    await store.set("other", {"text": "1. Expand 2(x + 1)"})
+    await store.set("unused", {"text": "1. Factor x^2 - 1"})
+    await store.set("newest", {"text": "1. Simplify 3a + 4a"})
+
+    assert await store.get("in-use") == {"text": "1. Solve 2x = 8"}
+    assert await store.get("unused") is None
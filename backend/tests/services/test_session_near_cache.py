@@ -0,0 +1,92 @@
+"""
+Tests for the per-worker near cache in front of session message logs
+"""
+
+import pytest
+
+from services.sessions import MemorySessionBackend, RedisSessionBackend, SessionLog, SessionNearCache
+from tests.fakes import FakeRedis
+
+
+def worker(store, name: str) -> SessionLog:
+    """A session log as one API worker would hold it, with its own near cache"""
+    return SessionLog(prefix="chat_session:", store=store, near_cache=SessionNearCache(worker_id=name))
+
+
+def turn(n: int) -> list:
+    return [{"content": f"Is it {n}?"}, {"content": f"Why {n}?"}]
+
+
+@pytest.mark.asyncio
+async def test_consecutive_turns_on_one_worker_hit():
+    log = worker(MemorySessionBackend(), "a")
+    await log.save("s1", {"summary_upto": 0}, turn(0))
+    await log.save("s1", {"summary_upto": 0}, turn(1))
+
+    fields, messages = await log.load("s1")
+
+    assert fields == {"summary_upto": 0}
+    assert [m["content"] for m in messages] == ["Is it 0?", "Why 0?", "Is it 1?", "Why 1?"]
+    assert log.near_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_summary_fold_trims_cached_messages():
+    log = worker(MemorySessionBackend(), "a")
+    await log.save("s1", {"summary_upto": 0}, turn(0))
+    await log.save("s1", {"summary_upto": 3}, turn(1))
+
+    _, messages = await log.load("s1")
+
+    assert [m["content"] for m in messages] == ["Why 1?"]
+    assert log.near_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_another_workers_write_is_never_hidden():
+    store = MemorySessionBackend()
+    a, b = worker(store, "a"), worker(store, "b")
+    await a.save("s1", {"summary_upto": 0, "current_problem": "2x = 4"}, turn(0))
+    await b.load("s1")
+    await b.save("s1", {"summary_upto": 0, "current_problem": "3x = 9"}, turn(1))
+
+    fields, messages = await a.load("s1")
+
+    assert fields["current_problem"] == "3x = 9"
+    assert len(messages) == 4
+    assert a.near_cache.stats()["stale"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_from_the_same_turn_are_all_loaded():
+    store = MemorySessionBackend()
+    a, b = worker(store, "a"), worker(store, "b")
+    await a.save("s1", {"summary_upto": 0}, turn(0))
+    await b.load("s1")
+    # b's turn lands while a's is in flight; a writes the fields last
+    await b.save("s1", {"summary_upto": 0}, turn(1))
+    await a.save("s1", {"summary_upto": 0}, turn(2))
+
+    _, messages = await a.load("s1")
+
+    assert len(messages) == 6
+    assert a.near_cache.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_publish_and_other_workers_drop_their_entries():
+    redis = FakeRedis()
+    a, b = worker(RedisSessionBackend(redis), "a"), worker(RedisSessionBackend(redis), "b")
+    await a.save("s1", {"summary_upto": 0}, turn(0))
+    await b.load("s1")
+    await a.save("s1", {"summary_upto": 0}, turn(1))
+
+    (channel, message), = redis.published[-1:]
+    assert channel == "session_invalidations"
+    a.near_cache.handle(message)
+    b.near_cache.handle(message)
+
+    assert len(a.near_cache.entries) == 1
+    assert len(b.near_cache.entries) == 0
+    assert b.near_cache.stats()["invalidations"] == 1
+    assert "log_version" not in (await b.load("s1"))[0]
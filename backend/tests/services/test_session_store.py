@@ -0,0 +1,96 @@
+"""
+Tests for the in-memory session backend used when Redis is unavailable
+"""
+
+import asyncio
+
+import pytest
+
+from services.sessions import MemorySessionBackend, SessionLog
+from tests.fakes import FakeClock
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_keys_are_evicted_past_max_entries():
+    store = MemorySessionBackend(max_entries=2)
+    await store.set("session:a", {"n": 1})
+    await store.set("session:b", {"n": 2})
+    await store.get("session:a")
+    await store.set("session:c", {"n": 3})
+
+    assert await store.get("session:b") is None
+    assert await store.get("session:a") == {"n": 1}
+    assert store.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bytes_bound_counts_appended_list_items():
+    store = MemorySessionBackend(max_bytes=400)
+    await store.set("session:a", {"n": 1})
+    await store.set_and_append("chat_session:b", {"id": "b"}, "chat_session:b:messages", [{"content": "x" * 360}])
+
+    assert await store.get("session:a") is None
+    assert await store.list_length("chat_session:b:messages") == 1
+    assert store.stats()["bytes"] <= 400
+
+
+@pytest.mark.asyncio
+async def test_keys_expire_on_read_and_by_sweep():
+    clock = FakeClock()
+    store = MemorySessionBackend(clock=clock)
+    await store.set("session:a", {"n": 1}, ttl=60)
+    await store.set("session:b", {"n": 2}, ttl=60)
+    await store.set("session:forever", {"n": 3})
+
+    clock.now = 50
+    assert await store.get_and_touch("session:a", 60) == {"n": 1}
+    clock.now = 61
+    assert await store.get("session:b") is None
+    assert await store.get("session:a") == {"n": 1}
+
+    clock.now = 111
+    assert store.sweep() == 1
+    assert store.stats()["entries"] == 1
+    assert store.stats()["expirations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_return_copies():
+    store = MemorySessionBackend()
+    await store.set("session:a", {"questions": [1, 2]})
+
+    loaded = await store.get("session:a")
+    loaded["questions"].append(3)
+
+    assert await store.get("session:a") == {"questions": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_session_log_ranges_match_redis_semantics():
+    log = SessionLog(prefix="chat_session:", store=MemorySessionBackend())
+    await log.save("s1", {"summary_upto": 2}, [{"n": n} for n in range(3)])
+    await log.save("s1", {"summary_upto": 2}, [{"n": n} for n in range(3, 5)])
+
+    fields, messages = await log.load("s1")
+    assert fields == {"summary_upto": 2}
+    assert [m["n"] for m in messages] == [2, 3, 4]
+    assert [m["n"] for m in await log.messages("s1", -2)] == [3, 4]
+    assert [m["n"] for m in await log.messages("s1", 1, 2)] == [1, 2]
+    assert await log.messages("s1", 9) == []
+
+    assert await log.delete("s1")
+    assert await log.count("s1") == 0
+
+
+@pytest.mark.asyncio
+async def test_background_sweep_runs_until_stopped():
+    clock = FakeClock()
+    store = MemorySessionBackend(sweep_interval=0.01, clock=clock)
+    await store.set("session:a", {"n": 1}, ttl=1)
+    store.start()
+
+    clock.now = 2
+    await asyncio.sleep(0.05)
+    await store.stop()
+
+    assert store.stats()["entries"] == 0
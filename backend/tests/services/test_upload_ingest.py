@@ -0,0 +1,78 @@
+"""
+Tests for streaming, size-bounded upload ingestion
+"""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+
+from services.file_storage.ingest import UploadSizeLimitMiddleware, UploadTooLargeError, ingest_upload
+
+
+class CountingFile(io.BytesIO):
+    """BytesIO that records the largest single read"""
+
+    largest_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.largest_read = max(self.largest_read, len(chunk))
+        return chunk
+
+
+@pytest.mark.asyncio
+async def test_upload_is_streamed_hashed_and_content_addressed(tmp_path):
+    data = b"worksheet " * 50_000
+    source = CountingFile(data)
+
+    stored = await ingest_upload(UploadFile(source, filename="ws.PDF"), directory=str(tmp_path), chunk_size=4096)
+
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert stored.size == len(data)
+    assert stored.path == tmp_path / stored.sha256[:2] / f"{stored.sha256}.pdf"
+    assert stored.path.read_bytes() == data
+    assert source.largest_read == 4096
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_are_stored_once(tmp_path):
+    first = await ingest_upload(UploadFile(io.BytesIO(b"same"), filename="a.pdf"), directory=str(tmp_path))
+    second = await ingest_upload(UploadFile(io.BytesIO(b"same"), filename="b.pdf"), directory=str(tmp_path))
+
+    assert first.path == second.path
+    assert (first.deduplicated, second.deduplicated) == (False, True)
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [first.path.name]
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_stops_at_limit_and_leaves_nothing(tmp_path):
+    source = CountingFile(b"x" * 100_000)
+
+    with pytest.raises(UploadTooLargeError):
+        await ingest_upload(UploadFile(source, filename="big.pdf"), max_bytes=10_000, directory=str(tmp_path), chunk_size=1024)
+
+    assert source.tell() <= 11 * 1024
+    assert not [p for p in tmp_path.rglob("*") if p.is_file()]
+
+
+def test_declared_oversized_request_is_refused_before_reading():
+    app = FastAPI()
+    reached = []
+
+    @app.post("/upload")
+    async def upload():
+        reached.append(True)
+        return {}
+
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=1000)
+    client = TestClient(app)
+
+    response = client.post("/upload", content=b"x" * 200_000)
+
+    assert response.status_code == 413
+    assert "File too large" in response.json()["detail"]
+    assert not reached
+    assert client.post("/upload", content=b"x" * 100).status_code == 200